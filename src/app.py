@@ -1,31 +1,76 @@
 # type: ignore
-import time
-import pygame
+import os
+import logging
+import sqlite3
+import threading
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QApplication, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QSlider, QProgressBar,
-    QLineEdit, QToolTip, QMenu, QAction, QSizePolicy, QSystemTrayIcon
+    QLineEdit, QToolTip, QMenu, QAction, QSizePolicy, QSystemTrayIcon, QFileDialog,
+    QInputDialog, QMessageBox,
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QFileSystemWatcher, pyqtSignal
 from PyQt5.QtGui import (
-    QFont, QIntValidator, QColor, QIcon, QCursor
+    QFont, QIntValidator
 )
-from .utils import resource_path
-from .config import Config
+from . import assets
+from .settings_store import SettingsStore
 from .timer_state import TimerState
-from .widgets import MinimalistWidget
+from .timer_engine import TimerEngine, TimerEvent
+from .scheduler import DeadlineScheduler
+from .view_model import build_view, PROGRESS_STEPS
+from .themes import THEMES, ThemeManager
+from .timeline import PROGRAMS
+from .widgets import MinimalistWidget, KioskWidget
+from .preset_library import PresetLibrary, get_library, migrate_settings, parse_name
+from .preset_view import PresetMenu
+from .visibility import VisibilityTracker
+from .audio import AudioCueEngine, Cue
+from .history import SessionRecorder, get_history_writer, get_history_db, flush_history
+from . import transfer
+from .control_server import state_snapshot
+from .tracing import tracer
 
 QToolTip.showTime = 4000  # Set tooltip display time
 
+# Settings that define the timer program (sliders, text boxes and presets)
+DURATION_KEYS = ("workout_duration", "rest_duration", "lead_up_duration", "rounds")
+# File dialog filters for history export/import (see transfer.py)
+JSONL_FILTER = "JSON Lines (*.jsonl *.jsonl.gz)"
+CSV_FILTER = "CSV, one file per kind (*.csv *.csv.gz)"
+
 class WorkoutTimer(QMainWindow):
-    def __init__(self):
-        """Initialize the Workout Timer application."""
+    # (name, arg) from another launch; emitted on the instance-server thread
+    remote_command = pyqtSignal(str, object)
+    # Status text / (label, result or exception) from the export/import thread
+    transfer_progress = pyqtSignal(str)
+    transfer_finished = pyqtSignal(str, object)
+
+    def __init__(self, audio=None):
+        """Initialize the Workout Timer application.
+
+        `audio` is an AudioCueEngine whose warm-up was already started (by
+        main.py while the splash is showing); one is created if omitted.
+        """
         super().__init__()
-        # --- Settings from settings.json ---
-        self.settings = Config.load_from_file()
+        # --- Settings from settings.json (one shared store for the whole app) ---
+        self.store = SettingsStore.instance()
+        self.settings = self.store.config
         self.minimalist_widget = None
+        # Called (via the event loop) after the first frame has been painted
+        self.first_paint_callback = None
+        self._first_paint_done = False
+        self.kiosk_widget = None  # full-screen display, created on first use
+        self.circuit_window = None  # many independent timers (multi_view), created on first use
+        # Precompiled phase colours; only the progress bar is re-polished per phase
+        self.themes = ThemeManager(self.settings.theme)
         # Tray icon (created lazily when needed)
         self.tray_icon = None
+        self._library = None  # presets.db, opened on first use (see `library`)
+        self._active_cache = (None, None)  # ((library generation, values), matching preset id)
+        self.preset_dialog = None
+        self.control_server = None  # set by attach_control_server when enabled
+        self.mirror = None  # MirrorPublisher, set by attach_mirror when enabled
 
         # --- Status Bar (pre-created to avoid layout jump when messages appear)
         self.status_bar = self.statusBar()  # create once so central widget always reserves space
@@ -33,33 +78,82 @@ class WorkoutTimer(QMainWindow):
         self.status_bar.clearMessage()
 
         # --- Timer State ---
-        self.current_round = 0
-        self.remaining_time = 0
-        self.state = TimerState.Idle
-        self.start_time = None
-        self.fanfare_start_time = None
-        self.paused_time = 0 
+        self.engine = TimerEngine(
+            self.settings.workout_duration,
+            self.settings.rest_duration,
+            self.settings.lead_up_duration,
+            self.settings.rounds,
+            program=self.settings.program,
+        )
+        self.engine.subscribe(self._on_engine_event)
+        self.engine.subscribe(self._publish_state)
+        # Sessions and phases go to history.db in batches, off the GUI thread
+        self.recorder = None
+        if self.settings.record_history:
+            self.recorder = self.engine.subscribe(
+                SessionRecorder(get_history_writer(), preset_of=self._active_preset))
+        self._last_view = None  # most recent view-model built from the engine
+        self._main_view = None  # view-model last rendered into the main window
 
         # --- Audio ---
-        pygame.mixer.init()
-        self.work_finish_audio     = resource_path("work_finish.mp3")
-        self.rest_finish_audio     = resource_path("rest_finish.mp3")
-        self.complete_finish_audio = resource_path("complete_finish.mp3")
+        # Cues are decoded once in the background; backend chosen by settings
+        # (or WORKOUT_TIMER_AUDIO). Cues fired before it is ready are queued.
+        if audio is None:
+            audio = AudioCueEngine(self.settings.audio_backend)
+            audio.start_warm_up()
+        self.audio = audio
+        QApplication.instance().aboutToQuit.connect(self.audio.log_report)
+        QApplication.instance().aboutToQuit.connect(
+            lambda: logging.info("Timer catch-up: %s", self.engine.catch_up))
 
 
         #####################################
         # UI Setup
         #####################################
-        self.initUI()
+        with tracer.span("initUI"):
+            self.initUI()
 
         # --- Timer Loop ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_timer)
-        self.timer.start(100)
+        # Woken only for the next second flip or phase end; quiet while Idle/Paused
+        self.scheduler = DeadlineScheduler(self.update_timer, self)
+        # While no window is on screen only phase ends (and their cues) wake us
+        self.visibility = VisibilityTracker(self)
+        self.visibility.track(self)
+        self.visibility.shown.connect(self._on_surface_shown)
+        self.visibility.changed.connect(lambda _visible: self._reschedule())
+        self.visibility.changed.connect(lambda _visible: self._update_progress_animation())
+        # Smooth progress: redraws the arc/bar at the display refresh rate from
+        # the engine's clock; runs only while the timer runs and something is visible
+        self.progress_animator = QTimer(self)
+        self.progress_animator.setTimerType(Qt.PreciseTimer)
+        self.progress_animator.timeout.connect(self._animate_progress)
+        # Clears the completion message after it has been shown for 2 seconds
+        self.fanfare_timer = QTimer(self)
+        self.fanfare_timer.setSingleShot(True)
+        self.fanfare_timer.timeout.connect(self.fanfare_label.clear)
+
+        # --- Settings change notifications ---
+        for key in DURATION_KEYS:
+            self.store.subscribe(key, self._on_duration_setting)
+        self.store.subscribe("always_on_top", self._apply_always_on_top)
+        self.store.subscribe("minimize_after_complete", self._apply_minimize_after_complete)
+        self.store.subscribe("minimalist_mode_active", lambda _n, v: self._apply_minimalist_mode(v))
+        self.store.subscribe("theme", self._apply_theme)
+        self.store.subscribe("program", self._apply_program)
+        self.store.subscribe("smooth_progress", self._apply_smooth_progress)
+        # Pick up external edits of settings.json (only the changed fields are applied)
+        self.settings_watcher = QFileSystemWatcher(self)
+        self._watch_settings_file()
+        self.settings_watcher.fileChanged.connect(self._on_settings_file_changed)
+        # Queued across threads, so handle_command always runs on the GUI thread
+        self.remote_command.connect(self.handle_command)
+        self._transfer_thread = None
+        self.transfer_progress.connect(lambda text: self.statusBar().showMessage(text, 4000))
+        self.transfer_finished.connect(self._on_transfer_finished)
 
     def initUI(self):
         self.setWindowTitle("Workout Timer")
-        self.setWindowIcon(QIcon(resource_path("icon.ico")))
+        self.setWindowIcon(assets.icon("icon.ico"))
         self.setGeometry(100, 100, 400, 550)
         self.setMinimumSize(400, 540)  # Allow smaller minimum size
 
@@ -80,36 +174,19 @@ class WorkoutTimer(QMainWindow):
         # (Will be inserted between the two dropdown buttons below)
 
         # --- Dropdown Row: Presets (left) | Fanfare (center) | Settings (right) ---
+        section = tracer.begin("initUI: dropdown row")
         dropdown_row = QHBoxLayout()
 
         # Preset Dropdown button (left)
         self.preset_button = QPushButton()
-        self.preset_button.setIcon(QIcon(resource_path("barsHorizontal.png")))
+        self.preset_button.setIcon(assets.icon("barsHorizontal.png"))
         self.preset_button.setFixedHeight(25)
-        # Center the icon and remove the hidden padding that Qt reserves for the menu indicator
-        self.preset_button.setStyleSheet(
-            # just shift the icon a bit left so it looks centred
-            "QPushButton { padding-left: 0px; padding-right: 8px; }"
-        )
-        self.preset_button.setToolTip("Presets: Save or load up to 3 timer settings")
-        self.preset_menu = QMenu(self)
-        # Add actions for 3 slots
-        self.preset_actions = []
-        for i in range(3):
-            load_action = QAction(f"Load Preset {i+1}", self)
-            save_action = QAction(f"Save Current to Preset {i+1}", self)
-            self.preset_menu.addAction(load_action)
-            self.preset_menu.addAction(save_action)
-            if i < 2:
-                self.preset_menu.addSeparator()
-            load_action.triggered.connect(lambda _, idx=i: self.load_preset(idx))
-            save_action.triggered.connect(lambda _, idx=i: self.save_preset(idx))
-            self.preset_actions.append((load_action, save_action))
+        # Padding that centres the icon lives in style.qss (QPushButton[dropdown="true"])
+        self.preset_button.setProperty("dropdown", True)
+        self.preset_button.setToolTip("Presets: Search, load and save named timer settings")
+        # Filled from the library when opened, so startup never touches presets.db
+        self.preset_menu = PresetMenu(self)
         self.preset_button.setMenu(self.preset_menu)
-        # Show tooltips when hovering over menu actions
-        self.preset_menu.hovered.connect(self._show_preset_action_tooltip)
-        # Update tooltips and enabled states based on saved presets
-        self.update_preset_tooltips()
         dropdown_row.addWidget(self.preset_button)
 
         # Stretch, then fanfare label in center, then another stretch
@@ -119,25 +196,28 @@ class WorkoutTimer(QMainWindow):
 
         # Settings Dropdown button (right)
         self.settings_button = QPushButton()
-        self.settings_button.setIcon(QIcon(resource_path("reset.png")))
+        self.settings_button.setIcon(assets.icon("reset.png"))
         self.settings_button.setFixedHeight(25)
-        # Same style override for the settings button
-        self.settings_button.setStyleSheet(
-            "QPushButton { padding-left: 0px; padding-right: 8px; }"
-        )
+        self.settings_button.setProperty("dropdown", True)
         self.settings_button.setToolTip("Settings: Reset settings to default or erase all saved presets")
+        # Filled on first open as well (_populate_settings_menu)
         self.settings_menu = QMenu(self)
-        reset_action = self.settings_menu.addAction("Reset Settings to Default")
-        erase_action = self.settings_menu.addAction("Erase All Saved Presets")
-        reset_action.triggered.connect(self.reset_settings)
-        erase_action.triggered.connect(self.erase_presets)
+        self.theme_menu = None
+        self.smooth_progress_action = None
+        self.program_menu = None
+        self.summary_actions = []  # today / this week, refreshed on every open
+        self.stats_dialog = None
+        self.settings_menu.aboutToShow.connect(self._populate_settings_menu)
+        self.settings_menu.aboutToShow.connect(self._refresh_summary_actions)
         self.settings_button.setMenu(self.settings_menu)
         dropdown_row.addWidget(self.settings_button)
 
         layout.addLayout(dropdown_row)
+        section.end()
         # --- End of dropdown row ---
 
         # Sliders + TextBoxes: Workout, Rest, Rounds, Lead-up
+        section = tracer.begin("initUI: sliders")
         for text, attr in [
             ("Workout (sec)", "workout_duration"),
             ("Rest (sec)",    "rest_duration"),
@@ -174,11 +254,6 @@ class WorkoutTimer(QMainWindow):
             slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
             slider.valueChanged.connect(self.slider_changed)
             setattr(self, f"{attr}_slider", slider)
-            slider.setStyleSheet("""
-                QSlider::groove:horizontal { height:15px; margin:0; }
-                QSlider::handle:horizontal { background:#222; border:2px solid #555; width:18px; }
-                QSlider::handle:horizontal:hover { background:#888; }
-            """)
             h.addWidget(slider)
 
             tb = QLineEdit(str(getattr(self.settings, attr)))
@@ -191,7 +266,10 @@ class WorkoutTimer(QMainWindow):
 
             layout.addLayout(h)
         
+        section.end()
+
         # Control Buttons: Start, Pause, Resume, Stop
+        section = tracer.begin("initUI: controls + status")
         control_button_height = 40
         btn_row = QHBoxLayout(); btn_row.setSpacing(10)
         # Start button
@@ -234,9 +312,12 @@ class WorkoutTimer(QMainWindow):
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(True)
         self.progress_bar.setFormat("%p%")
+        self.progress_bar.setRange(0, PROGRESS_STEPS)  # fine steps for smooth progress
+        self.themes.register(self.progress_bar)
         layout.addWidget(self.progress_bar)
 
         layout.addSpacing(15)
+        section.end()
 
         # Toggle Buttons row 1: Always on Top, Minimize After Complete
         row1 = QHBoxLayout(); row1.setSpacing(10)
@@ -247,12 +328,7 @@ class WorkoutTimer(QMainWindow):
         self.always_on_top.setFont(font_toggle)
         self.always_on_top.clicked.connect(self.toggle_always_on_top)
         self.always_on_top.setToolTip("Keep the timer window always on top of other windows")
-        self.always_on_top.setStyleSheet("""
-            QPushButton { padding:5px; solid #666; background-color:#444; }
-            QPushButton:checked { background-color:#2a5699; border-color:#1a3b6d; }
-            QPushButton:hover { background-color:#555; }
-            QPushButton:checked:hover { background-color:#366bb8; }
-        """)
+        self.always_on_top.setProperty("toggle", True)  # styled by style.qss
         row1.addWidget(self.always_on_top)
 
         # Minimize after complete
@@ -261,7 +337,7 @@ class WorkoutTimer(QMainWindow):
         self.minimize_after_complete_toggle.setFont(font_toggle)
         self.minimize_after_complete_toggle.clicked.connect(self.toggle_minimize_after_complete)
         self.minimize_after_complete_toggle.setToolTip("Minimize the timer window after completing all rounds")
-        self.minimize_after_complete_toggle.setStyleSheet(self.always_on_top.styleSheet())
+        self.minimize_after_complete_toggle.setProperty("toggle", True)
         row1.addWidget(self.minimize_after_complete_toggle)
 
         layout.addLayout(row1)
@@ -273,19 +349,46 @@ class WorkoutTimer(QMainWindow):
         self.minimalist_button.setFont(font_toggle)
         self.minimalist_button.clicked.connect(self.toggle_minimalist_mode)
         self.minimalist_button.setToolTip("Switch to minimalist mode for a smaller and cleaner interface\n(cannot set sliders/textboxes in this mode)")
-        self.minimalist_button.setStyleSheet(self.always_on_top.styleSheet())
+        self.minimalist_button.setProperty("toggle", True)
         row2.addWidget(self.minimalist_button)
 
         layout.addLayout(row2)
 
         # Final UI sync
-        self.apply_initial_toggles()
-        self.update_ui_elements()
+        with tracer.span("initUI: initial sync"):
+            self.apply_initial_toggles()
+            self.update_ui_elements()
 
     ###############################################
     # UI End
     ###############################################
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        self.notify_first_paint()
+
+    def notify_first_paint(self):
+        """Record the first painted frame (main window or minimalist widget) once."""
+        if self._first_paint_done:
+            return
+        self._first_paint_done = True
+        tracer.mark("first paint")
+        if self.first_paint_callback:
+            QTimer.singleShot(0, self.first_paint_callback)
+
+    # Read-only views of the engine state (used by the minimalist widget)
+    @property
+    def state(self):
+        return self.engine.state
+
+    @property
+    def current_round(self):
+        return self.engine.current_round
+
+    @property
+    def remaining_time(self):
+        return self.engine.remaining_time
+
     ###############################################
     # For intializing toggles from settings.json
     ###############################################
@@ -301,12 +404,18 @@ class WorkoutTimer(QMainWindow):
 
     def set_minimalist_mode(self, enable: bool):
         """Show or hide minimalist mode and sync state/settings/UI."""
-        self.settings.minimalist_mode_active = enable
-        self.settings.save_to_file()
+        if not self.store.set(minimalist_mode_active=enable):
+            # Setting unchanged (e.g. restoring it at startup): still apply the UI
+            self._apply_minimalist_mode(enable)
+
+    def _apply_minimalist_mode(self, enable: bool):
         if enable:
             if not self.minimalist_widget:
                 self.minimalist_widget = MinimalistWidget(self)
                 self.minimalist_widget.move(self.x(), self.y())
+                self.visibility.track(self.minimalist_widget)
+            if self._last_view is not None:
+                self.minimalist_widget.apply_view(self._last_view)
             self.minimalist_widget.setToolTip("Right-click for context menu\nDouble Left-click to exit minimalist mode")
             self.minimalist_widget.setToolTipDuration(2400)
             self.minimalist_widget.show()
@@ -330,24 +439,49 @@ class WorkoutTimer(QMainWindow):
     def text_box_changed(self, attr, text_box):
         """Update the slider and settings based on text box input."""
         try:
-            val = int(text_box.text())
-            getattr(self, f"{attr}_slider").setValue(val)
-            setattr(self.settings, attr, val)
-            self._save_settings()
+            self.store.set(**{attr: int(text_box.text())})
         except ValueError:
             pass
 
     def slider_changed(self):
         """Update the settings based on slider values."""
-        self.settings.workout_duration = self.workout_duration_slider.value()
-        self.settings.rest_duration    = self.rest_duration_slider.value()
-        self.settings.rounds           = self.rounds_slider.value()
-        self.settings.lead_up_duration = self.lead_up_duration_slider.value()
-        self._save_settings()
+        self.store.set(**{key: getattr(self, f"{key}_slider").value() for key in DURATION_KEYS})
+
+    def _on_duration_setting(self, name, value):
+        """Sync slider/text box and the engine with a changed duration or round count."""
+        slider = getattr(self, f"{name}_slider")
+        slider.blockSignals(True)
+        slider.setValue(value)
+        slider.blockSignals(False)
+        getattr(self, f"{name}_text_box").setText(str(value))
+        self._configure_engine()
+        self.update_ui_elements()
 
-    def _save_settings(self):
-        """Save the current settings to the settings.json file."""
-        self.settings.save_to_file()
+    def _configure_engine(self):
+        """Push the current durations/rounds from settings into the timer engine."""
+        self.engine.configure(
+            self.settings.workout_duration,
+            self.settings.rest_duration,
+            self.settings.lead_up_duration,
+            self.settings.rounds,
+            self.settings.program,
+        )
+        if hasattr(self, "scheduler"):
+            self._reschedule()
+        self._publish_state()
+
+    def _reschedule(self):
+        """Arm the scheduler for the engine's next visible change (or go quiet).
+
+        With nothing on screen there is nothing to redraw each second, so only
+        the phase deadline is armed until a window becomes visible again.
+        """
+        self.scheduler.arm(self.engine.next_wakeup(boundaries_only=not self.visibility.any_visible))
+
+    def _on_surface_shown(self, _widget):
+        # Catch up on the seconds skipped while hidden before drawing
+        self.engine.tick()
+        self.update_ui_elements()
 
 
     #####################################
@@ -355,74 +489,82 @@ class WorkoutTimer(QMainWindow):
     #####################################
     def start_timer(self):
         """Start the timer with initial settings."""
-        self.current_round = 0
-        if self.settings.lead_up_duration > 0:
-            self.state = TimerState.LeadUp
-            self.remaining_time = self.settings.lead_up_duration
-        else:
-            self.state = TimerState.Workout
-            self.remaining_time = self.settings.workout_duration
-        self.start_time = time.monotonic()
-        self.paused_time = 0
+        self._configure_engine()
+        self.engine.start()
         self.update_ui_elements()
 
     def pause_timer(self):
         """Pause the timer and save the elapsed time."""
-        if self.start_time is None:
-            return
-        self.paused_time = time.monotonic() - self.start_time
-        if self.state == TimerState.LeadUp:
-            self.state = TimerState.PausedLeadUp
-        elif self.state == TimerState.Workout:
-            self.state = TimerState.PausedWorkout
-        elif self.state == TimerState.Rest:
-            self.state = TimerState.PausedRest
-        self.start_time = None
+        self.engine.pause()
         self.update_ui_elements()
 
     def resume_timer(self):
         """Resume the timer from a paused state."""
-        if self.state not in (
-            TimerState.PausedLeadUp,
-            TimerState.PausedWorkout,
-            TimerState.PausedRest
-        ):
-            return
-        if self.state == TimerState.PausedLeadUp:
-            self.state = TimerState.LeadUp
-        elif self.state == TimerState.PausedWorkout:
-            self.state = TimerState.Workout
-        else:
-            self.state = TimerState.Rest
-
-        self.start_time = time.monotonic() - self.paused_time
-        self.paused_time = 0
+        self.engine.resume()
         self.update_ui_elements()
 
     def stop_timer(self):
         """Stop the timer and reset all states."""
-        self.state = TimerState.Idle
-        self.start_time = None
-        self.remaining_time = 0
-        self.current_round = 0
+        self.engine.stop()
         self.update_ui_elements()
 
+    def _on_engine_event(self, event, engine):
+        """React to phase boundaries and session completion from the engine."""
+        if event == TimerEvent.Phase:
+            self._reschedule()
+            self._update_progress_animation()
+        elif event == TimerEvent.Boundary:
+            # Workout -> Rest plays the work cue; LeadUp/Rest -> Workout the rest cue
+            self.play_sound(is_work=engine.previous_state == TimerState.Workout,
+                            is_all_complete=False)
+        elif event == TimerEvent.Complete:
+            self.play_sound(is_work=False, is_all_complete=True)
+            self._update_progress_animation()
+            if not self.settings.minimalist_mode_active:
+                self.trigger_visual_fanfare()
+            if self.minimize_after_complete_toggle.isChecked():
+                self._minimize_after_complete()
+
+    def _update_progress_animation(self):
+        """Run the progress animation only while it can show anything."""
+        animate = (self.settings.smooth_progress and self.engine.is_running
+                   and self.visibility.any_visible)
+        if not animate:
+            self.progress_animator.stop()
+            return
+        if not self.progress_animator.isActive():
+            screen = self.windowHandle().screen() if self.windowHandle() else QApplication.primaryScreen()
+            refresh_rate = screen.refreshRate() or 60
+            self.progress_animator.start(max(1, round(1000 / refresh_rate)))
+
+    def _animate_progress(self):
+        """One animation frame: push the exact phase progress to the visible surfaces."""
+        progress = self.engine.progress()
+        if VisibilityTracker.is_visible(self):
+            self.progress_bar.setValue(int(progress * PROGRESS_STEPS))
+        if self.settings.minimalist_mode_active and VisibilityTracker.is_visible(self.minimalist_widget):
+            self.minimalist_widget.set_progress(progress)
+        if VisibilityTracker.is_visible(self.kiosk_widget):
+            self.kiosk_widget.set_progress(progress)
+
+    def _apply_smooth_progress(self, _name, value):
+        if self.smooth_progress_action is not None:
+            self.smooth_progress_action.setChecked(value)
+        self._update_progress_animation()
+
     def play_sound(self, is_work: bool, is_all_complete: bool):
         """Play the appropriate sound based on the timer state."""
-        try:
-            if is_all_complete:
-                audio_file = self.complete_finish_audio
-            elif is_work:
-                audio_file = self.work_finish_audio
-            else:
-                audio_file = self.rest_finish_audio
-            pygame.mixer.music.load(audio_file)
-            pygame.mixer.music.play()
-        except Exception as e:
-            print("Error playing sound:", e)
+        if is_all_complete:
+            cue = Cue.CompleteFinish
+        elif is_work:
+            cue = Cue.WorkFinish
+        else:
+            cue = Cue.RestFinish
+        self.audio.play(cue, due_ns=self.engine.last_boundary)
 
     def trigger_visual_fanfare(self):
-        self.fanfare_start_time = time.monotonic()
+        self.fanfare_label.setText(f"Congratulations, you completed {self.engine.total_rounds} rounds!")
+        self.fanfare_timer.start(2000)
 
 
     #####################################
@@ -449,21 +591,17 @@ class WorkoutTimer(QMainWindow):
                 # Fallback – simply invert the current setting
                 checked = not self.settings.always_on_top
 
-        # Persist and apply the new value ---------------------------------------
-        self.settings.always_on_top = bool(checked)
-        self.settings.save_to_file()
+        # Persist the new value; _apply_always_on_top reacts to the change ----
+        self.store.set(always_on_top=bool(checked))
 
-        if self.settings.always_on_top:
+    def _apply_always_on_top(self, _name, value):
+        if value:
             self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         else:
             self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
 
-        # Keep UI elements in sync ---------------------------------------------
-        if hasattr(self, "always_on_top"):
-            self.always_on_top.setChecked(self.settings.always_on_top)
-
-        if getattr(self, "minimalist_widget", None):
-            self.minimalist_widget.always_on_top_checkbox.setChecked(self.settings.always_on_top)
+        # Keep UI elements in sync (the minimalist widget follows the store itself)
+        self.always_on_top.setChecked(value)
 
         # Only bring the main window to front if it is already showing
         # (avoids popping up when user interacts via minimalist widget)
@@ -485,16 +623,11 @@ class WorkoutTimer(QMainWindow):
             else:
                 checked = not self.settings.minimize_after_complete
 
-        # Persist the choice ---------------------------------------------------
-        self.settings.minimize_after_complete = bool(checked)
-        self.settings.save_to_file()
+        # Persist the choice; _apply_minimize_after_complete syncs the UI -----
+        self.store.set(minimize_after_complete=bool(checked))
 
-        # Sync UI elements -----------------------------------------------------
-        if hasattr(self, "minimize_after_complete_toggle"):
-            self.minimize_after_complete_toggle.setChecked(self.settings.minimize_after_complete)
-
-        if getattr(self, "minimalist_widget", None):
-            self.minimalist_widget.minimize_after_complete_checkbox.setChecked(self.settings.minimize_after_complete)
+    def _apply_minimize_after_complete(self, _name, value):
+        self.minimize_after_complete_toggle.setChecked(value)
 
     # Helper ------------------------------------------------------------
     def _minimize_after_complete(self):
@@ -509,6 +642,32 @@ class WorkoutTimer(QMainWindow):
         else:
             self.showMinimized()
          
+    def set_kiosk_mode(self, enable: bool):
+        """Show or hide the full-screen kiosk display on the main window's screen."""
+        if enable:
+            if self.kiosk_widget is None:
+                self.kiosk_widget = KioskWidget(self)
+                self.visibility.track(self.kiosk_widget)
+            screen = self.windowHandle().screen() if self.windowHandle() else QApplication.primaryScreen()
+            self.kiosk_widget.setGeometry(screen.geometry())
+            self.kiosk_widget.apply_view(build_view(self.engine))
+            self.kiosk_widget.showFullScreen()
+        elif self.kiosk_widget:
+            self.kiosk_widget.hide()
+
+    def show_circuit_timers(self):
+        """Open the circuit window; new timers there copy the current settings."""
+        if self.circuit_window is None:
+            from .multi_view import MultiTimerWindow
+            settings = self.settings
+            self.circuit_window = MultiTimerWindow(
+                lambda: (settings.workout_duration, settings.rest_duration,
+                         settings.lead_up_duration, settings.rounds, settings.program),
+                self.themes, self.audio)
+        self.circuit_window.show()
+        self.circuit_window.raise_()
+        self.circuit_window.activateWindow()
+
     def toggle_minimalist_mode(self):
         """Toggle the 'Minimalist Mode' setting."""
         new_value = not self.settings.minimalist_mode_active
@@ -520,157 +679,137 @@ class WorkoutTimer(QMainWindow):
     ############################################
     def update_timer(self):
         """Main timer loop that updates the timer state and UI."""
-        if self.start_time is not None:
-            elapsed = int(time.monotonic() - self.start_time)
-            # Lead-up
-            if self.state == TimerState.LeadUp:
-                self.remaining_time = max(self.settings.lead_up_duration - elapsed, 0)
-                if elapsed >= self.settings.lead_up_duration:
-                    self.state = TimerState.Workout
-                    self.start_time = time.monotonic()
-                    self.remaining_time = self.settings.workout_duration
-                    self.play_sound(is_work=False, is_all_complete=False)
-
-            # Workout
-            elif self.state == TimerState.Workout:
-                self.remaining_time = max(self.settings.workout_duration - elapsed, 0)
-                if elapsed >= self.settings.workout_duration:
-                    self.state = TimerState.Rest
-                    self.start_time = time.monotonic()
-                    self.remaining_time = self.settings.rest_duration
-                    self.play_sound(is_work=True, is_all_complete=False)
-
-            # Rest
-            elif self.state == TimerState.Rest:
-                self.remaining_time = max(self.settings.rest_duration - elapsed, 0)
-                if elapsed >= self.settings.rest_duration:
-                    if self.current_round + 1 < self.settings.rounds:
-                        self.current_round += 1
-                        self.state = TimerState.Workout
-                        self.start_time = time.monotonic()
-                        self.remaining_time = self.settings.workout_duration
-                        self.play_sound(is_work=False, is_all_complete=False)
-                    else:
-                        self.state = TimerState.Idle
-                        self.start_time = None
-                        self.current_round = 0
-                        self.play_sound(is_work=False, is_all_complete=True)
-                        if not self.settings.minimalist_mode_active:
-                            self.trigger_visual_fanfare()
-                        if self.minimize_after_complete_toggle.isChecked():
-                            self._minimize_after_complete()
+        self.engine.tick()
+        self._reschedule()
 
         # refresh UI
         self.update_ui_elements()
 
-        # visual fanfare
-        if self.fanfare_start_time:
-            elapsed_fanfare_time = time.monotonic() - self.fanfare_start_time
-            if elapsed_fanfare_time < 2.0:
-                self.fanfare_label.setText(f"Congratulations, you completed {self.settings.rounds} rounds!")
-            else:
-                self.fanfare_start_time = None
-                self.fanfare_label.clear()
-    
 
     #####################################
     # Update UI Elements
     #####################################
     def update_ui_elements(self):
-        """Update all UI elements based on the current state."""
+        """Push the current view-model to the visible surfaces whose values changed.
+
+        Hidden, minimized or occluded windows are skipped; each keeps the view
+        it last rendered, so showing it again redraws just what changed.
+        """
+        view = build_view(self.engine)
+        self._last_view = view
+        # Always render the very first view so the window never opens blank
+        if self._main_view is None or VisibilityTracker.is_visible(self):
+            self._render_main_window(view)
+        if self.settings.minimalist_mode_active and VisibilityTracker.is_visible(self.minimalist_widget):
+            self.minimalist_widget.apply_view(view)
+        if VisibilityTracker.is_visible(self.kiosk_widget):
+            self.kiosk_widget.apply_view(view)
+
+    def _render_main_window(self, view):
+        changed = view.changed_fields(self._main_view)
+        self._main_view = view
+
         # labels
-        self.round_label.setText(f"Round: {self.current_round+1}/{self.settings.rounds}")
-        self.state_label.setText(f"State: {self.state.name}")
-        mins, secs = divmod(self.remaining_time, 60)
-        self.time_label.setText(f"Time remaining: {mins:02}:{secs:02}")
+        if "round_text" in changed:
+            self.round_label.setText(view.round_text)
+        if "state_text" in changed:
+            self.state_label.setText(view.state_text)
+        if "time_text" in changed:
+            self.time_label.setText(view.time_text)
 
         # progress styling
-        orange, green, blue, gray = "#E29A14", "#16A33E", "#1273B5", "#5A5177"
-        if self.state in (TimerState.LeadUp, TimerState.PausedLeadUp):
-            prog = 1 - (self.remaining_time/self.settings.lead_up_duration) if self.settings.lead_up_duration else 1
-            color = orange
-        elif self.state in (TimerState.Workout, TimerState.PausedWorkout):
-            prog = 1 - (self.remaining_time/self.settings.workout_duration)
-            color = green
-        elif self.state in (TimerState.Rest, TimerState.PausedRest):
-            prog = 1 - (self.remaining_time/self.settings.rest_duration)
-            color = blue
-        else:
-            prog = 0
-            color = gray
-
-        self.progress_bar.setValue(int(prog*100))
-        self.progress_bar.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; }}")
+        if "progress_steps" in changed:
+            self.progress_bar.setValue(view.progress_steps)
+        if "phase" in changed:
+            self.themes.set_phase(self.progress_bar, view.phase)
 
         # button visibility
-        self.start_button.setVisible(self.state == TimerState.Idle)
-        self.pause_button.setVisible(self.state in (TimerState.LeadUp, TimerState.Workout, TimerState.Rest))
-        self.resume_button.setVisible(self.state in (TimerState.PausedLeadUp, TimerState.PausedWorkout, TimerState.PausedRest))
-        self.stop_button.setVisible(self.state != TimerState.Idle)
-
-        # minimalist color & progress bar sync
-        if self.settings.minimalist_mode_active and self.minimalist_widget:            
-            if self.state in (TimerState.LeadUp, TimerState.PausedLeadUp):
-                prog = 1 - (self.remaining_time/self.settings.lead_up_duration) if self.settings.lead_up_duration else 1
-                color = orange
-            elif self.state in (TimerState.Workout, TimerState.PausedWorkout):
-                prog = 1 - (self.remaining_time/self.settings.workout_duration)
-                color = green
-            elif self.state in (TimerState.Rest, TimerState.PausedRest):
-                prog = 1 - (self.remaining_time/self.settings.rest_duration)
-                color = blue
-            else:
-                prog = 0
-                color = gray
-
-            # Update minimalist widget properties
-            self.minimalist_widget.progress = prog
-            self.minimalist_widget.active_color = QColor(color)
-            self.minimalist_widget.current_state = self.state
-            self.minimalist_widget.remaining_time = self.remaining_time
-            self.minimalist_widget.current_round = self.current_round
-            self.minimalist_widget.total_rounds = self.settings.rounds
-            self.minimalist_widget.update()
+        if "show_start" in changed:
+            self.start_button.setVisible(view.show_start)
+        if "show_pause" in changed:
+            self.pause_button.setVisible(view.show_pause)
+        if "show_resume" in changed:
+            self.resume_button.setVisible(view.show_resume)
+        if "show_stop" in changed:
+            self.stop_button.setVisible(view.show_stop)
+
+    # ---------------- Presets ------------------
+    @property
+    def library(self):
+        """The preset library; the legacy slots in settings.json move into it on first use."""
+        if self._library is None:
+            self._library = get_library()
+            if migrate_settings(self._library, self.store):
+                logging.info("Moved the legacy presets into %s", self._library.filename)
+        return self._library
+
+    def _current_values(self):
+        return {key: getattr(self.settings, key) for key in DURATION_KEYS}
+
+    def save_preset_as(self):
+        """Ask for a name (with optional #tags) and save the current settings under it."""
+        active = self.library.get(self._active_preset() or 0)
+        suggestion = active.name if active else (
+            f"{self.settings.workout_duration}/{self.settings.rest_duration} x {self.settings.rounds}")
+        text, ok = QInputDialog.getText(self, "Save Preset", "Name and #tags:", text=suggestion)
+        if ok and text.strip():
+            self.save_preset(text)
+
+    def save_preset(self, text):
+        """Save the current timer settings as preset 'name #tag ...' (overwrites that name)."""
+        name, tags = parse_name(text)
+        try:
+            preset_id = self.library.save(name, self._current_values(), tags)
+        except ValueError as e:
+            self.statusBar().showMessage(str(e), 2000)
+            return
+        self.library.touch(preset_id)
+        self.statusBar().showMessage(f"Preset {name!r} saved!", 2000)
+
+    def _active_preset(self):
+        """Id of a preset matching the current settings, or None.
 
-    def save_preset(self, idx):
-        """Save current timer settings to a preset slot."""
-        preset = {
-            "workout_duration": self.settings.workout_duration,
-            "rest_duration": self.settings.rest_duration,
-            "lead_up_duration": self.settings.lead_up_duration,
-            "rounds": self.settings.rounds
-        }
-        self.settings.presets[idx] = preset
-        self.settings.save_to_file()
-        self.statusBar().showMessage(f"Preset {idx+1} saved!", 2000)
-        # Refresh tooltips and enabled states
-        self.update_preset_tooltips()
-
-    def load_preset(self, idx):
-        """Load timer settings from a preset slot."""
-        preset = self.settings.presets[idx]
-        if not preset:
-            self.statusBar().showMessage(f"Preset {idx+1} is empty.", 2000)
+        Cached until the settings or the library change, so publishing each
+        timer event does not query presets.db on the GUI thread.
+        """
+        values = self._current_values()
+        key = (self.library.generation, tuple(values.values()))
+        if self._active_cache[0] != key:
+            self._active_cache = (key, self.library.matching(values))
+        return self._active_cache[1]
+
+    def load_preset(self, preset_id):
+        """Load timer settings from the preset with this id (or name)."""
+        if isinstance(preset_id, str):
+            preset = self.library.find(preset_id)
+        else:
+            preset = self.library.get(preset_id)
+        if preset is None:
+            self.statusBar().showMessage(f"No preset {preset_id!r}.", 2000)
             return
-        # Update settings and UI
-        for key in ["workout_duration", "rest_duration", "lead_up_duration", "rounds"]:
-            setattr(self.settings, key, preset[key])
-            slider = getattr(self, f"{key}_slider")
-            text_box = getattr(self, f"{key}_text_box")
-            slider.setValue(preset[key])
-            text_box.setText(str(preset[key]))
-        self.settings.save_to_file()
-        self.statusBar().showMessage(f"Preset {idx+1} loaded!", 2000)
-        self.update_ui_elements()
-        # Ensure tooltips are up to date (in case preset was previously empty)
-        self.update_preset_tooltips()
+        # Sliders, text boxes and the engine follow via _on_duration_setting
+        self.store.set(**preset.values)
+        self.library.touch(preset.id)
+        self.statusBar().showMessage(f"Preset {preset.name!r} loaded!", 2000)
+
+    def manage_presets(self, query=""):
+        """Open the preset library dialog, optionally on a search."""
+        from .preset_view import PresetLibraryDialog
+        if self.preset_dialog is None:
+            self.preset_dialog = PresetLibraryDialog(self, query)
+        else:
+            self.preset_dialog.set_query(query)
+            self.preset_dialog.reload()
+        self.preset_dialog.show()
+        self.preset_dialog.raise_()
+        self.preset_dialog.activateWindow()
 
     # ---------------- Tray icon management ------------------
     def _show_tray_icon(self):
         """Create and display a system-tray icon for quick restore."""
         if self.tray_icon is None:
-            icon_path = resource_path("icon.ico")
-            self.tray_icon = QSystemTrayIcon(QIcon(icon_path), self)
+            # Same cached QIcon as the window icon; no second .ico decode
+            self.tray_icon = QSystemTrayIcon(assets.icon("icon.ico"), self)
 
             # Context menu for the tray icon
             tray_menu = QMenu()
@@ -695,80 +834,238 @@ class WorkoutTimer(QMainWindow):
         if self.tray_icon and not self.settings.minimalist_mode_active:
             self.tray_icon.hide()
 
-    def update_preset_tooltips(self):
-        """Update tooltips and enabled state for preset actions."""
-        for idx, (load_action, _save_action) in enumerate(self.preset_actions):
-            preset = self.settings.presets[idx]
-            normal_text = f"Load Preset {idx+1}"
-            if preset:
-                # Enabled + regular font
-                load_action.setEnabled(True)
-                load_action.setText(normal_text)
-                normal_font = load_action.font()
-                load_action.setFont(normal_font)
-                tt = (
-                    f"Workout: {preset['workout_duration']}s\n"
-                    f"Rest: {preset['rest_duration']}s\n"
-                    f"Lead-up: {preset['lead_up_duration']}s\n"
-                    f"Rounds: {preset['rounds']}"
-                )
-                load_action.setToolTip(tt)
+    # ---------------- Commands from other launches ------------------
+    def handle_command(self, name, arg=None):
+        """Apply a single-instance command: show, start, pause, resume, stop or preset N."""
+        if name == "show":
+            self.bring_to_front()
+        elif name == "start" and self.engine.state == TimerState.Idle:
+            self.start_timer()
+        elif name == "pause" and self.engine.is_running:
+            self.pause_timer()
+        elif name == "resume" and self.engine.is_paused:
+            self.resume_timer()
+        elif name == "stop":
+            self.stop_timer()
+        elif name == "preset" and isinstance(arg, (int, str)):
+            self.load_preset(arg)
+
+    def attach_control_server(self, server):
+        """Push state changes to a running ControlServer and route its commands here."""
+        self.control_server = server
+        server.set_handler(self.remote_command.emit)
+        self._publish_state()
+
+    def attach_mirror(self, publisher):
+        """Mirror the timer to follower screens through a MirrorPublisher."""
+        self.mirror = publisher
+        self._publish_state()
+
+    def _publish_state(self, event=None, _engine=None):
+        """Send the state to control clients and followers on every change but per-second ticks."""
+        if event == TimerEvent.Tick:
+            return
+        if self.mirror is not None:
+            self.mirror.update(self.engine)
+        if self.control_server is not None:
+            self.control_server.publish(state_snapshot(self.engine, self._active_preset()))
+
+    def bring_to_front(self):
+        """Restore whichever window is in use and give it focus."""
+        self._restore_from_tray()
+        window = self.minimalist_widget if (self.settings.minimalist_mode_active and self.minimalist_widget) else self
+        if window.isMinimized():
+            window.showNormal()
+        window.raise_()
+        window.activateWindow()
+
+    def _populate_settings_menu(self):
+        """Build the settings actions and theme submenu the first time the menu opens."""
+        if self.theme_menu is not None:
+            return
+        with tracer.span("settings menu"):
+            if self.settings.record_history:
+                self.summary_actions = [self.settings_menu.addAction("") for _ in range(2)]
+                for action in self.summary_actions:
+                    action.setEnabled(False)
+                stats_action = self.settings_menu.addAction("Statistics...")
+                stats_action.triggered.connect(self.show_statistics)
+            export_action = self.settings_menu.addAction("Export History and Presets...")
+            import_action = self.settings_menu.addAction("Import History and Presets...")
+            export_action.triggered.connect(self.export_history)
+            import_action.triggered.connect(self.import_history)
+            self.settings_menu.addSeparator()
+            reset_action = self.settings_menu.addAction("Reset Settings to Default")
+            erase_action = self.settings_menu.addAction("Erase All Saved Presets")
+            reset_action.triggered.connect(self.reset_settings)
+            erase_action.triggered.connect(self.erase_presets)
+            kiosk_action = self.settings_menu.addAction("Kiosk Display (full screen, Esc to exit)")
+            kiosk_action.triggered.connect(lambda: self.set_kiosk_mode(True))
+            circuit_action = self.settings_menu.addAction("Circuit Timers...")
+            circuit_action.triggered.connect(self.show_circuit_timers)
+            self.smooth_progress_action = self.settings_menu.addAction("Smooth Progress Animation")
+            self.smooth_progress_action.setCheckable(True)
+            self.smooth_progress_action.setChecked(self.settings.smooth_progress)
+            self.smooth_progress_action.triggered.connect(
+                lambda checked: self.store.set(smooth_progress=checked))
+            self.settings_menu.addSeparator()
+            self.theme_menu = self.settings_menu.addMenu("Theme")
+            for name, theme in THEMES.items():
+                action = self.theme_menu.addAction(theme.label)
+                action.setCheckable(True)
+                action.setChecked(name == self.themes.theme.name)
+                action.triggered.connect(lambda _, n=name: self.set_theme(n))
+            # Program compiled from the sliders (see timeline.build_program)
+            self.program_menu = self.settings_menu.addMenu("Program")
+            for name, label in PROGRAMS.items():
+                action = self.program_menu.addAction(label)
+                action.setCheckable(True)
+                action.setChecked(name == self.settings.program)
+                action.triggered.connect(lambda _, n=name: self.set_program(n))
+
+    def _refresh_summary_actions(self):
+        for action, line in zip(self.summary_actions, self.history_summary()):
+            action.setText(line)
+
+    def history_summary(self):
+        """['Today: ...', 'This week: ...'] from the rollups; [] with history off or unreadable."""
+        if not self.settings.record_history:
+            return []
+        try:
+            return get_history_db().summary_lines()
+        except sqlite3.Error:
+            logging.exception("Could not read training statistics")
+            return []
+
+    def _preset_name(self, preset_id):
+        preset = self.library.get(preset_id)
+        return preset.name if preset else f"Preset {preset_id} (deleted)"
+
+    def show_statistics(self):
+        """Open (or refresh and raise) the statistics dialog."""
+        from .stats_view import StatisticsDialog
+        try:
+            if self.stats_dialog is None:
+                self.stats_dialog = StatisticsDialog(get_history_db(), self, preset_name=self._preset_name)
             else:
-                # Disabled + dimmer text 
-                load_action.setEnabled(True)
-                load_action.setText(f"{normal_text} (empty)")
-                normal_font = load_action.font()
-                normal_font.setItalic(True)
-                load_action.setFont(normal_font)
-                load_action.setToolTip("(empty)")
-
-    def _show_preset_action_tooltip(self, action):
-        """Display tooltip for the hovered preset menu action manually."""
-        tooltip = action.toolTip()
-        if tooltip:
-            QToolTip.showText(QCursor.pos(), tooltip, self.preset_menu)
+                self.stats_dialog.refresh()
+        except sqlite3.Error:
+            logging.exception("Could not read training statistics")
+            self.statusBar().showMessage("Statistics are unavailable", 2000)
+            return
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+        self.stats_dialog.activateWindow()
+
+    # ---------------- Export / import ------------------
+    def export_history(self):
+        """Stream the history and presets to a JSON Lines or CSV file in the background."""
+        path, chosen = QFileDialog.getSaveFileName(
+            self, "Export History and Presets", "workout-history.jsonl", f"{JSONL_FILTER};;{CSV_FILTER}")
+        if not path:
+            return
+        if not path.endswith((".jsonl", ".jsonl.gz", ".csv", ".csv.gz")):
+            path += ".csv" if chosen == CSV_FILTER else ".jsonl"
+        presets = self.library.all()  # frozen Preset rows, safe to hand to the worker
+        self._run_transfer("Export", lambda progress: transfer.export(path, presets=presets, progress=progress))
+
+    def import_history(self):
+        """Merge an export into the history (existing sessions are skipped) and load its presets."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import History and Presets", "", f"{JSONL_FILTER};;{CSV_FILTER}")
+        if path:
+            presets_file = self.library.filename
+            self._run_transfer("Import", lambda progress: self._import_file(path, presets_file, progress))
+
+    @staticmethod
+    def _import_file(path, presets_file, progress):
+        """Import on the worker thread, saving presets through a connection of its own."""
+        # Presets are merged during the import so sessions can follow their new ids
+        library = PresetLibrary(presets_file)
+        try:
+            return transfer.import_file(path, progress=progress, merge_presets=library.merge)
+        finally:
+            library.close()
+
+    def _run_transfer(self, label, job):
+        """Run `job(progress)` on a worker thread; results come back through signals."""
+        if self._transfer_thread is not None:
+            self.statusBar().showMessage("An export or import is already running", 2000)
+            return
+
+        def run():
+            try:
+                flush_history()  # include the rows still queued by the recorder
+                result = job(lambda stats: self.transfer_progress.emit(f"{label}: {stats}"))
+            except (OSError, ValueError, sqlite3.Error) as e:
+                result = e
+            self.transfer_finished.emit(label, result)
+
+        self._transfer_thread = threading.Thread(target=run, name="history-transfer", daemon=True)
+        self._transfer_thread.start()
+
+    def _on_transfer_finished(self, label, result):
+        self._transfer_thread = None
+        if isinstance(result, Exception):
+            logging.error("%s failed: %s", label, result)
+            self.statusBar().showMessage(f"{label} failed: {result}", 8000)
+            return
+        if label == "Import":
+            self.library.changed_elsewhere()
+        logging.info("%s: %s", label, result)
+        self.statusBar().showMessage(f"{label}: {result}", 8000)
+        if self.stats_dialog is not None and self.stats_dialog.isVisible():
+            self.stats_dialog.refresh()
 
     def reset_settings(self):
         """Reset settings to default."""
-        # Reset the in-memory settings object
-        self.settings.reset_to_default()
-
-        # Sync the UI controls to the freshly reset values so the user sees the change
-        # Update sliders/text boxes without triggering intermediate slider_changed saves
-        keys = [
-            "workout_duration",
-            "rest_duration",
-            "lead_up_duration",
-            "rounds",
-        ]
-
-        # First, block signals for all relevant sliders
-        for key in keys:
-            getattr(self, f"{key}_slider").blockSignals(True)
-
-        # Now set the values
-        for key in keys:
-            value = getattr(self.settings, key)
-            slider = getattr(self, f"{key}_slider")
-            slider.setValue(value)
-            getattr(self, f"{key}_text_box").setText(str(value))
-
-        # Re-enable signals
-        for key in keys:
-            getattr(self, f"{key}_slider").blockSignals(False)
-
-        # With correct values in place, persist them once
-        self._save_settings()
-
-        # Refresh any UI elements that rely on the settings (labels, tooltips, etc.)
+        # Every changed field is persisted once and pushed to the UI by its subscriber
+        self.store.reset()
+        self.statusBar().showMessage("Settings reset to default!", 2000)
+
+    def set_theme(self, name):
+        """Hot-swap the phase colour theme and remember it."""
+        if name in THEMES:
+            self.store.set(theme=name)
+
+    def set_program(self, name):
+        """Switch the interval program the sliders are compiled into."""
+        if name in PROGRAMS:
+            self.store.set(program=name)
+
+    def _apply_program(self, _name, value):
+        for action in self.program_menu.actions() if self.program_menu else ():
+            action.setChecked(action.text() == PROGRAMS.get(value))
+        self._configure_engine()
         self.update_ui_elements()
-        self.update_preset_tooltips()
 
-        self.statusBar().showMessage("Settings reset to default!", 2000)
+    def _apply_theme(self, _name, value):
+        if not self.themes.set_theme(value):
+            return
+        for action in self.theme_menu.actions() if self.theme_menu else ():
+            action.setChecked(action.text() == self.themes.theme.label)
+        if self.minimalist_widget and self._last_view is not None:
+            self.minimalist_widget.active_color = self.themes.qcolor(self._last_view.phase)
+            self.minimalist_widget.update()
+        if self.kiosk_widget:
+            self.kiosk_widget.refresh_theme()
+
+    # ---------------- External settings edits ------------------
+    def _watch_settings_file(self):
+        path = os.path.abspath(self.store.filename)
+        if os.path.exists(path) and path not in self.settings_watcher.files():
+            self.settings_watcher.addPath(path)
+
+    def _on_settings_file_changed(self, _path):
+        # Atomic saves replace the file, which drops it from the watcher
+        self._watch_settings_file()
+        self.store.reload_from_disk()
 
     def erase_presets(self):
-        """Erase all saved presets."""
-        self.settings.presets = [None, None, None]
-        self.settings.save_to_file()
-        self.statusBar().showMessage("All saved presets erased!", 2000)
-        self.update_preset_tooltips()
\ No newline at end of file
+        """Erase all saved presets (after confirmation)."""
+        count = self.library.count()
+        if not count or QMessageBox.question(
+                self, "Erase Presets", f"Delete all {count} saved presets?") != QMessageBox.Yes:
+            return
+        self.library.clear()
+        self.statusBar().showMessage("All saved presets erased!", 2000)
\ No newline at end of file
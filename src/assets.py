@@ -0,0 +1,154 @@
+import os
+import sys
+import atexit
+import shutil
+import zipfile
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Packed form of the resources folder; built by the spec (or `python -m src.assets`)
+BUNDLE_NAME = "assets.zip"
+BUNDLE_BUILD_PATH = os.path.join("build", BUNDLE_NAME)
+# Already-compressed formats are stored as-is so reading them is a plain copy
+STORED_SUFFIXES = (".png", ".ico", ".mp3")
+
+
+@lru_cache(maxsize=None)
+def resources_dir() -> str:
+    """Folder holding the bundle or the loose resources (computed once per process)."""
+    base = sys._MEIPASS if hasattr(sys, "_MEIPASS") else os.path.abspath(".")
+    return os.path.join(base, "resources")
+
+
+class AssetBundle:
+    """Read-once access to every asset, from `assets.zip` when present.
+
+    The archive's directory is read once when the bundle is opened, so
+    lookups afterwards never touch the filesystem. Without an archive (a
+    source checkout) the loose files in the resources folder are read
+    instead. Every asset's bytes are kept after the first read; the lock
+    makes this safe to use from the audio warm-up thread.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.bundle_path = os.path.join(folder, BUNDLE_NAME)
+        self._zip = None
+        self._data: Dict[str, bytes] = {}
+        self._paths: Dict[str, str] = {}
+        self._extract_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        if os.path.exists(self.bundle_path):
+            self._zip = zipfile.ZipFile(self.bundle_path)
+            self._names = set(self._zip.namelist())
+        else:
+            self._names = set(os.listdir(folder)) if os.path.isdir(folder) else set()
+
+    @property
+    def packed(self) -> bool:
+        return self._zip is not None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def read(self, name: str) -> bytes:
+        """Raw bytes of `name`; raises KeyError if there is no such asset."""
+        with self._lock:
+            data = self._data.get(name)
+            if data is None:
+                if name not in self._names:
+                    raise KeyError(name)
+                if self._zip is not None:
+                    data = self._zip.read(name)
+                else:
+                    with open(os.path.join(self.folder, name), "rb") as f:
+                        data = f.read()
+                self._data[name] = data
+            return data
+
+    def text(self, name: str) -> str:
+        return self.read(name).decode("utf-8")
+
+    def path(self, name: str) -> str:
+        """A real file for APIs that only accept paths (extracted once when packed)."""
+        if self._zip is None:
+            if name not in self._names:
+                raise KeyError(name)
+            return os.path.join(self.folder, name)
+        data = self.read(name)
+        with self._lock:
+            path = self._paths.get(name)
+            if path is None:
+                if self._extract_dir is None:
+                    self._extract_dir = tempfile.mkdtemp(prefix="workout_timer_")
+                    atexit.register(shutil.rmtree, self._extract_dir, True)
+                path = os.path.join(self._extract_dir, name)
+                with open(path, "wb") as f:
+                    f.write(data)
+                self._paths[name] = path
+            return path
+
+
+@lru_cache(maxsize=None)
+def get_bundle() -> AssetBundle:
+    """The process-wide bundle, opened on first use."""
+    return AssetBundle(resources_dir())
+
+
+def has_asset(name: str) -> bool:
+    return name in get_bundle()
+
+
+def asset_bytes(name: str) -> bytes:
+    return get_bundle().read(name)
+
+
+def asset_text(name: str) -> str:
+    return get_bundle().text(name)
+
+
+@lru_cache(maxsize=None)
+def pixmap(name: str):
+    """Decoded QPixmap for `name`, shared by every caller (GUI thread only)."""
+    from PyQt5.QtGui import QPixmap
+    result = QPixmap()
+    result.loadFromData(asset_bytes(name))
+    return result
+
+
+@lru_cache(maxsize=None)
+def icon(name: str):
+    """QIcon for `name` with every size an .ico file contains (GUI thread only)."""
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt5.QtGui import QIcon, QImageReader, QPixmap
+    buffer = QBuffer()
+    buffer.setData(QByteArray(asset_bytes(name)))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    result = QIcon()
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        result.addPixmap(QPixmap.fromImage(image))
+    buffer.close()
+    return result
+
+
+def build_bundle(source_dir: str = "resources", output: str = BUNDLE_BUILD_PATH) -> str:
+    """Pack every file in `source_dir` into `output` and return its path."""
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with zipfile.ZipFile(output, "w") as bundle:
+        for name in sorted(os.listdir(source_dir)):
+            path = os.path.join(source_dir, name)
+            if not os.path.isfile(path) or name == BUNDLE_NAME:
+                continue
+            compression = zipfile.ZIP_STORED if name.lower().endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+            bundle.write(path, name, compress_type=compression)
+    return output
+
+
+if __name__ == "__main__":
+    print("Wrote", build_bundle(*sys.argv[1:3]))
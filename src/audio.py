@@ -0,0 +1,220 @@
+import io
+import os
+import time
+import logging
+import threading
+from enum import Enum
+from typing import Dict, List, Optional
+
+from .assets import get_bundle
+from .tracing import tracer
+from .clock import now_ns
+
+# Environment override for the configured backend (e.g. WORKOUT_TIMER_AUDIO=null)
+AUDIO_BACKEND_ENV = "WORKOUT_TIMER_AUDIO"
+
+
+class Cue(Enum):
+    WorkFinish = "work_finish.mp3"
+    RestFinish = "rest_finish.mp3"
+    CompleteFinish = "complete_finish.mp3"
+
+
+class NullBackend:
+    """Silent backend for tests and machines without audio; records what was played."""
+    name = "null"
+
+    def __init__(self):
+        self.played = []
+
+    def load(self, cue, data):
+        pass
+
+    def play(self, cue):
+        self.played.append(cue)
+
+
+class PygameBackend:
+    """Decodes each cue once into an in-memory pygame Sound and plays it on a free channel."""
+    name = "pygame"
+
+    def __init__(self, channels: int = 8):
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # skip the import banner
+        import pygame
+        self._pygame = pygame
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(channels)
+        self._sounds: Dict[Cue, object] = {}
+
+    def load(self, cue, data):
+        # Decoded to PCM here, straight from the bundled bytes
+        self._sounds[cue] = self._pygame.mixer.Sound(file=io.BytesIO(data))
+
+    def play(self, cue):
+        # force=True steals the longest-running channel if all are busy
+        channel = self._pygame.mixer.find_channel(True)
+        channel.play(self._sounds[cue])
+
+
+class QtBackend:
+    """QtMultimedia backend: one preloaded QMediaPlayer per cue, so cues can overlap.
+
+    QtMultimedia decodes compressed audio itself, so cues are opened once up
+    front rather than decoded to PCM; must be created on the GUI thread.
+    QMediaPlayer needs a real file, so it is given paths instead of bytes.
+    """
+    name = "qt"
+    gui_thread_only = True
+    loads_from_file = True
+
+    def __init__(self):
+        from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+        from PyQt5.QtCore import QUrl
+        self._player_cls = QMediaPlayer
+        self._content = lambda path: QMediaContent(QUrl.fromLocalFile(path))
+        self._players = {}
+
+    def load(self, cue, path):
+        player = self._player_cls()
+        player.setMedia(self._content(path))
+        self._players[cue] = player
+
+    def play(self, cue):
+        player = self._players[cue]
+        player.setPosition(0)
+        player.play()
+
+
+BACKENDS = {
+    PygameBackend.name: PygameBackend,
+    QtBackend.name: QtBackend,
+    NullBackend.name: NullBackend,
+}
+
+
+def create_backend(name: str):
+    """Instantiate backend `name`, falling back to pygame and then null on failure."""
+    for candidate in (name, PygameBackend.name, NullBackend.name):
+        backend_cls = BACKENDS.get(candidate)
+        if backend_cls is None:
+            continue
+        try:
+            return backend_cls()
+        except Exception as e:
+            logging.warning("Audio backend %r unavailable: %s", candidate, e)
+    return NullBackend()
+
+
+class LatencyStats:
+    """Running count / mean / max of latency samples in seconds."""
+    __slots__ = ("count", "total", "worst")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.worst = max(self.worst, seconds)
+
+    def __str__(self):
+        if not self.count:
+            return "n/a"
+        return f"n={self.count} mean={self.total / self.count * 1e3:.2f}ms max={self.worst * 1e3:.2f}ms"
+
+
+class AudioCueEngine:
+    """Loads every cue once and plays them with measured latency.
+
+    `decode_times` holds the one-off load/decode cost per cue. `call_latency`
+    measures how long the backend's play call blocks the caller, and
+    `boundary_latency` how late the cue started relative to the phase
+    deadline it belongs to (when the caller passes one).
+
+    `start_warm_up()` does the backend import, device open and decoding on a
+    background thread; cues requested before that finishes are queued and
+    played as soon as the backend is ready.
+    """
+
+    def __init__(self, backend_name: Optional[str] = None):
+        self.backend_name = os.environ.get(AUDIO_BACKEND_ENV) or backend_name or PygameBackend.name
+        self.backend = None
+        self.decode_times: Dict[Cue, float] = {}  # seconds per cue
+        self.call_latency = LatencyStats()
+        self.boundary_latency = LatencyStats()
+        self.warm_up_time = None     # seconds spent creating the backend and decoding
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._queued: List[tuple] = []  # (cue, due_ns) requested before the backend was ready
+        self._thread = None
+
+    def start_warm_up(self):
+        """Load in the background (on the calling thread for GUI-thread-only backends)."""
+        if self.ready.is_set() or self._thread is not None:
+            return
+        if getattr(BACKENDS.get(self.backend_name), "gui_thread_only", False):
+            self.load()
+            return
+        self._thread = threading.Thread(target=self.load, name="audio-warm-up", daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Create the backend, decode every cue, then play anything queued meanwhile."""
+        start_total = time.perf_counter()
+        with tracer.span("audio: backend init", backend=self.backend_name):
+            backend = create_backend(self.backend_name)
+        for cue in Cue:
+            start = time.perf_counter()
+            with tracer.span(f"audio: decode {cue.value}"):
+                try:
+                    backend.load(cue, self._source(backend, cue))
+                except Exception as e:
+                    logging.warning("Error loading sound: %s", e)
+            self.decode_times[cue] = time.perf_counter() - start
+        self.warm_up_time = time.perf_counter() - start_total
+        with self._lock:
+            self.backend = backend
+            queued, self._queued = self._queued, []
+            self.ready.set()
+        for cue, due_ns in queued:
+            self._play_now(cue, due_ns)
+
+    @staticmethod
+    def _source(backend, cue):
+        """Bundled bytes for the cue, or a file path for backends that need one."""
+        if getattr(backend, "loads_from_file", False):
+            return get_bundle().path(cue.value)
+        return get_bundle().read(cue.value)
+
+    def play(self, cue, due_ns: Optional[int] = None):
+        """Play `cue`; `due_ns` is the clock.now_ns deadline the cue marks, if any."""
+        if not self.ready.is_set():
+            with self._lock:
+                if not self.ready.is_set():
+                    self._queued.append((cue, due_ns))
+                    return
+        self._play_now(cue, due_ns)
+
+    def _play_now(self, cue, due_ns):
+        start = time.perf_counter()
+        try:
+            self.backend.play(cue)
+        except Exception as e:
+            logging.error("Error playing sound: %s", e)
+            return
+        self.call_latency.add(time.perf_counter() - start)
+        if due_ns is not None:
+            self.boundary_latency.add(max(0, now_ns() - due_ns) / 1e9)
+
+    def report(self) -> str:
+        decode = ", ".join(f"{cue.name}={seconds * 1e3:.1f}ms"
+                           for cue, seconds in self.decode_times.items())
+        backend = self.backend.name if self.backend else "none"
+        warm_up = f"{self.warm_up_time * 1e3:.1f}ms" if self.warm_up_time is not None else "n/a"
+        return (f"audio backend={backend}; warm-up: {warm_up}; decode: {decode or 'n/a'}; "
+                f"play call: {self.call_latency}; after boundary: {self.boundary_latency}")
+
+    def log_report(self):
+        logging.info(self.report())
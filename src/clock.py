@@ -0,0 +1,26 @@
+import sys
+import time
+
+
+def _pick_clock():
+    """Monotonic nanosecond clock that keeps counting while the machine sleeps.
+
+    Linux's CLOCK_MONOTONIC (behind time.monotonic) stops during suspend, but
+    CLOCK_BOOTTIME does not; on macOS clock_gettime(CLOCK_MONOTONIC) counts
+    sleep while mach_absolute_time does not. Windows' time.monotonic
+    already includes sleep.
+    """
+    clock_id = getattr(time, "CLOCK_BOOTTIME", None)
+    if clock_id is None and sys.platform == "darwin":
+        clock_id = getattr(time, "CLOCK_MONOTONIC", None)
+    if clock_id is not None:
+        try:
+            time.clock_gettime_ns(clock_id)
+            return lambda: time.clock_gettime_ns(clock_id)
+        except OSError:
+            pass
+    return time.monotonic_ns
+
+
+# Session clock shared by the engine, the scheduler and audio latency stats
+now_ns = _pick_clock()
@@ -3,6 +3,8 @@ import json
 from dataclasses import dataclass, asdict
 from typing import List, Dict
 
+from .persistence import get_writer, write_json_atomic
+
 SETTINGS_FILE = "settings.json"
 
 @dataclass
@@ -20,12 +22,30 @@ class Config:
     minimalist_rounds_active: bool = True
     minimalist_time_active: bool = False
     minimalist_progressbar_active: bool = False
+    theme: str = "default"
+    smooth_progress: bool = True  # animate progress between whole-second ticks
+    program: str = "standard"  # standard | pyramid | tabata | emom (see timeline.PROGRAMS)
+    record_history: bool = True  # log sessions and phases to history.db
+    audio_backend: str = "pygame"  # pygame | qt | null
+    # Local HTTP/WebSocket remote control (control_server.py); a token is
+    # required before control_host may be anything but localhost
+    control_server: bool = False
+    control_host: str = "127.0.0.1"
+    control_port: int = 47632
+    control_token: str = ""
+    # Mirror the timer to follower screens over UDP multicast (mirror.py);
+    # mirror_interface 127.0.0.1 keeps it on this machine
+    mirror: bool = False
+    mirror_group: str = "239.255.47.63"
+    mirror_port: int = 47633
+    mirror_interface: str = ""
+    # Legacy three-slot presets (dicts or None); moved into presets.db on first
+    # use by preset_library.migrate_settings, and kept so old files still load
     presets: list = None
 
     def __post_init__(self):
         if self.presets is None:
-            # Each preset is a dict of settings, or None if unused
-            self.presets = [None, None, None]
+            self.presets = []
 
     @staticmethod
     def load_from_file(filename: str = SETTINGS_FILE) -> "Config":
@@ -36,17 +56,21 @@ class Config:
                 return Config(**data)
             except (json.JSONDecodeError, TypeError, ValueError):
                 default = Config()
-                default.save_to_file(filename)
+                default.save_now(filename)
                 return default
         else:
             default = Config()
-            default.save_to_file(filename)
+            default.save_now(filename)
             return default
 
     def save_to_file(self, filename: str = SETTINGS_FILE):
+        """Queue a snapshot for the background writer (bursts become one write)."""
+        get_writer().schedule(filename, asdict(self))
+
+    def save_now(self, filename: str = SETTINGS_FILE):
+        """Write the settings atomically on the calling thread."""
         try:
-            with open(filename, "w") as f:
-                json.dump(asdict(self), f, indent=4)
+            write_json_atomic(filename, asdict(self))
         except Exception as e:
             print("Error saving settings:", e)
 
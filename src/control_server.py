@@ -0,0 +1,377 @@
+import hmac
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
+from typing import Optional, Set
+
+from . import assets
+from .clock import now_ns
+from .timeline import NS_PER_SEC
+
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT = 47632
+LOOPBACK_NAMES = ("127.0.0.1", "localhost", "::1")
+MAX_REQUEST = 16 * 1024   # request line + headers + body
+MAX_FRAME = 4096          # largest WebSocket message accepted from a client
+SSE_KEEPALIVE = 15.0      # seconds between comments on idle event streams
+VIEWER_PAGE = "viewer.html"  # full-screen browser display served at /viewer
+
+# Commands accepted over HTTP (POST /<command>[/<arg>]) and WebSocket ({"command": ...})
+COMMANDS = ("show", "start", "pause", "resume", "stop", "preset")
+
+_NO_TOKEN = "commands need a control token"
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+_WS_TEXT, _WS_CLOSE, _WS_PING, _WS_PONG = 0x1, 0x8, 0x9, 0xA
+_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+            404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def state_snapshot(engine, preset=None) -> dict:
+    """JSON-ready timer state; `ends_at` (unix time) lets clients count down locally."""
+    deadline = engine.next_wakeup(boundaries_only=True)
+    ends_at = None
+    if deadline is not None:
+        ends_at = round(time.time() + (deadline - now_ns()) / NS_PER_SEC, 3)
+    return {
+        "state": engine.state.name,
+        "running": engine.is_running,
+        "paused": engine.is_paused,
+        "round": min(engine.current_round + 1, engine.total_rounds),
+        "rounds": engine.total_rounds,
+        "remaining": engine.remaining_time,
+        "phase_duration": engine.phase_duration,
+        "ends_at": ends_at,
+        "program": engine.program,
+        "preset": preset,
+    }
+
+
+def _frame(payload: bytes, opcode: int = _WS_TEXT) -> bytes:
+    """An unmasked, unfragmented server-to-client WebSocket frame."""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, length))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+    return header + payload
+
+
+class _Subscriber:
+    """One push client; holds only the newest undelivered event, so slow clients skip
+    stale states instead of queueing them."""
+
+    __slots__ = ("encode", "pending", "ready")
+
+    def __init__(self, encode):
+        self.encode = encode  # "sse" or "ws": which of the pre-encoded payloads it wants
+        self.pending = None
+        self.ready = asyncio.Event()
+
+    def push(self, encoded):
+        self.pending = encoded[self.encode]
+        self.ready.set()
+
+    async def next(self, timeout=None):
+        await asyncio.wait_for(self.ready.wait(), timeout)
+        self.ready.clear()
+        data, self.pending = self.pending, None
+        return data
+
+
+class ControlServer:
+    """Local HTTP / Server-Sent Events / WebSocket remote control.
+
+    An asyncio loop runs on its own thread, so requests never touch the
+    GUI's event loop. Commands are handed to `handler(name, arg)` on that
+    thread; the app passes a queued Qt signal's emit, exactly like the
+    single-instance server. State is pushed the other way: the GUI calls
+    `publish(state)` on changes and every subscriber gets it, encoded once
+    for all of them. `GET /state` answers from the last published state.
+
+        GET  /state            current state (JSON)
+        GET  /events           Server-Sent Events stream of states
+        GET  /ws               WebSocket: states pushed, {"command": ..., "arg": ...} sent
+        GET  /viewer           HTML display that follows /events
+        POST /<command>[/arg]  show, start, pause, resume, stop, preset/<id or name>
+
+    Commands need a `token`, and with one every request needs
+    "Authorization: Bearer <token>" or "?token=<token>" (it is also
+    required before listening beyond localhost). Requests from web pages
+    are refused unless they come from this server's own origin (the
+    viewer), and on localhost the Host header must be a loopback name, so
+    other sites can neither post commands nor open the WebSocket, even
+    through DNS rebinding.
+    """
+
+    def __init__(self, host: str = CONTROL_HOST, port: int = CONTROL_PORT, token: str = "",
+                 handler=None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self._handler = handler
+        self._state: dict = {}
+        self._seq = 0
+        self._subscribers: Set[_Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self.error: Optional[str] = None  # why start() failed, if it did
+
+    @property
+    def clients(self) -> int:
+        return len(self._subscribers)
+
+    def set_handler(self, handler):
+        self._handler = handler
+
+    # ------------------------------------------------------------------
+    # Lifecycle (called from the GUI thread)
+    # ------------------------------------------------------------------
+    def start(self, timeout: float = 5.0) -> bool:
+        """Start listening on a background thread; False if the port could not be bound."""
+        if self.host not in LOOPBACK_NAMES and not self.token:
+            self.error = "a token is required to listen beyond localhost"
+            return False
+        self._thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self._thread.start()
+        self._started.wait(timeout)
+        return self._server is not None
+
+    def close(self):
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    def publish(self, state: dict):
+        """Record and push a new state; cheap enough to call from any engine event."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._broadcast, state)
+
+    # ------------------------------------------------------------------
+    # Server thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._client, self.host, self.port, limit=MAX_REQUEST))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = str(e)
+            self._server = None
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+
+    def _broadcast(self, state):
+        self._seq += 1
+        self._state = dict(state, seq=self._seq)
+        body = self._encode_state()
+        encoded = {"sse": b"data: " + body + b"\n\n", "ws": _frame(body)}
+        for subscriber in self._subscribers:
+            subscriber.push(encoded)
+
+    def _encode_state(self) -> bytes:
+        """The current state stamped with `server_time`, so clients can allow for clock skew."""
+        return json.dumps(dict(self._state, server_time=round(time.time(), 3)), separators=(",", ":")).encode()
+
+    def _dispatch(self, name, arg):
+        """Hand a command to the handler; returns why it was refused, or None."""
+        if name not in COMMANDS:
+            return f"unknown command {name!r}"
+        if self._handler is None:
+            return "this server only shows the timer"
+        if name == "preset":
+            if not arg:
+                return "preset needs an id or a name"
+            arg = int(arg) if str(arg).isdigit() else str(arg)
+        self._handler(name, arg)
+        return None
+
+    async def _client(self, reader, writer):
+        try:
+            await self._serve_request(reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError,
+                asyncio.TimeoutError, ValueError) as e:
+            logging.debug("Control client dropped: %s", e)
+        except asyncio.CancelledError:
+            pass  # server closing; finishing normally keeps asyncio from logging each stream
+        finally:
+            writer.close()
+
+    async def _serve_request(self, reader, writer):
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10.0)
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, target, _version = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = [unquote(part) for part in url.path.split("/") if part]
+
+        if not self._origin_allowed(headers):
+            return await self._respond(writer, 403, {"error": "cross-site requests are not allowed"})
+        if self.token and not self._authorized(headers, query):
+            return await self._respond(writer, 401, {"error": "missing or wrong token"})
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_FRAME:
+            return await self._respond(writer, 413, {"error": "body too large"})
+        body = await reader.readexactly(length) if length else b""
+
+        if method == "GET" and path == ["state"]:
+            return await self._respond(writer, 200, json.loads(self._encode_state()) if self._state else {})
+        if method == "GET" and path == ["viewer"]:
+            return await self._respond(writer, 200, assets.asset_bytes(VIEWER_PAGE), "text/html; charset=utf-8")
+        if method == "GET" and path == ["events"]:
+            return await self._stream_events(writer)
+        if method == "GET" and path == ["ws"]:
+            return await self._websocket(reader, writer, headers)
+        if method == "GET" and not path:
+            return await self._respond(writer, 200, {"commands": COMMANDS, "streams": ["/events", "/ws"], "viewer": "/viewer"})
+        if path and path[0] in COMMANDS:
+            if method != "POST":
+                return await self._respond(writer, 405, {"error": "use POST for commands"})
+            if not self.token:
+                return await self._respond(writer, 403, {"error": _NO_TOKEN})
+            arg = path[1] if len(path) > 1 else None
+            if body and arg is None:
+                try:
+                    message = json.loads(body)
+                except ValueError:
+                    return await self._respond(writer, 400, {"error": 'expected a body like {"arg": ...}'})
+                arg = message.get("arg") if isinstance(message, dict) else None
+            error = self._dispatch(path[0], arg)
+            if error:
+                return await self._respond(writer, 400, {"error": error})
+            return await self._respond(writer, 200, {"ok": True})
+        return await self._respond(writer, 404, {"error": "not found"})
+
+    def _authorized(self, headers, query) -> bool:
+        expected = self.token.encode()
+        if hmac.compare_digest(headers.get("authorization", "").encode(), b"Bearer " + expected):
+            return True
+        return hmac.compare_digest(query.get("token", [""])[0].encode(), expected)
+
+    def _origin_allowed(self, headers) -> bool:
+        host = headers.get("host")
+        if host is not None and self.host in LOOPBACK_NAMES:
+            if urlsplit("//" + host).hostname not in LOOPBACK_NAMES:
+                return False  # a site's own name resolved to 127.0.0.1 (DNS rebinding)
+        origin = headers.get("origin")
+        if origin is None:
+            return True  # not sent by a web page: curl, scripts, stream decks
+        return host is not None and urlsplit(origin).netloc.lower() == host.lower()
+
+    async def _respond(self, writer, status, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _stream_events(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\n\r\n")
+        subscriber = _Subscriber("sse")
+        if self._state:
+            writer.write(b"data: " + self._encode_state() + b"\n\n")
+        await writer.drain()
+        self._subscribers.add(subscriber)
+        try:
+            while True:
+                try:
+                    data = await subscriber.next(SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    data = b": keep-alive\n\n"  # also notices clients that went away
+                writer.write(data)
+                await writer.drain()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            return await self._respond(writer, 400, {"error": "expected a WebSocket upgrade"})
+        accept = base64.b64encode(hashlib.sha1(key.encode() + _WS_GUID).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        if self._state:
+            writer.write(_frame(self._encode_state()))
+        await writer.drain()
+        subscriber = _Subscriber("ws")
+        self._subscribers.add(subscriber)
+        sender = asyncio.ensure_future(self._ws_send(writer, subscriber))
+        try:
+            await self._ws_receive(reader, writer)
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+
+    async def _ws_send(self, writer, subscriber):
+        while True:
+            writer.write(await subscriber.next())
+            await writer.drain()
+
+    async def _ws_receive(self, reader, writer):
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode, masked, length = first & 0x0F, second & 0x80, second & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await reader.readexactly(8), "big")
+            if not masked or length > MAX_FRAME or not first & 0x80:
+                # Clients must mask; large or fragmented messages are not part of this API
+                writer.write(_frame(b"\x03\xea", _WS_CLOSE))  # 1002 protocol error
+                return
+            mask = await reader.readexactly(4)
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+            if opcode == _WS_CLOSE:
+                writer.write(_frame(payload[:2], _WS_CLOSE))
+                return
+            if opcode == _WS_PING:
+                writer.write(_frame(payload, _WS_PONG))
+            elif opcode == _WS_TEXT:
+                writer.write(_frame(json.dumps(self._ws_command(payload)).encode()))
+            await writer.drain()
+
+    def _ws_command(self, payload) -> dict:
+        try:
+            message = json.loads(payload)
+            name, arg = message.get("command"), message.get("arg")
+        except (ValueError, AttributeError):
+            return {"error": "expected {\"command\": ..., \"arg\": ...}"}
+        if name == "state":
+            return {"reply": "state", "state": json.loads(self._encode_state()) if self._state else {}}
+        if not self.token:
+            return {"error": _NO_TOKEN}
+        error = self._dispatch(name, arg)
+        if error:
+            return {"error": error}
+        return {"ok": True, "command": name}
@@ -0,0 +1,109 @@
+# type: ignore
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QPointF, QRect
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QPixmap, QStaticText, QTransform
+
+
+class GlyphCache:
+    """Pre-rendered character pixmaps keyed by (pixel size, colour, character).
+
+    Every character of a given size is drawn into a cell of the same width
+    (the widest digit), so a string can be blitted cell by cell and a widget
+    only has to repaint the cells whose character changed.
+    """
+
+    def __init__(self, family: str = "Bahnschrift Light", bold: bool = True,
+                 max_entries: int = 256):
+        self.family = family
+        self.bold = bold
+        self.max_entries = max_entries
+        self._glyphs = OrderedDict()  # (pixel_size, rgba, ratio, char) -> QPixmap
+        self._metrics = {}            # pixel_size -> (font, cell width, cell height, ascent)
+
+    def font(self, pixel_size: int) -> QFont:
+        return self._font_metrics(pixel_size)[0]
+
+    def cell_size(self, pixel_size: int):
+        _font, width, height, _ascent = self._font_metrics(pixel_size)
+        return width, height
+
+    def _font_metrics(self, pixel_size: int):
+        if pixel_size not in self._metrics:
+            font = QFont(self.family)
+            font.setPixelSize(pixel_size)
+            font.setBold(self.bold)
+            metrics = QFontMetrics(font)
+            width = max(metrics.horizontalAdvance(c) for c in "0123456789")
+            self._metrics[pixel_size] = (font, width, metrics.height(), metrics.ascent())
+        return self._metrics[pixel_size]
+
+    def glyph(self, char: str, pixel_size: int, color, ratio: float = 1.0) -> QPixmap:
+        """Pixmap of one character cell, rendered on first use and then reused."""
+        key = (pixel_size, color.rgba(), ratio, char)
+        pixmap = self._glyphs.get(key)
+        if pixmap is not None:
+            self._glyphs.move_to_end(key)
+            return pixmap
+
+        font, width, height, ascent = self._font_metrics(pixel_size)
+        pixmap = QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QRect(0, 0, width, height), Qt.AlignCenter, char)
+        painter.end()
+
+        self._glyphs[key] = pixmap
+        if len(self._glyphs) > self.max_entries:
+            self._glyphs.popitem(last=False)
+        return pixmap
+
+    def cell_rects(self, text: str, pixel_size: int, center_x: int, top: int):
+        """Rects of each character cell for `text` centred horizontally on `center_x`."""
+        width, height = self.cell_size(pixel_size)
+        left = center_x - width * len(text) // 2
+        return [QRect(left + i * width, top, width, height) for i in range(len(text))]
+
+    def draw(self, painter, text: str, pixel_size: int, color, center_x: int, top: int):
+        """Blit `text` from cached glyphs; returns the cell rects that were drawn."""
+        ratio = painter.device().devicePixelRatioF()
+        rects = self.cell_rects(text, pixel_size, center_x, top)
+        for char, rect in zip(text, rects):
+            painter.drawPixmap(rect.topLeft(), self.glyph(char, pixel_size, color, ratio))
+        return rects
+
+
+class StaticTextCache:
+    """Pre-laid-out QStaticText objects keyed by (font point size, string)."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, text: str, font: QFont) -> QStaticText:
+        key = (font.pointSize(), font.family(), font.bold(), text)
+        static = self._entries.get(key)
+        if static is not None:
+            self._entries.move_to_end(key)
+            return static
+        static = QStaticText(text)
+        static.setPerformanceHint(QStaticText.AggressiveCaching)
+        static.prepare(QTransform(), font)
+        self._entries[key] = static
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return static
+
+    def draw_centered(self, painter, rect, text: str):
+        """Draw `text` with the painter's font, centred in `rect`."""
+        static = self.get(text, painter.font())
+        size = static.size()
+        painter.drawStaticText(
+            QPointF(rect.center().x() - size.width() / 2 + 0.5,
+                    rect.center().y() - size.height() / 2 + 0.5),
+            static,
+        )
@@ -0,0 +1,396 @@
+import time
+import sqlite3
+import logging
+import atexit
+import threading
+from typing import List, Optional
+
+from .clock import now_ns
+from .timeline import NS_PER_SEC
+from .timer_engine import TimerEvent
+from .timer_state import TimerState
+from . import stats
+
+HISTORY_FILE = "history.db"
+# Seconds the writer waits to gather more rows into one transaction
+BATCH_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id              INTEGER PRIMARY KEY,   -- time.time_ns() at session start
+    started_at      REAL NOT NULL,         -- unix time
+    ended_at        REAL,
+    day             TEXT NOT NULL,         -- local date of the start, YYYY-MM-DD
+    program         TEXT NOT NULL,
+    preset          INTEGER,               -- preset library id, NULL if none matched
+    planned_ns      INTEGER NOT NULL,
+    active_ns       INTEGER NOT NULL DEFAULT 0,
+    paused_ns       INTEGER NOT NULL DEFAULT 0,
+    rounds_planned  INTEGER NOT NULL,
+    rounds_done     INTEGER NOT NULL DEFAULT 0,
+    outcome         TEXT NOT NULL          -- running | completed | aborted | interrupted
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+CREATE INDEX IF NOT EXISTS sessions_preset_day ON sessions (preset, day);
+
+CREATE TABLE IF NOT EXISTS phases (
+    session_id  INTEGER NOT NULL REFERENCES sessions (id),
+    seq         INTEGER NOT NULL,          -- timeline segment index
+    state       TEXT NOT NULL,             -- LeadUp | Workout | Rest
+    round       INTEGER NOT NULL,
+    started_at  REAL NOT NULL,
+    planned_ns  INTEGER NOT NULL,
+    actual_ns   INTEGER NOT NULL,          -- time spent running (pauses excluded)
+    paused_ns   INTEGER NOT NULL,
+    completed   INTEGER NOT NULL           -- 0 if cut short by stop/seek
+);
+CREATE INDEX IF NOT EXISTS phases_session ON phases (session_id, seq);
+"""
+
+
+def connect(filename: str = HISTORY_FILE) -> sqlite3.Connection:
+    """Open the history database in WAL mode, creating the schema if needed."""
+    conn = sqlite3.connect(filename, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; fine for history
+    conn.executescript(SCHEMA)
+    stats.install(conn)
+    return conn
+
+
+def local_day(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+class HistoryWriter:
+    """Background writer that batches history rows into few short transactions.
+
+    The GUI thread only appends (sql, params) to a list; a worker commits
+    everything gathered every `batch_interval` seconds, so recording never
+    waits on the disk. Sessions still marked "running" from a previous
+    process (crash, power loss) are marked "interrupted" when the database
+    is first opened.
+    """
+
+    def __init__(self, filename: str = HISTORY_FILE, batch_interval: float = BATCH_INTERVAL):
+        self.filename = filename
+        self.batch_interval = batch_interval
+        self.batches = 0        # transactions committed
+        self.rows = 0           # statements executed
+        self._pending: List[tuple] = []  # (sql, params) waiting for the next batch
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # held from taking a batch until it is committed
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def execute(self, sql: str, params=()) -> None:
+        """Queue one statement; it is committed with the next batch."""
+        with self._cond:
+            self._pending.append((sql, params))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def insert(self, table: str, row: dict) -> None:
+        columns = ", ".join(row)
+        marks = ", ".join("?" * len(row))
+        self.execute(f"INSERT INTO {table} ({columns}) VALUES ({marks})", tuple(row.values()))
+
+    def update(self, table: str, key: int, row: dict) -> None:
+        assignments = ", ".join(f"{column} = ?" for column in row)
+        self.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", (*row.values(), key))
+
+    def flush(self) -> None:
+        """Commit everything queued so far on the calling thread."""
+        # Taking and committing under one lock keeps batches in queue order
+        # when the worker and another thread flush at the same time
+        with self._write_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            self._commit(batch)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Let a burst (e.g. a phase row plus a session update) gather first
+                deadline = time.monotonic() + self.batch_interval
+                while not self._closed and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                if self._closed:
+                    return
+            self.flush()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = connect(self.filename)
+            with self._conn:
+                # Count them in the rollups first: they never reached _end()
+                self._conn.execute(stats.ROLLUP_INTERRUPTED_SQL)
+                self._conn.execute(
+                    "UPDATE sessions SET outcome = 'interrupted' WHERE outcome = 'running'")
+        return self._conn
+
+    def _commit(self, batch):
+        """Write one batch; the caller holds `_write_lock`."""
+        if not batch:
+            return
+        try:
+            conn = self._connection()
+            with conn:  # one transaction per batch
+                for sql, params in batch:
+                    conn.execute(sql, params)
+            self.batches += 1
+            self.rows += len(batch)
+        except sqlite3.Error as e:
+            logging.error("Error writing history: %s", e)
+
+
+class SessionRecorder:
+    """Engine subscriber that records each session and its phases.
+
+    Register with `engine.subscribe(recorder)`. A session row is written
+    when the timer starts (outcome "running") and updated when it completes
+    or is stopped; each phase is written as it ends, with its planned and
+    actual (pause-free) duration. Boundaries coalesced after a long stall
+    are recorded at their planned length. When the engine is reconfigured
+    mid-session the running phase is planned against the new timeline,
+    unless it no longer exists there: then it is cut short like a seek.
+    """
+
+    def __init__(self, writer: HistoryWriter, preset_of=lambda: None, clock=now_ns):
+        self.writer = writer
+        self._preset_of = preset_of  # returns the preset library id in use, or None
+        self._clock = clock
+        self._session = None         # dict of the session row being recorded
+        self._index = None           # timeline segment currently running
+        self._timeline = None        # timeline self._index refers to
+        self._phase_start = None     # clock value (ns) the current phase started
+        self._phase_paused = 0
+        self._paused_at = None
+        self._wall_offset = 0        # unix time minus clock value, in seconds
+
+    def __call__(self, event, engine):
+        if event == TimerEvent.Tick:
+            return
+        now = self._clock()
+        if self._session is None:
+            if event == TimerEvent.Phase and engine.is_running:
+                self._begin(engine, now)
+            return
+        if event == TimerEvent.Boundary:
+            self._close_through(engine, engine.segment_index, engine.last_boundary)
+        elif event == TimerEvent.Complete:
+            self._close_through(engine, len(engine.timeline), engine.last_boundary)
+            self._end("completed", engine.last_boundary)
+        elif engine.state == TimerState.Idle:
+            self._resume_clock(now)
+            self._close_phase(engine, now, completed=False)
+            self._end("aborted", now)
+        else:
+            if engine.timeline is not self._timeline:
+                self._retime(engine)
+            if engine.segment_index != self._index:
+                # seek/skip: the current phase is cut short, the target starts now
+                paused = self._paused_at is not None
+                self._resume_clock(now)
+                self._close_phase(engine, now, completed=False)
+                self._open_phase(engine.segment_index, now)
+                self._timeline = engine.timeline
+                if paused:
+                    self._paused_at = now
+            if engine.is_paused and self._paused_at is None:
+                self._paused_at = now
+            elif engine.is_running:
+                self._resume_clock(now)
+
+    # ------------------------------------------------------------------
+    def _begin(self, engine, now):
+        started_at = time.time()
+        self._wall_offset = started_at - now / NS_PER_SEC
+        self._session = {
+            "id": time.time_ns(),
+            "started_at": started_at,
+            "ended_at": None,
+            "day": local_day(started_at),
+            "program": engine.program,
+            "preset": self._preset_of(),
+            "planned_ns": engine.timeline.total_ns,
+            "active_ns": 0,
+            "paused_ns": 0,
+            "rounds_planned": engine.total_rounds,
+            "rounds_done": 0,
+            "outcome": "running",
+        }
+        self.writer.insert("sessions", self._session)
+        self._timeline = engine.timeline
+        self._open_phase(engine.segment_index, now)
+
+    def _end(self, outcome, end):
+        session = self._session
+        session["ended_at"] = self._wall(end)
+        session["outcome"] = outcome
+        self.writer.update("sessions", session["id"], {
+            key: session[key] for key in ("ended_at", "planned_ns", "active_ns", "paused_ns",
+                                          "rounds_planned", "rounds_done", "outcome")
+        })
+        # Fold just this session into the daily rollups (same batch, same transaction)
+        self.writer.execute(stats.ROLLUP_SESSION_SQL, (session["id"],))
+        self._session = None
+        self._index = None
+        self._timeline = None
+
+    def _retime(self, engine):
+        """Follow a timeline swapped in by engine.configure()/set_timeline()."""
+        self._session["planned_ns"] = engine.timeline.total_ns
+        self._session["rounds_planned"] = engine.total_rounds
+        if engine.segment_index == self._index:
+            self._timeline = engine.timeline
+        # otherwise the old phase is closed against the old timeline first
+
+    def _open_phase(self, index, start):
+        self._index = index
+        self._phase_start = start
+        self._phase_paused = 0
+
+    def _resume_clock(self, now):
+        if self._paused_at is not None:
+            self._phase_paused += now - self._paused_at
+            self._paused_at = None
+
+    def _close_through(self, engine, index, boundary):
+        """Record segments self._index .. index-1; the last one ended at `boundary`."""
+        timeline = self._timeline
+        last = index - 1
+        for seq in range(self._index, index):
+            # Segments after the first were skipped through in one tick: planned length
+            end = boundary - (timeline.end_ns(last) - timeline.end_ns(seq))
+            self._close_phase(engine, end, completed=True, seq=seq)
+            self._open_phase(seq + 1, end)
+
+    def _close_phase(self, engine, end, completed, seq=None):
+        seq = self._index if seq is None else seq
+        timeline = self._timeline
+        actual = max(0, end - self._phase_start - self._phase_paused)
+        state = timeline.state(seq)
+        self.writer.insert("phases", {
+            "session_id": self._session["id"],
+            "seq": seq,
+            "state": state.name,
+            "round": timeline.round_index(seq),
+            "started_at": self._wall(self._phase_start),
+            "planned_ns": timeline.duration(seq) * NS_PER_SEC,
+            "actual_ns": actual,
+            "paused_ns": self._phase_paused,
+            "completed": int(completed),
+        })
+        self._session["active_ns"] += actual
+        self._session["paused_ns"] += self._phase_paused
+        if completed and state == TimerState.Workout:
+            self._session["rounds_done"] += 1
+
+    def _wall(self, clock_ns):
+        return self._wall_offset + clock_ns / NS_PER_SEC
+
+
+class HistoryDB:
+    """Read side of the history database (a separate connection; WAL lets it
+    read while the writer commits)."""
+
+    def __init__(self, filename: str = HISTORY_FILE):
+        self.conn = connect(filename)
+        self.conn.row_factory = sqlite3.Row
+
+    def sessions(self, since_day: Optional[str] = None, until_day: Optional[str] = None,
+                 preset: Optional[int] = None, limit: Optional[int] = None):
+        """Sessions newest first, filtered by day range and/or preset id (indexed)."""
+        clauses: List[str] = []
+        params: list = []
+        if preset is not None:
+            clauses.append("preset = ?")
+            params.append(preset)
+        if since_day is not None:
+            clauses.append("day >= ?")
+            params.append(since_day)
+        if until_day is not None:
+            clauses.append("day <= ?")
+            params.append(until_day)
+        sql = "SELECT * FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY day DESC, id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self.conn.execute(sql, params).fetchall()
+
+    def last_days(self, days: int = 30):
+        since = local_day(time.time() - (days - 1) * 86400)
+        return self.sessions(since_day=since)
+
+    def phases(self, session_id: int):
+        return self.conn.execute(
+            "SELECT * FROM phases WHERE session_id = ? ORDER BY seq", (session_id,)).fetchall()
+
+    # Statistics come from the daily rollups, never from raw phases
+    def totals(self, since_day: Optional[str] = None, until_day: Optional[str] = None) -> dict:
+        return stats.totals(self.conn, since_day, until_day)
+
+    def by_period(self, period: str = "day", limit: int = 30) -> list:
+        return stats.by_period(self.conn, period, limit)
+
+    def by_preset(self, since_day: Optional[str] = None) -> list:
+        return stats.by_preset(self.conn, since_day)
+
+    def streaks(self) -> tuple:
+        return stats.streaks(self.conn)
+
+    def today_and_week(self) -> tuple:
+        return stats.today_and_week(self.conn)
+
+    def summary_lines(self) -> list:
+        """['Today: ...', 'This week: ...'] for menus and tooltips."""
+        today, week = self.today_and_week()
+        return [stats.format_summary("Today", today), stats.format_summary("This week", week)]
+
+    def close(self):
+        self.conn.close()
+
+
+_writer = None
+
+
+def get_history_writer() -> HistoryWriter:
+    """Process-wide history writer; queued rows are committed at interpreter exit."""
+    global _writer
+    if _writer is None:
+        _writer = HistoryWriter()
+        atexit.register(_writer.close)
+    return _writer
+
+
+def flush_history() -> None:
+    if _writer is not None:
+        _writer.flush()
+
+
+_reader = None
+
+
+def get_history_db() -> HistoryDB:
+    """Process-wide read connection, opened on first use (statistics, summaries)."""
+    global _reader
+    if _reader is None:
+        _reader = HistoryDB()
+        atexit.register(_reader.close)
+    return _reader
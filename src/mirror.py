@@ -0,0 +1,435 @@
+"""Mirror the timer onto other screens over UDP multicast.
+
+The leader (the app with `mirror` enabled) sends a small datagram when the
+timer state changes, plus an occasional keyframe for screens that join
+late. Followers join the multicast group and count down locally from the
+phase deadline, so the leader sends the same packets whether one screen
+listens or fifty.
+
+    python -m src.mirror follow [--http PORT]   # print states; optionally relay to HTML viewers
+    python -m src.mirror lead 20 10 5 3         # headless leader (workout rest lead-up rounds)
+    python -m src.mirror_view [--fullscreen]    # follower window (PyQt5)
+
+Wire format (network byte order): a 14-byte header (magic, version, flags,
+sequence number, keyframe sequence, field mask, ms left in the phase),
+then the fields named in the mask. Keyframes (sent on every phase change)
+carry every field; other packets only the fields that differ from the last
+keyframe, so one lost delta never leaves a follower wrong for longer than
+the next packet, and a lost keyframe is repaired by the next heartbeat.
+"""
+import sys
+import math
+import time
+import socket
+import struct
+import logging
+import argparse
+import threading
+
+from .clock import now_ns
+from .timeline import NS_PER_SEC
+from .timer_state import TimerState
+
+MIRROR_GROUP = "239.255.47.63"  # organisation-local scope, never routed off the site
+MIRROR_PORT = 47633
+# Seconds between heartbeat keyframes while a phase runs. Followers count
+# down on their own, so this only bounds how long a late joiner (or one that
+# lost a keyframe) waits; a running phase re-anchors against clock drift too.
+KEYFRAME_INTERVAL = 5.0
+# Heartbeat while idle or paused: the display is static, only late joiners need it
+IDLE_KEYFRAME_INTERVAL = 30.0
+MAX_PACKET = 512
+
+MAGIC = b"WTm"
+VERSION = 1
+FLAG_KEYFRAME = 1
+_HEADER = struct.Struct("!3sBBHHBi")
+# Mask bit order; None is a length-prefixed UTF-8 string
+_FIELDS = (("state", "B"), ("round", "H"), ("rounds", "H"), ("duration", "I"), ("program", None))
+
+RUNNING_STATES = (TimerState.LeadUp, TimerState.Workout, TimerState.Rest)
+
+
+####################################
+# Wire format
+####################################
+def encode_packet(fields: dict, seq: int, key_seq: int, left_ms: int, keyframe: bool) -> bytes:
+    """One datagram carrying `fields` (all of them for a keyframe)."""
+    mask, body = 0, []
+    for bit, (name, fmt) in enumerate(_FIELDS):
+        if name not in fields:
+            continue
+        mask |= 1 << bit
+        if fmt is None:
+            data = fields[name].encode()[:255]
+            body.append(bytes((len(data),)) + data)
+        else:
+            body.append(struct.pack("!" + fmt, fields[name]))
+    header = _HEADER.pack(MAGIC, VERSION, FLAG_KEYFRAME if keyframe else 0,
+                          seq & 0xFFFF, key_seq & 0xFFFF, mask, left_ms)
+    return header + b"".join(body)
+
+
+def decode_packet(data: bytes):
+    """(keyframe, seq, key_seq, left_ms, fields); ValueError for anything not ours."""
+    if len(data) < _HEADER.size:
+        raise ValueError("short packet")
+    magic, version, flags, seq, key_seq, mask, left_ms = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a mirror packet")
+    fields, offset = {}, _HEADER.size
+    try:
+        for bit, (name, fmt) in enumerate(_FIELDS):
+            if not mask & 1 << bit:
+                continue
+            if fmt is None:
+                length = data[offset]
+                fields[name] = data[offset + 1:offset + 1 + length].decode()
+                offset += 1 + length
+            else:
+                fields[name] = struct.unpack_from("!" + fmt, data, offset)[0]
+                offset += struct.calcsize(fmt)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"truncated packet: {e}") from None
+    return bool(flags & FLAG_KEYFRAME), seq, key_seq, left_ms, fields
+
+
+def _newer(seq: int, last: int) -> bool:
+    """Sequence numbers wrap at 16 bits; anything up to half the space ahead is newer."""
+    return 0 < (seq - last) & 0xFFFF < 0x8000
+
+
+def mirror_fields(engine):
+    """(fields, deadline, left_ns) of an engine: deadline (clock ns) while running, else None."""
+    fields = {
+        "state": engine.state.value,
+        "round": engine.current_round,
+        "rounds": engine.total_rounds,
+        "duration": engine.phase_duration,
+        "program": engine.program,
+    }
+    if engine.segment_index is None:
+        return fields, None, 0
+    left_ns = (engine.phase_duration * NS_PER_SEC
+               - (engine.elapsed_ns() - engine.timeline.start_ns(engine.segment_index)))
+    deadline = engine.next_wakeup(boundaries_only=True)
+    return fields, deadline, max(0, left_ns)
+
+
+####################################
+# Sockets
+####################################
+def sender_socket(interface: str = "") -> socket.socket:
+    """Multicast sender; `interface` 127.0.0.1 keeps packets on this machine."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    local = interface.startswith("127.")
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 0 if local else 1)
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)  # followers on this machine too
+    if interface:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+    sock.setblocking(False)
+    return sock
+
+
+def receiver_socket(group: str = MIRROR_GROUP, port: int = MIRROR_PORT, interface: str = "") -> socket.socket:
+    """Non-blocking socket joined to the group; any number may share the port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(("", port))
+    membership = socket.inet_aton(group) + socket.inet_aton(interface or "0.0.0.0")
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+    sock.setblocking(False)
+    return sock
+
+
+####################################
+# Leader
+####################################
+class MirrorPublisher:
+    """Sends the leader's timer state to the multicast group.
+
+    `update(engine)` is called on every timer event except per-second
+    ticks and sends one packet right away (a non-blocking sendto of a few
+    dozen bytes): a keyframe when the phase changed, a delta otherwise.
+    A daemon thread repeats the keyframe only once nothing has been keyed
+    for KEYFRAME_INTERVAL (IDLE_KEYFRAME_INTERVAL while idle or paused),
+    so late joiners catch up without the leader streaming per-second
+    frames. Nothing here depends on the number of followers.
+    """
+
+    def __init__(self, group: str = MIRROR_GROUP, port: int = MIRROR_PORT, interface: str = "",
+                 clock=now_ns):
+        self.address = (group, port)
+        self._clock = clock
+        self._sock = sender_socket(interface)
+        self._lock = threading.Lock()
+        self._fields = None
+        self._deadline = None
+        self._left_ns = 0
+        self._seq = 0
+        self._key = None  # (seq, fields) of the last keyframe sent
+        self._keyed_at = None  # clock ns the last keyframe was sent
+        self.packets = 0
+        self.bytes_sent = 0
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._heartbeat, name="mirror-heartbeat", daemon=True)
+        self._thread.start()
+
+    def update(self, engine):
+        fields, deadline, left_ns = mirror_fields(engine)
+        with self._lock:
+            self._fields, self._deadline, self._left_ns = fields, deadline, left_ns
+        self._send(keyframe=False)
+
+    def _heartbeat(self):
+        while not self._closed.wait(self._until_keyframe()):
+            if self._until_keyframe() <= 0:
+                self._send(keyframe=True)
+
+    def _until_keyframe(self) -> float:
+        """Seconds until the next heartbeat keyframe is due (never sleeping past KEYFRAME_INTERVAL)."""
+        with self._lock:
+            if self._keyed_at is None:
+                return KEYFRAME_INTERVAL
+            interval = KEYFRAME_INTERVAL if self._deadline is not None else IDLE_KEYFRAME_INTERVAL
+            left = (self._keyed_at - self._clock()) / NS_PER_SEC + interval
+        return min(KEYFRAME_INTERVAL, max(0.0, left))
+
+    def _send(self, keyframe):
+        with self._lock:
+            if self._fields is None:
+                return
+            keyframe = keyframe or self._key is None or self._key[1]["state"] != self._fields["state"]
+            self._seq = (self._seq + 1) & 0xFFFF
+            if keyframe:
+                self._key = (self._seq, self._fields)
+                self._keyed_at = self._clock()
+                fields = self._fields
+            else:
+                base = self._key[1]
+                fields = {name: value for name, value in self._fields.items() if base.get(name) != value}
+            left_ns = self._left_ns if self._deadline is None else max(0, self._deadline - self._clock())
+            packet = encode_packet(fields, self._seq, self._key[0], left_ns // 1_000_000, keyframe)
+        try:
+            self._sock.sendto(packet, self.address)
+        except OSError as e:  # no route / buffer full: the next keyframe repairs it
+            logging.debug("Mirror packet dropped: %s", e)
+            return
+        self.packets += 1
+        self.bytes_sent += len(packet)
+
+    def close(self):
+        self._closed.set()
+        self._thread.join(2.0)
+        self._sock.close()
+
+
+####################################
+# Follower
+####################################
+class MirrorState:
+    """A follower's copy of the leader's timer, counted down on the local clock.
+
+    Quacks like a TimerEngine as far as `view_model.build_view` and the
+    schedulers are concerned (state, rounds, remaining_time, progress(),
+    next_wakeup(), tick()), so the existing widgets can display it.
+    Packets only re-anchor the deadline; every second in between is
+    interpolated here.
+    """
+
+    def __init__(self, clock=now_ns):
+        self._clock = clock
+        self.state = TimerState.Idle
+        self.current_round = 0
+        self.total_rounds = 0
+        self.phase_duration = 0
+        self.program = ""
+        self.remaining_time = 0
+        self._deadline = None   # local clock ns at which the phase ends (running only)
+        self._left_ns = 0       # frozen time left while paused
+        self._seq = None
+        self._key = None        # (seq, fields) of the last keyframe received
+        self.last_packet = None  # local clock ns of the last packet applied
+        self.packets = 0
+        self.dropped = 0         # stale, duplicate or orphaned deltas
+
+    @property
+    def is_running(self):
+        return self.state in RUNNING_STATES
+
+    @property
+    def is_paused(self):
+        return self.state.name.startswith("Paused")
+
+    def apply(self, data: bytes, received=None) -> bool:
+        """Apply one datagram; False if it was ignored (garbage, old, or its keyframe was missed)."""
+        received = self._clock() if received is None else received
+        try:
+            keyframe, seq, key_seq, left_ms, fields = decode_packet(data)
+        except ValueError:
+            return False
+        if keyframe:
+            # Always taken, so a restarted leader (sequence back at 1) is picked up
+            self._key = (seq, fields)
+        elif (self._key is None or self._key[0] != key_seq
+              or (self._seq is not None and not _newer(seq, self._seq))):
+            self.dropped += 1
+            return False
+        else:
+            fields = {**self._key[1], **fields}
+        self._seq = seq
+        self.packets += 1
+        self.last_packet = received
+        self.state = TimerState(fields["state"])
+        self.current_round = fields["round"]
+        self.total_rounds = fields["rounds"]
+        self.phase_duration = fields["duration"]
+        self.program = fields["program"]
+        self._left_ns = left_ms * 1_000_000
+        self._deadline = received + self._left_ns if self.is_running else None
+        self.tick()
+        return True
+
+    def receive(self, sock) -> bool:
+        """Drain a non-blocking socket; True if any packet was applied."""
+        applied = False
+        while True:
+            try:
+                data = sock.recv(MAX_PACKET)
+            except (BlockingIOError, InterruptedError):
+                return applied
+            applied = self.apply(data) or applied
+
+    def left_ns(self) -> int:
+        if self._deadline is None:
+            return self._left_ns if self.state != TimerState.Idle else 0
+        return max(0, self._deadline - self._clock())
+
+    def tick(self):
+        self.remaining_time = math.ceil(self.left_ns() / NS_PER_SEC)
+
+    def progress(self):
+        if self.state == TimerState.Idle:
+            return 0
+        duration = self.phase_duration * NS_PER_SEC
+        if not duration:
+            return 1
+        return min(1, max(0, 1 - self.left_ns() / duration))
+
+    def next_wakeup(self, boundaries_only=False):
+        """Next local second flip (or the deadline); None while paused, idle or past the deadline."""
+        if self._deadline is None:
+            return None
+        left = self._deadline - self._clock()
+        if left <= 0:
+            return None  # the leader's boundary packet takes it from here
+        if boundaries_only:
+            return self._deadline
+        return self._deadline - (math.ceil(left / NS_PER_SEC) - 1) * NS_PER_SEC
+
+    def snapshot(self) -> dict:
+        """Same shape as control_server.state_snapshot, for relaying to HTML viewers."""
+        ends_at = None
+        if self._deadline is not None:
+            ends_at = round(time.time() + (self._deadline - self._clock()) / NS_PER_SEC, 3)
+        return {
+            "state": self.state.name,
+            "running": self.is_running,
+            "paused": self.is_paused,
+            "round": min(self.current_round + 1, self.total_rounds),
+            "rounds": self.total_rounds,
+            "remaining": self.remaining_time,
+            "phase_duration": self.phase_duration,
+            "ends_at": ends_at,
+            "program": self.program,
+            "preset": None,
+        }
+
+
+####################################
+# Command line
+####################################
+def _follow(args):
+    state = MirrorState()
+    sock = receiver_socket(args.group, args.port, args.interface)
+    sock.setblocking(True)
+    relay = None
+    if args.http is not None:
+        from .control_server import ControlServer
+        relay = ControlServer(args.http_host, args.http, args.token)
+        if not relay.start():
+            sys.exit(f"Could not start the viewer relay: {relay.error}")
+        print(f"Viewer: http://{relay.host}:{relay.port}/viewer", flush=True)
+    shown = None
+    try:
+        while True:
+            if not state.apply(sock.recv(MAX_PACKET)):
+                continue
+            # Keyframes only re-anchor the countdown; report and relay actual changes
+            current = (state.state, state.current_round, state.total_rounds, state.phase_duration, state.program)
+            if current == shown:
+                continue
+            shown = current
+            print(f"{state.state.name:<13} round {min(state.current_round + 1, state.total_rounds)}"
+                  f"/{state.total_rounds}  {state.left_ns() / NS_PER_SEC:6.1f}s left", flush=True)
+            if relay is not None:
+                relay.publish(state.snapshot())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if relay is not None:
+            relay.close()
+        sock.close()
+
+
+def _lead(args):
+    from .timer_engine import TimerEngine, TimerEvent
+    engine = TimerEngine(args.workout, args.rest, args.lead_up, args.rounds, program=args.program)
+    publisher = MirrorPublisher(args.group, args.port, args.interface)
+
+    def on_event(event, engine):
+        if event != TimerEvent.Tick:
+            publisher.update(engine)
+
+    engine.subscribe(on_event)
+    engine.start()
+    try:
+        while engine.is_running:
+            time.sleep(max(0, engine.next_wakeup(boundaries_only=True) - now_ns()) / NS_PER_SEC)
+            engine.tick()
+            print(f"{engine.state.name:<13} round {min(engine.current_round + 1, engine.total_rounds)}"
+                  f"/{engine.total_rounds}", flush=True)
+    except KeyboardInterrupt:
+        engine.stop()
+    finally:
+        publisher.close()
+    print(f"Sent {publisher.packets} packets, {publisher.bytes_sent} bytes")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.mirror", description="Display mirroring over UDP multicast.")
+    parser.add_argument("--group", default=MIRROR_GROUP)
+    parser.add_argument("--port", type=int, default=MIRROR_PORT)
+    parser.add_argument("--interface", default="", help="IPv4 address of the interface (127.0.0.1: this machine only)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    follow = commands.add_parser("follow", help="print the leader's states as they arrive")
+    follow.add_argument("--http", type=int, metavar="PORT", help="also serve /viewer and /events on this port")
+    follow.add_argument("--http-host", default="127.0.0.1")
+    follow.add_argument("--token", default="", help="required when --http-host is not localhost")
+    lead = commands.add_parser("lead", help="run a timer without a window and mirror it")
+    lead.add_argument("workout", type=int)
+    lead.add_argument("rest", type=int)
+    lead.add_argument("lead_up", type=int)
+    lead.add_argument("rounds", type=int)
+    lead.add_argument("--program", default="standard")
+    args = parser.parse_args(argv)
+    if args.command == "follow":
+        _follow(args)
+    else:
+        _lead(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# type: ignore
+"""Follower display: `python -m src.mirror_view [--fullscreen] [--group G] [--port P] [--interface IP]`."""
+import sys
+import argparse
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QSocketNotifier
+
+from .mirror import MIRROR_GROUP, MIRROR_PORT, MirrorState, receiver_socket
+from .scheduler import DeadlineScheduler
+from .themes import ThemeManager
+from .view_model import build_view
+from .widgets import KioskWidget
+
+
+class FollowerDisplay(QObject):
+    """Shows a leader's timer in a KioskWidget, counted down on this machine.
+
+    Packets are read when the socket notifier fires; between them a
+    DeadlineScheduler wakes once per second flip, exactly as the leader's
+    own window does. Stands in for the main window as the kiosk's parent
+    (themes, set_kiosk_mode).
+    """
+
+    def __init__(self, group=MIRROR_GROUP, port=MIRROR_PORT, interface="", theme="default"):
+        super().__init__()
+        self.themes = ThemeManager(theme)
+        self.state = MirrorState()
+        self.sock = receiver_socket(group, port, interface)
+        self.notifier = QSocketNotifier(self.sock.fileno(), QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self._on_packets)
+        self.scheduler = DeadlineScheduler(self._refresh, self)
+        self.display = KioskWidget(self)
+        self.display.setWindowTitle("Workout Timer (waiting for the leader)")
+        self.display.unsetCursor()
+        self.display.resize(960, 540)
+        self.display.apply_view(build_view(self.state))
+
+    def set_kiosk_mode(self, enable: bool):
+        """Esc / double-click toggles between full screen and a normal window."""
+        if enable:
+            self.display.showFullScreen()
+        else:
+            self.display.showNormal()
+
+    def _on_packets(self):
+        if self.state.receive(self.sock):
+            self.display.setWindowTitle(f"Workout Timer ({self.state.program})")
+            self._refresh()
+
+    def _refresh(self):
+        self.state.tick()
+        self.display.apply_view(build_view(self.state))
+        self.scheduler.arm(self.state.next_wakeup())
+
+    def close(self):
+        self.notifier.setEnabled(False)
+        self.sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.mirror_view", description="Follow a mirrored timer.")
+    parser.add_argument("--group", default=MIRROR_GROUP)
+    parser.add_argument("--port", type=int, default=MIRROR_PORT)
+    parser.add_argument("--interface", default="")
+    parser.add_argument("--theme", default="default")
+    parser.add_argument("--fullscreen", action="store_true")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    app.setStyle("Fusion")
+    follower = FollowerDisplay(args.group, args.port, args.interface, args.theme)
+    follower.set_kiosk_mode(args.fullscreen)
+    app.aboutToQuit.connect(follower.close)
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import time
+import heapq
+import itertools
+
+from .clock import now_ns
+from .timeline import NS_PER_SEC
+from .timer_engine import TimerEngine
+
+# Rebuild the heap once stale entries outnumber live timers by this factor
+COMPACT_FACTOR = 2
+
+
+class _Slot:
+    __slots__ = ("engine", "name", "generation", "listener")
+
+    def __init__(self, engine, name):
+        self.engine = engine
+        self.name = name
+        self.generation = 0  # bumped on every reschedule; older heap entries are stale
+        self.listener = None
+
+
+class TimerPool:
+    """Many independent TimerEngines driven from one deadline heap.
+
+    Every timer keeps its own program, pause state and events; the pool only
+    decides when each one next needs a `tick()`. Next wakeups live in a heap
+    of (deadline, generation, timer id), so the owner arms a single timer for
+    `next_deadline()` and `run_due()` ticks just the timers that are due:
+    O(k log n) for k due out of n, never a sweep over all of them.
+    Rescheduling pushes a fresh entry and bumps the timer's generation
+    instead of searching the heap; stale entries are dropped as they surface
+    and the heap is compacted when they pile up.
+
+    All engines share the pool's clock. Drive them through the pool's
+    control methods (or call `reschedule(id)` after touching an engine
+    directly). `subscribe(callback)` receives callback(timer_id, event,
+    engine) for every event of every timer.
+    """
+
+    def __init__(self, clock=now_ns):
+        self._clock = clock
+        self._slots = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._subscribers = []
+        self.boundaries_only = False  # wake only at phase ends (nothing on screen)
+        self.wakeups = 0              # run_due() calls that found work
+        self.ticks = 0                # engine ticks performed
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def _emit(self, timer_id, event, engine):
+        for callback in tuple(self._subscribers):
+            callback(timer_id, event, engine)
+
+    # ------------------------------------------------------------------
+    # Timers
+    # ------------------------------------------------------------------
+    def add(self, workout_duration=60, rest_duration=45, lead_up_duration=5, rounds=10,
+            program="standard", name=None) -> int:
+        """Create an idle timer and return its id."""
+        timer_id = next(self._ids)
+        engine = TimerEngine(workout_duration, rest_duration, lead_up_duration, rounds,
+                             clock=self._clock, program=program)
+        slot = self._slots[timer_id] = _Slot(engine, name or f"Timer {timer_id}")
+        slot.listener = engine.subscribe(
+            lambda event, engine, timer_id=timer_id: self._emit(timer_id, event, engine))
+        return timer_id
+
+    def remove(self, timer_id) -> None:
+        slot = self._slots.pop(timer_id, None)
+        if slot is not None:
+            slot.engine.unsubscribe(slot.listener)
+            slot.generation += 1  # its heap entries are stale from now on
+
+    def engine(self, timer_id) -> TimerEngine:
+        return self._slots[timer_id].engine
+
+    def name(self, timer_id) -> str:
+        return self._slots[timer_id].name
+
+    def rename(self, timer_id, name) -> None:
+        self._slots[timer_id].name = name
+
+    # ------------------------------------------------------------------
+    # Controls (each reschedules just that timer)
+    # ------------------------------------------------------------------
+    def start(self, timer_id):
+        self._control(timer_id, TimerEngine.start)
+
+    def pause(self, timer_id):
+        self._control(timer_id, TimerEngine.pause)
+
+    def resume(self, timer_id):
+        self._control(timer_id, TimerEngine.resume)
+
+    def stop(self, timer_id):
+        self._control(timer_id, TimerEngine.stop)
+
+    def toggle(self, timer_id):
+        """Start an idle timer, pause a running one, resume a paused one."""
+        engine = self._slots[timer_id].engine
+        if engine.is_running:
+            self.pause(timer_id)
+        elif engine.is_paused:
+            self.resume(timer_id)
+        else:
+            self.start(timer_id)
+
+    def configure(self, timer_id, workout_duration, rest_duration, lead_up_duration, rounds,
+                  program=None):
+        self._slots[timer_id].engine.configure(
+            workout_duration, rest_duration, lead_up_duration, rounds, program)
+        self.reschedule(timer_id)
+
+    def _control(self, timer_id, method):
+        method(self._slots[timer_id].engine)
+        self.reschedule(timer_id)
+
+    def start_all(self):
+        for timer_id, slot in list(self._slots.items()):
+            if not slot.engine.is_running and not slot.engine.is_paused:
+                self.start(timer_id)
+
+    def pause_all(self):
+        for timer_id, slot in list(self._slots.items()):
+            if slot.engine.is_running:
+                self.pause(timer_id)
+
+    def resume_all(self):
+        for timer_id, slot in list(self._slots.items()):
+            if slot.engine.is_paused:
+                self.resume(timer_id)
+
+    def stop_all(self):
+        for timer_id in list(self._slots):
+            self.stop(timer_id)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def reschedule(self, timer_id) -> None:
+        """Queue the timer's next wakeup (none while idle or paused)."""
+        slot = self._slots[timer_id]
+        slot.generation += 1
+        deadline = slot.engine.next_wakeup(boundaries_only=self.boundaries_only)
+        if deadline is not None:
+            heapq.heappush(self._heap, (deadline, slot.generation, timer_id))
+            if len(self._heap) > COMPACT_FACTOR * len(self._slots) + 64:
+                self._compact()
+
+    def reschedule_all(self) -> None:
+        """Recompute every wakeup, e.g. after `boundaries_only` changed."""
+        for timer_id in list(self._slots):
+            self.reschedule(timer_id)
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._is_live(entry)]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry) -> bool:
+        slot = self._slots.get(entry[2])
+        return slot is not None and slot.generation == entry[1]
+
+    def next_deadline(self):
+        """Clock value (ns) of the earliest pending wakeup, or None when all are quiet."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, now=None) -> list:
+        """Tick every timer whose wakeup is due; returns their ids (for redrawing)."""
+        now = self._clock() if now is None else now
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                due.append(entry[2])
+        for timer_id in due:
+            self._slots[timer_id].engine.tick()
+            self.reschedule(timer_id)
+        if due:
+            self.wakeups += 1
+            self.ticks += len(due)
+        return due
+
+
+####################################
+# Benchmark
+####################################
+def benchmark(counts=(10, 100, 1000, 10000), seconds=30, seed=1):
+    """Simulate `seconds` of running timers on a virtual clock for each pool size.
+
+    Timers get varied programs and starts staggered across one second, as in
+    a circuit class. Reports the cost per engine tick through the heap and,
+    for comparison, per timer for a sweep that ticks every timer at each
+    wakeup (what one polling QTimer per pool would do).
+    """
+    import random
+
+    rng = random.Random(seed)
+    rows = []
+    for count in counts:
+        clock = [0]
+        pool = TimerPool(clock=lambda: clock[0])
+        for _ in range(count):
+            timer_id = pool.add(rng.randint(20, 60), rng.randint(5, 30), 0, 50)
+            clock[0] = rng.randrange(NS_PER_SEC)
+            pool.start(timer_id)
+        end = clock[0] + seconds * NS_PER_SEC
+
+        started = time.perf_counter()
+        while True:
+            deadline = pool.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            clock[0] = deadline
+            pool.run_due(deadline)
+        heap_s = time.perf_counter() - started
+
+        engines = [pool.engine(timer_id) for timer_id in pool]
+        sweeps = max(1, min(pool.wakeups, 200))
+        started = time.perf_counter()
+        for _ in range(sweeps):
+            for engine in engines:
+                engine.tick()
+        sweep_s = time.perf_counter() - started
+
+        rows.append((count, pool.wakeups, pool.ticks, heap_s / max(1, pool.ticks) * 1e6,
+                     heap_s / max(1, pool.wakeups) * 1e6, sweep_s / sweeps * 1e6))
+    lines = [f"{'timers':>7} {'wakeups':>8} {'ticks':>9} {'us/tick':>8} {'us/wakeup':>10} {'sweep us':>10}"]
+    lines += [f"{count:>7} {wakeups:>8} {ticks:>9} {per_tick:>8.2f} {per_wakeup:>10.1f} {sweep:>10.1f}"
+              for count, wakeups, ticks, per_tick, per_wakeup, sweep in rows]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(benchmark())
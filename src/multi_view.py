@@ -0,0 +1,250 @@
+# type: ignore
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QScrollArea, QPushButton, QLabel,
+    QMenu, QInputDialog, QSpinBox,
+)
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+from .audio import Cue
+from .multi_timer import TimerPool
+from .scheduler import DeadlineScheduler
+from .timer_engine import TimerEvent
+from .timer_state import TimerState
+from .view_model import PHASES, format_round, format_clock
+from .visibility import VisibilityTracker
+
+TILE_SIZE = (132, 64)
+
+
+class TimerTile(QWidget):
+    """One timer of the grid: name, time left and round on its phase colour.
+
+    Left click starts / pauses / resumes, right click opens the timer's menu.
+    Repaints only when the text or colour it shows actually changed.
+    """
+
+    def __init__(self, view, timer_id, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.timer_id = timer_id
+        self.muted = False
+        self._shown = None  # (phase, paused, name, clock, round) last painted
+        self.setFixedSize(*TILE_SIZE)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def refresh(self):
+        pool = self.view.pool
+        engine = pool.engine(self.timer_id)
+        shown = (PHASES[engine.state], engine.is_paused, pool.name(self.timer_id),
+                 format_clock(engine.remaining_time), format_round(engine.current_round, engine.total_rounds))
+        if shown != self._shown:
+            self._shown = shown
+            self.update()
+
+    def paintEvent(self, event):
+        if self._shown is None:
+            return
+        phase, paused, name, clock, rounds = self._shown
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        color = QColor(self.view.themes.qcolor(phase))
+        if paused:
+            color.setAlpha(140)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(1, 1, -1, -1), 6, 6)
+        painter.setPen(Qt.white)
+        painter.setFont(self.view.small_font)
+        painter.drawText(self.rect().adjusted(6, 3, -6, 0), Qt.AlignLeft | Qt.AlignTop, name)
+        painter.drawText(self.rect().adjusted(6, 0, -6, -3), Qt.AlignRight | Qt.AlignBottom,
+                         ("muted  " if self.muted else "") + rounds)
+        painter.setFont(self.view.clock_font)
+        painter.drawText(self.rect().adjusted(6, 8, -6, -8), Qt.AlignLeft | Qt.AlignVCenter, clock)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.view.control(self.timer_id, TimerPool.toggle)
+        elif event.button() == Qt.RightButton:
+            self.view.show_tile_menu(self, event.globalPos())
+
+
+class MultiTimerWindow(QWidget):
+    """Circuit mode: a compact grid of independent timers on one TimerPool.
+
+    The pool keeps every timer's next wakeup in a heap, so one
+    DeadlineScheduler armed for the earliest deadline drives the whole grid
+    and each wakeup ticks and repaints only the tiles that were due. Closing
+    the window only hides it: timers keep running, and while it is hidden
+    only phase ends (and their cues) wake it.
+    """
+
+    def __init__(self, template, themes, audio=None, parent=None):
+        """`template()` returns (workout, rest, lead_up, rounds, program) for new timers."""
+        super().__init__(parent, Qt.Window)
+        self.setWindowTitle("Circuit Timers")
+        self.template = template
+        self.themes = themes
+        self.audio = audio
+        self.pool = TimerPool()
+        self.pool.subscribe(self._on_timer_event)
+        self.tiles = {}
+        self.small_font = QFont(self.font())
+        self.small_font.setPointSize(8)
+        self.clock_font = QFont(self.font())
+        self.clock_font.setPointSize(18)
+        self.clock_font.setBold(True)
+
+        layout = QVBoxLayout(self)
+        toolbar = QHBoxLayout()
+        self.add_count = QSpinBox(self)
+        self.add_count.setRange(1, 500)
+        self.add_count.setToolTip("Number of timers to add with the current settings")
+        toolbar.addWidget(self.add_count)
+        for label, slot in (("Add", self.add_timers), ("Start All", self.pool.start_all),
+                            ("Pause All", self.pool.pause_all), ("Resume All", self.pool.resume_all),
+                            ("Stop All", self.pool.stop_all)):
+            button = QPushButton(label, self)
+            button.clicked.connect(lambda _, s=slot: self._run(s))
+            toolbar.addWidget(button)
+        toolbar.addStretch()
+        self.count_label = QLabel(self)
+        toolbar.addWidget(self.count_label)
+        layout.addLayout(toolbar)
+
+        self.grid_host = QWidget(self)
+        self.grid = QGridLayout(self.grid_host)
+        self.grid.setSpacing(4)
+        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        scroll = QScrollArea(self)
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.grid_host)
+        layout.addWidget(scroll)
+        self._columns = 0
+        self.resize(6 * (TILE_SIZE[0] + 4) + 40, 4 * (TILE_SIZE[1] + 4) + 80)
+
+        self.scheduler = DeadlineScheduler(self._wake, self)
+        self.visibility = VisibilityTracker(self)
+        self.visibility.track(self)
+        self.visibility.changed.connect(self._on_visibility_changed)
+        self.visibility.shown.connect(lambda _widget: self._catch_up())
+        self._update_count()
+
+    # ---------------- Timers ------------------
+    def add_timers(self, count=None):
+        workout, rest, lead_up, rounds, program = self.template()
+        for _ in range(count or self.add_count.value()):
+            timer_id = self.pool.add(workout, rest, lead_up, rounds, program)
+            tile = self.tiles[timer_id] = TimerTile(self, timer_id, self.grid_host)
+            tile.refresh()
+        self._relayout(force=True)
+        self._update_count()
+
+    def remove_timer(self, timer_id):
+        self.pool.remove(timer_id)
+        tile = self.tiles.pop(timer_id)
+        self.grid.removeWidget(tile)
+        tile.deleteLater()
+        self._relayout(force=True)
+        self._update_count()
+        self._arm()
+
+    def control(self, timer_id, method):
+        """Apply a TimerPool control to one timer, then redraw it and re-arm."""
+        method(self.pool, timer_id)
+        self.tiles[timer_id].refresh()
+        self._arm()
+
+    def _run(self, action):
+        action()
+        for tile in self.tiles.values():
+            tile.refresh()
+        self._arm()
+
+    def show_tile_menu(self, tile, pos):
+        engine = self.pool.engine(tile.timer_id)
+        menu = QMenu(self)
+        if engine.state == TimerState.Idle:
+            menu.addAction("Start").triggered.connect(lambda: self.control(tile.timer_id, TimerPool.start))
+        elif engine.is_paused:
+            menu.addAction("Resume").triggered.connect(lambda: self.control(tile.timer_id, TimerPool.resume))
+        else:
+            menu.addAction("Pause").triggered.connect(lambda: self.control(tile.timer_id, TimerPool.pause))
+        if engine.state != TimerState.Idle:
+            menu.addAction("Stop").triggered.connect(lambda: self.control(tile.timer_id, TimerPool.stop))
+        menu.addSeparator()
+        menu.addAction("Use Current Settings").triggered.connect(lambda: self._reconfigure(tile.timer_id))
+        menu.addAction("Rename...").triggered.connect(lambda: self._rename(tile))
+        mute = menu.addAction("Mute Cues")
+        mute.setCheckable(True)
+        mute.setChecked(tile.muted)
+        mute.triggered.connect(lambda checked: (setattr(tile, "muted", checked), tile.update()))
+        menu.addAction("Remove").triggered.connect(lambda: self.remove_timer(tile.timer_id))
+        menu.exec_(pos)
+
+    def _reconfigure(self, timer_id):
+        self.pool.configure(timer_id, *self.template())
+        self.tiles[timer_id].refresh()
+        self._arm()
+
+    def _rename(self, tile):
+        name, ok = QInputDialog.getText(self, "Rename Timer", "Name:", text=self.pool.name(tile.timer_id))
+        if ok and name.strip():
+            self.pool.rename(tile.timer_id, name.strip())
+            tile.refresh()
+
+    # ---------------- Scheduling ------------------
+    def _arm(self):
+        self.scheduler.arm(self.pool.next_deadline())
+
+    def _wake(self):
+        with_tiles = self.visibility.any_visible
+        for timer_id in self.pool.run_due():
+            if with_tiles:
+                self.tiles[timer_id].refresh()
+        self._arm()
+
+    def _on_timer_event(self, timer_id, event, engine):
+        if self.audio is None or event not in (TimerEvent.Boundary, TimerEvent.Complete):
+            return
+        tile = self.tiles.get(timer_id)
+        if tile is None or tile.muted:
+            return
+        if event == TimerEvent.Complete:
+            cue = Cue.CompleteFinish
+        elif engine.previous_state == TimerState.Workout:
+            cue = Cue.WorkFinish
+        else:
+            cue = Cue.RestFinish
+        self.audio.play(cue, due_ns=engine.last_boundary)
+
+    def _on_visibility_changed(self, visible):
+        self.pool.boundaries_only = not visible
+        self.pool.reschedule_all()
+        self._arm()
+
+    def _catch_up(self):
+        """Bring every tile up to date after the window was hidden."""
+        for timer_id, tile in self.tiles.items():
+            self.pool.engine(timer_id).tick()
+            tile.refresh()
+        self.pool.reschedule_all()
+        self._arm()
+
+    # ---------------- Layout ------------------
+    def _update_count(self):
+        self.count_label.setText(f"{len(self.pool)} timer{'s' if len(self.pool) != 1 else ''}")
+
+    def _relayout(self, force=False):
+        columns = max(1, (self.grid_host.width() - 8) // (TILE_SIZE[0] + self.grid.spacing()))
+        if columns == self._columns and not force:
+            return
+        self._columns = columns
+        for tile in self.tiles.values():
+            self.grid.removeWidget(tile)
+        for position, tile in enumerate(self.tiles.values()):
+            self.grid.addWidget(tile, *divmod(position, columns))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._relayout()
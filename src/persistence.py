@@ -0,0 +1,129 @@
+import os
+import json
+import logging
+import atexit
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Set
+
+# Seconds without further changes before pending settings are written
+QUIET_PERIOD = 0.5
+
+
+def write_json_atomic(filename: str, data) -> None:
+    """Write `data` as JSON to a temp file next to `filename`, then rename over it."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SettingsWriter:
+    """Write-behind worker that coalesces bursts of saves into one atomic write.
+
+    `schedule()` only records the latest snapshot for a file and returns at
+    once; a background thread writes it after `quiet_period` seconds without
+    further changes. `flush()` writes everything pending immediately.
+    """
+
+    def __init__(self, quiet_period: float = QUIET_PERIOD):
+        self.quiet_period = quiet_period
+        self.writes = 0       # files actually written
+        self.coalesced = 0    # schedule() calls absorbed by a later snapshot
+        self._pending: Dict[str, tuple] = {}  # filename -> (snapshot, due monotonic time, version)
+        self._version = 0
+        self._written: Dict[str, int] = {}    # filename -> version last written
+        self._writing: Set[str] = set()       # filenames currently being written by the worker
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # keeps worker and flush() writes ordered
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def schedule(self, filename: str, data) -> None:
+        with self._cond:
+            if filename in self._pending:
+                self.coalesced += 1
+            self._version += 1
+            self._pending[filename] = (data, time.monotonic() + self.quiet_period, self._version)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def is_busy(self, filename: str) -> bool:
+        """True while a snapshot of `filename` is pending or being written."""
+        with self._cond:
+            return filename in self._pending or filename in self._writing
+
+    def flush(self) -> None:
+        """Write all pending snapshots now, on the calling thread."""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        for filename, (data, _due, version) in pending.items():
+            self._write(filename, data, version)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [name for name, (_d, at, _v) in self._pending.items() if at <= now]
+                    if due:
+                        break
+                    timeout = min((at for _d, at, _v in self._pending.values()), default=None)
+                    self._cond.wait(None if timeout is None else timeout - now)
+                if self._closed:
+                    return
+                batch = [(name, self._pending.pop(name)) for name in due]
+                self._writing.update(due)
+            for filename, (data, _due, version) in batch:
+                self._write(filename, data, version)
+            with self._cond:
+                self._writing.difference_update(due)
+
+    def _write(self, filename, data, version):
+        with self._write_lock:
+            # A newer snapshot may already have been flushed by another thread
+            if self._written.get(filename, 0) >= version:
+                return
+            try:
+                write_json_atomic(filename, data)
+                self._written[filename] = version
+                self.writes += 1
+            except Exception as e:
+                logging.warning("Error saving settings: %s", e)
+
+
+_writer = None
+
+
+def get_writer() -> SettingsWriter:
+    """Process-wide writer; pending writes are flushed at interpreter exit."""
+    global _writer
+    if _writer is None:
+        _writer = SettingsWriter()
+        atexit.register(_writer.close)
+    return _writer
+
+
+def flush_pending_writes() -> None:
+    if _writer is not None:
+        _writer.flush()
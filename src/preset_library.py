@@ -0,0 +1,297 @@
+import time
+import atexit
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+PRESETS_FILE = "presets.db"
+# Presets per menu page / per fetch in the library dialog
+PAGE_SIZE = 20
+# The timer settings a preset stores (same as app.DURATION_KEYS)
+PRESET_KEYS = ("workout_duration", "rest_duration", "lead_up_duration", "rounds")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id                INTEGER PRIMARY KEY,   -- legacy slots keep ids 1-3
+    name              TEXT NOT NULL COLLATE NOCASE UNIQUE,
+    workout_duration  INTEGER NOT NULL,
+    rest_duration     INTEGER NOT NULL,
+    lead_up_duration  INTEGER NOT NULL,
+    rounds            INTEGER NOT NULL,
+    created_at        REAL NOT NULL,
+    last_used         REAL                   -- NULL until first loaded
+);
+CREATE INDEX IF NOT EXISTS presets_recent ON presets (last_used DESC, name);
+CREATE INDEX IF NOT EXISTS presets_values
+    ON presets (workout_duration, rest_duration, lead_up_duration, rounds);
+
+CREATE TABLE IF NOT EXISTS preset_tags (
+    tag        TEXT NOT NULL COLLATE NOCASE,
+    preset_id  INTEGER NOT NULL REFERENCES presets (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, preset_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS preset_tags_preset ON preset_tags (preset_id);
+"""
+
+
+@dataclass(frozen=True)
+class Preset:
+    id: int
+    name: str
+    tags: tuple
+    workout_duration: int
+    rest_duration: int
+    lead_up_duration: int
+    rounds: int
+
+    @property
+    def values(self) -> dict:
+        """The timer settings to apply when loading this preset."""
+        return {key: getattr(self, key) for key in PRESET_KEYS}
+
+    @property
+    def tooltip(self) -> str:
+        text = (f"Workout: {self.workout_duration}s\nRest: {self.rest_duration}s\n"
+                f"Lead-up: {self.lead_up_duration}s\nRounds: {self.rounds}")
+        if self.tags:
+            text += "\nTags: " + ", ".join(self.tags)
+        return text
+
+
+def parse_name(text: str):
+    """Split 'Leg day #strength #hiit' into ('Leg day', ('strength', 'hiit'))."""
+    words = text.split()
+    tags = tuple(dict.fromkeys(word[1:].lower() for word in words if word.startswith("#") and len(word) > 1))
+    name = " ".join(word for word in words if not word.startswith("#"))
+    return name, tags
+
+
+def parse_query(text: str):
+    """Search text -> (name words, tags); '#tag' words filter by tag, the rest match names."""
+    words = text.split()
+    tags = tuple(word[1:] for word in words if word.startswith("#") and len(word) > 1)
+    return tuple(word for word in words if not word.startswith("#")), tags
+
+
+class PresetLibrary:
+    """Named timer presets in their own SQLite database (presets.db).
+
+    Saving or deleting a preset writes just that row and its tags. Menus
+    read a page at a time: `search()` filters by name words (substring,
+    case-insensitive) and '#tag' words (via the tag index) and orders by
+    most recently used, then name. `generation` grows with every change so
+    menus can tell whether their cached page is stale; `subscribe()`
+    callbacks run after each change to the presets themselves (once per
+    merge or migration, and not for `touch()`, which only reorders).
+    """
+
+    def __init__(self, filename: str = PRESETS_FILE):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.generation = 0
+        self._subscribers: List[Callable[[], None]] = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def _changed(self, notify: bool = True):
+        self.generation += 1
+        if notify:
+            for callback in tuple(self._subscribers):
+                callback()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    _SELECT = f"""
+        SELECT p.id, p.name, (SELECT group_concat(tag, ' ') FROM preset_tags WHERE preset_id = p.id),
+               {", ".join(f"p.{key}" for key in PRESET_KEYS)}
+        FROM presets AS p
+    """
+
+    @staticmethod
+    def _preset(row) -> Preset:
+        preset_id, name, tags, *values = row
+        return Preset(preset_id, name, tuple(sorted(tags.split())) if tags else (), *values)
+
+    @staticmethod
+    def _where(query: str):
+        words, tags = parse_query(query)
+        clauses, params = [], []
+        for word in words:
+            clauses.append("p.name LIKE ? ESCAPE '\\'")
+            escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        for tag in tags:
+            clauses.append("p.id IN (SELECT preset_id FROM preset_tags WHERE tag = ?)")
+            params.append(tag)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def search(self, query: str = "", offset: int = 0, limit: int = PAGE_SIZE) -> list:
+        """One page of presets matching `query`, most recently used first."""
+        where, params = self._where(query)
+        sql = (self._SELECT + where + " ORDER BY p.last_used IS NULL, p.last_used DESC, p.name"
+               " LIMIT ? OFFSET ?")
+        return [self._preset(row) for row in self.conn.execute(sql, (*params, limit, offset))]
+
+    def count(self, query: str = "") -> int:
+        where, params = self._where(query)
+        return self.conn.execute("SELECT count(*) FROM presets AS p" + where, params).fetchone()[0]
+
+    def all(self) -> list:
+        """Every preset ordered by id (for exports)."""
+        return [self._preset(row) for row in self.conn.execute(self._SELECT + " ORDER BY p.id")]
+
+    def get(self, preset_id: int):
+        row = self.conn.execute(self._SELECT + " WHERE p.id = ?", (preset_id,)).fetchone()
+        return self._preset(row) if row else None
+
+    def find(self, name: str):
+        row = self.conn.execute(self._SELECT + " WHERE p.name = ?", (name,)).fetchone()
+        return self._preset(row) if row else None
+
+    def matching(self, values: dict):
+        """Id of a preset with exactly these timer settings (most recently used), or None."""
+        row = self.conn.execute(
+            "SELECT id FROM presets WHERE workout_duration = ? AND rest_duration = ?"
+            " AND lead_up_duration = ? AND rounds = ? ORDER BY last_used DESC LIMIT 1",
+            tuple(values[key] for key in PRESET_KEYS)).fetchone()
+        return row[0] if row else None
+
+    def tags(self) -> list:
+        """[(tag, number of presets), ...] alphabetically."""
+        return self.conn.execute(
+            "SELECT tag, count(*) FROM preset_tags GROUP BY tag ORDER BY tag").fetchall()
+
+    # ------------------------------------------------------------------
+    # Writes (each one row plus its tags, in one transaction)
+    # ------------------------------------------------------------------
+    def save(self, name: str, values: dict, tags=(), preset_id: Optional[int] = None) -> int:
+        """Create or overwrite the preset called `name`; returns its id.
+
+        `preset_id` is only a wish for new presets (kept if still free).
+        """
+        preset_id = self._save(name, values, tags, preset_id)
+        self._changed()
+        return preset_id
+
+    def _save(self, name, values, tags, preset_id):
+        name = name.strip()
+        if not name:
+            raise ValueError("a preset needs a name")
+        row = (*(int(values[key]) for key in PRESET_KEYS),)
+        with self.conn:
+            existing = self.conn.execute("SELECT id FROM presets WHERE name = ?", (name,)).fetchone()
+            if existing:
+                preset_id = existing[0]
+                self.conn.execute(
+                    "UPDATE presets SET " + ", ".join(f"{key} = ?" for key in PRESET_KEYS) + " WHERE id = ?",
+                    (*row, preset_id))
+                self.conn.execute("DELETE FROM preset_tags WHERE preset_id = ?", (preset_id,))
+            else:
+                if preset_id is not None and self.conn.execute(
+                        "SELECT 1 FROM presets WHERE id = ?", (preset_id,)).fetchone():
+                    preset_id = None
+                preset_id = self.conn.execute(
+                    f"INSERT INTO presets (id, name, {', '.join(PRESET_KEYS)}, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", (preset_id, name, *row, time.time())).lastrowid
+            self.conn.executemany("INSERT OR IGNORE INTO preset_tags (tag, preset_id) VALUES (?, ?)",
+                                  ((tag.lower(), preset_id) for tag in tags))
+        return preset_id
+
+    def rename(self, preset_id: int, text: str) -> None:
+        """Rename from 'New name #tag ...' text, replacing the tags."""
+        name, tags = parse_name(text)
+        preset = self.get(preset_id)
+        if preset is None:
+            return
+        if name.lower() != preset.name.lower() and self.find(name):
+            raise ValueError(f"a preset called {name!r} already exists")
+        with self.conn:
+            self.conn.execute("UPDATE presets SET name = ? WHERE id = ?", (name or preset.name, preset_id))
+            self.conn.execute("DELETE FROM preset_tags WHERE preset_id = ?", (preset_id,))
+            self.conn.executemany("INSERT OR IGNORE INTO preset_tags (tag, preset_id) VALUES (?, ?)",
+                                  ((tag, preset_id) for tag in tags))
+        self._changed()
+
+    def touch(self, preset_id: int) -> None:
+        """Mark a preset as just used (it moves to the top of the menus when they next open)."""
+        with self.conn:
+            self.conn.execute("UPDATE presets SET last_used = ? WHERE id = ?", (time.time(), preset_id))
+        self._changed(notify=False)
+
+    def delete(self, preset_id: int) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+        self._changed()
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM presets")
+        self._changed()
+
+    def merge(self, presets) -> dict:
+        """Save imported preset dicts (name, tags, settings, optional id).
+
+        Returns {imported id: id here} for presets that came with an id; a
+        preset lands on another id when its name already exists here or its
+        id is taken by another preset.
+        """
+        ids = {}
+        for preset in presets:
+            tags = preset.get("tags") or ()
+            if isinstance(tags, str):
+                tags = tags.split()
+            preset_id = self._save(preset["name"], preset, tags, preset.get("id"))
+            if preset.get("id") is not None:
+                ids[int(preset["id"])] = preset_id
+        if presets:
+            self._changed()
+        return ids
+
+    def migrate_legacy(self, slots) -> int:
+        """Add Config.presets (three slots of dicts or None) as 'Preset N', keeping id N.
+
+        Ids 1-3 are what history.db recorded for the slots, so statistics
+        stay attached. A slot whose name is already taken is left alone.
+        """
+        migrated = 0
+        for slot, values in enumerate(slots, 1):
+            if values and self.find(f"Preset {slot}") is None:
+                self._save(f"Preset {slot}", values, ("legacy",), preset_id=slot)
+                migrated += 1
+        if migrated:
+            self._changed()
+        return migrated
+
+    def changed_elsewhere(self) -> None:
+        """Tell subscribers the file was changed through another connection (an import)."""
+        self._changed()
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_settings(library: PresetLibrary, store) -> int:
+    """Move the legacy slots out of a SettingsStore into `library`; returns how many."""
+    if not store.config.presets:
+        return 0
+    migrated = library.migrate_legacy(store.config.presets)
+    store.set(presets=[])
+    return migrated
+
+
+_library = None
+
+
+def get_library() -> PresetLibrary:
+    """Process-wide preset library, opened on first use."""
+    global _library
+    if _library is None:
+        _library = PresetLibrary()
+        atexit.register(_library.close)
+    return _library
@@ -0,0 +1,197 @@
+# type: ignore
+from PyQt5.QtWidgets import (
+    QMenu, QAction, QWidgetAction, QLineEdit, QToolTip, QDialog, QVBoxLayout, QHBoxLayout,
+    QLabel, QListWidget, QListWidgetItem, QPushButton, QInputDialog, QMessageBox,
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QCursor
+
+from .preset_library import PAGE_SIZE
+
+
+class PresetMenu(QMenu):
+    """Preset menu filled from the library each time it opens, if anything changed.
+
+    It holds "Save Current as New Preset...", "Manage Presets...", an
+    optional search box and one page of matching presets (most recently
+    used first). "More..." opens the library dialog on the same search.
+    Tooltips are looked up when an entry is hovered, not built up front.
+    `window` is the WorkoutTimer (library, load_preset, save_preset_as,
+    manage_presets).
+    """
+
+    def __init__(self, window, title="", searchable=True, parent=None):
+        super().__init__(title, parent or window)
+        self.window = window
+        self.searchable = searchable
+        self.search_box = None
+        self._query = ""
+        self._filled = None  # (library generation, query) of the current page
+        self._page_actions = []
+        self.aboutToShow.connect(self._refresh)
+        self.hovered.connect(self._show_tooltip)
+
+    def _build(self):
+        if self.searchable:
+            self.search_box = QLineEdit(self)
+            self.search_box.setPlaceholderText("Search name or #tag")
+            self.search_box.setClearButtonEnabled(True)
+            self.search_box.textChanged.connect(self._set_query)
+            search_action = QWidgetAction(self)
+            search_action.setDefaultWidget(self.search_box)
+            self.addAction(search_action)
+        self.addAction("Save Current as New Preset...").triggered.connect(self.window.save_preset_as)
+        self.addAction("Manage Presets...").triggered.connect(lambda: self.window.manage_presets(self._query))
+        self.addSeparator()
+
+    def _refresh(self):
+        if self._filled is None:
+            self._build()
+        if self._filled != (self.window.library.generation, self._query):
+            self._fill()
+        if self.search_box is not None:
+            QTimer.singleShot(0, self.search_box.setFocus)
+
+    def _set_query(self, text):
+        self._query = text.strip()
+        self._fill()
+
+    def _fill(self):
+        library = self.window.library
+        for action in self._page_actions:
+            self.removeAction(action)
+            action.deleteLater()
+        self._page_actions = []
+        presets = library.search(self._query, limit=PAGE_SIZE)
+        for preset in presets:
+            action = QAction(preset.name, self)
+            action.setData(preset.id)
+            action.triggered.connect(lambda _, i=preset.id: self.window.load_preset(i))
+            self._page_actions.append(action)
+        if not presets:
+            action = QAction("(no matches)" if self._query else "(no presets yet)", self)
+            action.setEnabled(False)
+            self._page_actions.append(action)
+        elif len(presets) == PAGE_SIZE:
+            remaining = library.count(self._query) - PAGE_SIZE
+            if remaining > 0:
+                action = QAction(f"More... ({remaining} more)", self)
+                action.triggered.connect(lambda: self.window.manage_presets(self._query))
+                self._page_actions.append(action)
+        self.addActions(self._page_actions)
+        self._filled = (library.generation, self._query)
+
+    def _show_tooltip(self, action):
+        preset_id = action.data()
+        if preset_id is None:
+            return
+        preset = self.window.library.get(preset_id)
+        if preset is not None:
+            QToolTip.showText(QCursor.pos(), preset.tooltip, self)
+
+
+class PresetLibraryDialog(QDialog):
+    """Search, load, rename and delete presets; the list fetches a page at a time
+    as it is scrolled."""
+
+    def __init__(self, window, query="", parent=None):
+        super().__init__(parent or window)
+        self.window = window
+        self.library = window.library
+        self._loaded = 0
+        self._exhausted = False
+        self.setWindowTitle("Presets")
+        self.resize(360, 460)
+
+        layout = QVBoxLayout(self)
+        self.search_box = QLineEdit(query, self)
+        self.search_box.setPlaceholderText("Search name or #tag")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(lambda _text: self.reload())
+        layout.addWidget(self.search_box)
+        self.count_label = QLabel(self)
+        layout.addWidget(self.count_label)
+        self.list = QListWidget(self)
+        self.list.itemActivated.connect(lambda _item: self.load_selected())
+        self.list.verticalScrollBar().valueChanged.connect(self._maybe_fetch_more)
+        layout.addWidget(self.list)
+
+        buttons = QHBoxLayout()
+        for label, slot in (("Load", self.load_selected), ("Rename...", self.rename_selected),
+                            ("Delete", self.delete_selected), ("Close", self.reject)):
+            button = QPushButton(label, self)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+        self.library.subscribe(self._on_library_changed)
+        self.reload()
+
+    def set_query(self, query):
+        if query != self.search_box.text():
+            self.search_box.setText(query)  # reloads via textChanged
+
+    def reload(self):
+        """Re-read the list, keeping the selected preset and the scroll position."""
+        query = self.search_box.text().strip()
+        selected = self._selected_id()
+        scroll = self.list.verticalScrollBar().value()
+        self.list.clear()
+        self._loaded = 0
+        self._exhausted = False
+        total = self.library.count(query)
+        self.count_label.setText(f"{total} preset{'s' if total != 1 else ''}")
+        self._fetch_more()
+        while self.list.verticalScrollBar().maximum() < scroll and not self._exhausted:
+            self._fetch_more()
+        self.list.verticalScrollBar().setValue(scroll)
+        for row in range(self.list.count()):
+            if self.list.item(row).data(Qt.UserRole) == selected:
+                self.list.setCurrentRow(row)
+                break
+
+    def _fetch_more(self):
+        presets = self.library.search(self.search_box.text().strip(), offset=self._loaded, limit=PAGE_SIZE)
+        for preset in presets:
+            item = QListWidgetItem(preset.name + ("  #" + " #".join(preset.tags) if preset.tags else ""))
+            item.setData(Qt.UserRole, preset.id)
+            item.setToolTip(preset.tooltip)
+            self.list.addItem(item)
+        self._loaded += len(presets)
+        self._exhausted = len(presets) < PAGE_SIZE
+
+    def _maybe_fetch_more(self, value):
+        if not self._exhausted and value >= self.list.verticalScrollBar().maximum() - 2:
+            self._fetch_more()
+
+    def _on_library_changed(self):
+        if self.isVisible():
+            self.reload()
+
+    def _selected_id(self):
+        item = self.list.currentItem()
+        return item.data(Qt.UserRole) if item is not None else None
+
+    def load_selected(self):
+        preset_id = self._selected_id()
+        if preset_id is not None:
+            self.window.load_preset(preset_id)
+
+    def rename_selected(self):
+        preset_id = self._selected_id()
+        preset = self.library.get(preset_id) if preset_id is not None else None
+        if preset is None:
+            return
+        current = " ".join((preset.name, *(f"#{tag}" for tag in preset.tags)))
+        text, ok = QInputDialog.getText(self, "Rename Preset", "Name and #tags:", text=current)
+        if ok and text.strip():
+            try:
+                self.library.rename(preset_id, text)
+            except ValueError as e:
+                QMessageBox.warning(self, "Rename Preset", str(e))
+
+    def delete_selected(self):
+        preset_id = self._selected_id()
+        preset = self.library.get(preset_id) if preset_id is not None else None
+        if preset is not None and QMessageBox.question(
+                self, "Delete Preset", f"Delete preset {preset.name!r}?") == QMessageBox.Yes:
+            self.library.delete(preset_id)
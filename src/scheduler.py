@@ -0,0 +1,49 @@
+# type: ignore
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+from .clock import now_ns
+
+
+class DeadlineScheduler(QObject):
+    """Arms one precise single-shot QTimer for the next deadline instead of polling.
+
+    Deadlines are absolute `clock.now_ns()` values (the engine's clock). Arming with None (or
+    calling `disarm`) leaves the scheduler completely quiet until re-armed.
+    """
+
+    def __init__(self, callback, parent=None, clock=now_ns):
+        super().__init__(parent)
+        self._callback = callback
+        self._clock = clock
+        self._deadline = None
+        self.wakeups = 0  # number of times the callback has fired
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
+
+    @property
+    def deadline(self):
+        return self._deadline
+
+    def arm(self, deadline):
+        """Fire the callback once at `deadline` (ns), replacing any earlier arming."""
+        if deadline is None:
+            self.disarm()
+            return
+        if deadline == self._deadline and self._timer.isActive():
+            return
+        self._deadline = deadline
+        # Round up so we never wake before the boundary we are waiting for
+        delay_ms = max(0, -(-(deadline - self._clock()) // 1_000_000))
+        self._timer.start(delay_ms)
+
+    def disarm(self):
+        self._deadline = None
+        self._timer.stop()
+
+    def _fire(self):
+        self.wakeups += 1
+        self._deadline = None
+        self._callback()
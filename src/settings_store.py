@@ -0,0 +1,110 @@
+import json
+from dataclasses import asdict, fields
+from typing import Dict
+
+from .config import Config, SETTINGS_FILE
+from .persistence import get_writer
+
+# Subscribe to this name to hear about every field
+ANY_FIELD = "*"
+
+
+class SettingsStore:
+    """The one in-process owner of the settings, with per-field change callbacks.
+
+    settings.json is read once; every part of the UI shares `store.config`
+    for reads and goes through `set()` for writes. Callbacks registered with
+    `subscribe(field, callback)` receive callback(field, value) only when that
+    field actually changed, whether through `set()`, `reset()` or an external
+    edit picked up by `reload_from_disk()`.
+    """
+
+    _instance = None
+
+    def __init__(self, filename: str = SETTINGS_FILE):
+        self.filename = filename
+        self.config = Config.load_from_file(filename)
+        self._field_names = [f.name for f in fields(Config)]
+        self._subscribers: Dict[str, list] = {}  # field name -> [callback]
+
+    @classmethod
+    def instance(cls) -> "SettingsStore":
+        """Shared store for the process (settings.json is only parsed once)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self, field: str, callback):
+        if field != ANY_FIELD and field not in self._field_names:
+            raise AttributeError(f"Config has no field {field!r}")
+        self._subscribers.setdefault(field, []).append(callback)
+        return callback
+
+    def unsubscribe(self, field: str, callback):
+        callbacks = self._subscribers.get(field, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def _notify(self, changed):
+        for name in changed:
+            value = getattr(self.config, name)
+            for callback in tuple(self._subscribers.get(name, ())):
+                callback(name, value)
+            for callback in tuple(self._subscribers.get(ANY_FIELD, ())):
+                callback(name, value)
+
+    # ------------------------------------------------------------------
+    # Reads / writes
+    # ------------------------------------------------------------------
+    def get(self, field: str):
+        return getattr(self.config, field)
+
+    def set(self, **changes) -> list:
+        """Apply changes, persist if anything changed and notify; returns changed names."""
+        changed = self._apply(changes)
+        if changed:
+            self.save()
+            self._notify(changed)
+        return changed
+
+    def reset(self) -> list:
+        """Restore every field to its default value."""
+        return self.set(**asdict(Config()))
+
+    def save(self):
+        self.config.save_to_file(self.filename)
+
+    def _apply(self, changes) -> list:
+        changed = []
+        for name, value in changes.items():
+            if name not in self._field_names:
+                raise AttributeError(f"Config has no field {name!r}")
+            if getattr(self.config, name) != value:
+                setattr(self.config, name, value)
+                changed.append(name)
+        return changed
+
+    # ------------------------------------------------------------------
+    # External edits
+    # ------------------------------------------------------------------
+    def reload_from_disk(self) -> list:
+        """Apply only the fields that differ in settings.json; returns changed names.
+
+        Ignored while our own write of the file is still pending or in flight,
+        so an older snapshot landing on disk can't roll back newer changes.
+        """
+        if get_writer().is_busy(self.filename):
+            return []
+        try:
+            with open(self.filename, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+        if not isinstance(data, dict):
+            return []
+        changed = self._apply({k: v for k, v in data.items() if k in self._field_names})
+        self._notify(changed)
+        return changed
@@ -0,0 +1,172 @@
+import os
+import json
+import socket
+import logging
+import threading
+from typing import List, Optional
+
+# Stdlib only: the client side runs before PyQt5 is imported.
+
+INSTANCE_HOST = "127.0.0.1"
+INSTANCE_PORT = 47631
+# Override the port, e.g. to run a second independent copy (WORKOUT_TIMER_PORT=0 disables)
+INSTANCE_PORT_ENV = "WORKOUT_TIMER_PORT"
+APP_ID = "workout-timer/1"
+CONNECT_TIMEOUT = 0.5   # seconds; the peer is local, so a slow connect means nobody is there
+REPLY_TIMEOUT = 5.0     # a starting primary may take a moment to accept
+MAX_MESSAGE = 4096
+
+# Command-line flag -> command name; "--preset" takes a preset id or name
+COMMAND_FLAGS = {
+    "--show": "show",
+    "--start": "start",
+    "--pause": "pause",
+    "--resume": "resume",
+    "--stop": "stop",
+    "--preset": "preset",
+}
+
+
+def instance_port() -> int:
+    value = os.environ.get(INSTANCE_PORT_ENV)
+    return int(value) if value else INSTANCE_PORT
+
+
+def parse_commands(argv):
+    """Extract [(name, arg), ...] from argv, ignoring anything that is not a command flag."""
+    commands = []
+    args = iter(argv[1:])
+    for flag in args:
+        name = COMMAND_FLAGS.get(flag)
+        if name is None:
+            continue
+        if name == "preset":
+            value = next(args, "").strip()
+            if not value:
+                logging.warning("Ignoring --preset without a preset id or name")
+                continue
+            commands.append((name, int(value) if value.isdigit() else value))
+        else:
+            commands.append((name, None))
+    return commands
+
+
+def forward_commands(commands, port: Optional[int] = None) -> bool:
+    """Send commands to the running instance; True if it acknowledged them."""
+    port = instance_port() if port is None else port
+    message = json.dumps({"app": APP_ID, "commands": commands}).encode() + b"\n"
+    try:
+        with socket.create_connection((INSTANCE_HOST, port), timeout=CONNECT_TIMEOUT) as conn:
+            conn.settimeout(REPLY_TIMEOUT)
+            conn.sendall(message)
+            reply = conn.makefile("rb").readline(MAX_MESSAGE)
+    except OSError:
+        return False
+    return reply.strip() == APP_ID.encode()
+
+
+class InstanceServer:
+    """Owns the instance port and receives commands from later launches.
+
+    Binding the port is what makes this process the primary instance, so it
+    happens before the GUI stack is imported. Commands that arrive before
+    `set_handler` are queued and delivered once a handler is set; the
+    handler is called as handler(name, arg) on the listener thread.
+    """
+
+    def __init__(self, port: Optional[int] = None):
+        self.port = instance_port() if port is None else port
+        self._sock: Optional[socket.socket] = None
+        self._handler = None
+        self._queued: List[tuple] = []  # (command, argument) received before set_handler()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def bind(self) -> bool:
+        """Claim the port; False if another process already holds it."""
+        if not self.port:
+            return False
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+            # Windows would otherwise let a second process bind the same port
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        else:
+            # POSIX never shares a listening port; this only skips TIME_WAIT after a restart
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((INSTANCE_HOST, self.port))
+            sock.listen(4)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return True
+
+    def set_handler(self, handler):
+        """Install the command handler and replay anything received before it."""
+        with self._lock:
+            self._handler = handler
+            queued, self._queued = self._queued, []
+        for name, arg in queued:
+            handler(name, arg)
+
+    def close(self):
+        """Release the port; a later launch then starts as the primary instance."""
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)  # wakes the blocked accept()
+            except OSError:
+                pass
+            sock.close()
+
+    def _serve(self):
+        sock = self._sock
+        while True:
+            try:
+                conn, _addr = sock.accept()
+            except OSError:
+                return  # closed
+            with conn:
+                try:
+                    self._handle(conn)
+                except (OSError, ValueError, TypeError, AttributeError) as e:
+                    logging.warning("Ignoring bad instance message: %s", e)
+
+    def _handle(self, conn):
+        conn.settimeout(REPLY_TIMEOUT)
+        message = json.loads(conn.makefile("rb").readline(MAX_MESSAGE))
+        if message.get("app") != APP_ID:
+            return
+        for name, arg in message.get("commands", ()):
+            if name in COMMAND_FLAGS.values():
+                self._dispatch(name, arg)
+        conn.sendall(APP_ID.encode() + b"\n")
+
+    def _dispatch(self, name, arg):
+        with self._lock:
+            if self._handler is None:
+                self._queued.append((name, arg))
+                return
+            handler = self._handler
+        handler(name, arg)
+
+
+def claim_or_forward(argv):
+    """Become the primary instance, or hand argv's commands to the running one.
+
+    Returns (server, commands): `server` is the bound InstanceServer, or None
+    when no single-instance port is available. Exits the process once a
+    running instance has acknowledged the forwarded commands.
+    """
+    commands = parse_commands(argv)
+    server = InstanceServer()
+    if server.bind():
+        return server, commands
+    if server.port and forward_commands(commands or [("show", None)], server.port):
+        raise SystemExit(0)
+    if server.port:
+        logging.warning("Instance port %d is taken by another program; running standalone", server.port)
+    return None, commands
@@ -0,0 +1,169 @@
+import time
+import datetime
+from typing import Optional
+
+from .timeline import NS_PER_SEC
+
+# Bumped whenever the rollup definition changes; connect() rebuilds on upgrade
+ROLLUP_VERSION = 1
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day        TEXT NOT NULL,     -- YYYY-MM-DD (local, session start)
+    week       TEXT NOT NULL,     -- ISO week, YYYY-Www
+    month      TEXT NOT NULL,     -- YYYY-MM
+    preset     INTEGER NOT NULL,  -- preset library id, 0 for none
+    sessions   INTEGER NOT NULL,
+    completed  INTEGER NOT NULL,
+    work_ns    INTEGER NOT NULL,
+    rest_ns    INTEGER NOT NULL,
+    leadup_ns  INTEGER NOT NULL,
+    paused_ns  INTEGER NOT NULL,
+    rounds     INTEGER NOT NULL,
+    PRIMARY KEY (day, preset)
+);
+CREATE INDEX IF NOT EXISTS daily_totals_week ON daily_totals (week);
+CREATE INDEX IF NOT EXISTS daily_totals_month ON daily_totals (month);
+"""
+
+# Adds the finished sessions matched by {where} to their (day, preset) rows.
+# Only those sessions' phases are read (via the phases_session index).
+_ROLLUP_SQL = """
+INSERT INTO daily_totals (day, week, month, preset, sessions, completed, work_ns, rest_ns,
+                          leadup_ns, paused_ns, rounds)
+SELECT s.day, iso_week(s.day), substr(s.day, 1, 7), coalesce(s.preset, 0), count(*),
+       sum(s.outcome = 'completed'), coalesce(sum(p.work_ns), 0), coalesce(sum(p.rest_ns), 0),
+       coalesce(sum(p.leadup_ns), 0), sum(s.paused_ns), sum(s.rounds_done)
+FROM sessions AS s
+LEFT JOIN (
+    SELECT session_id,
+           sum(CASE WHEN state = 'Workout' THEN actual_ns ELSE 0 END) AS work_ns,
+           sum(CASE WHEN state = 'Rest' THEN actual_ns ELSE 0 END) AS rest_ns,
+           sum(CASE WHEN state = 'LeadUp' THEN actual_ns ELSE 0 END) AS leadup_ns
+    FROM phases WHERE {phase_where} GROUP BY session_id
+) AS p ON p.session_id = s.id
+WHERE {where}
+GROUP BY s.day, coalesce(s.preset, 0)
+ON CONFLICT (day, preset) DO UPDATE SET
+    sessions = sessions + excluded.sessions,
+    completed = completed + excluded.completed,
+    work_ns = work_ns + excluded.work_ns,
+    rest_ns = rest_ns + excluded.rest_ns,
+    leadup_ns = leadup_ns + excluded.leadup_ns,
+    paused_ns = paused_ns + excluded.paused_ns,
+    rounds = rounds + excluded.rounds
+"""
+
+# Incremental update for one session; queued by SessionRecorder right after
+# the session's final row update, so both land in the same transaction.
+ROLLUP_SESSION_SQL = _ROLLUP_SQL.format(phase_where="session_id = ?1", where="s.id = ?1")
+ROLLUP_INTERRUPTED_SQL = _ROLLUP_SQL.format(
+    phase_where="session_id IN (SELECT id FROM sessions WHERE outcome = 'running')",
+    where="s.outcome = 'running'")
+_ROLLUP_ALL_SQL = _ROLLUP_SQL.format(phase_where="1", where="s.outcome != 'running'")
+
+
+def rollup_sql(session_ids: str) -> str:
+    """Upsert for the finished sessions whose ids the SQL subquery `session_ids` selects."""
+    return _ROLLUP_SQL.format(phase_where=f"session_id IN ({session_ids})",
+                              where=f"s.id IN ({session_ids}) AND s.outcome != 'running'")
+
+
+def iso_week(day: str) -> str:
+    year, week, _weekday = datetime.date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02}"
+
+
+def install(conn):
+    """Create the rollup table on `conn`; rebuild it from raw history when upgrading."""
+    conn.create_function("iso_week", 1, iso_week, deterministic=True)
+    conn.executescript(ROLLUP_SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < ROLLUP_VERSION:
+        with conn:
+            rebuild(conn)
+            conn.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+
+
+def rebuild(conn):
+    """Recompute every rollup from the sessions and phases tables (one full scan)."""
+    conn.execute("DELETE FROM daily_totals")
+    conn.execute(_ROLLUP_ALL_SQL)
+
+
+####################################
+# Queries (all read daily_totals only)
+####################################
+_TOTALS = """
+SELECT {key} AS period, sum(sessions) AS sessions, sum(completed) AS completed,
+       sum(work_ns) AS work_ns, sum(rest_ns) AS rest_ns, sum(leadup_ns) AS leadup_ns,
+       sum(paused_ns) AS paused_ns, sum(rounds) AS rounds
+FROM daily_totals
+"""
+
+
+def _rows(conn, sql, params=()):
+    cursor = conn.execute(sql, params)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def totals(conn, since_day: Optional[str] = None, until_day: Optional[str] = None) -> dict:
+    """Summed totals for a day range (inclusive), plus completion_rate."""
+    sql = _TOTALS.format(key="NULL") + " WHERE day >= ? AND day <= ?"
+    row = _rows(conn, sql, (since_day or "", until_day or "9999"))[0]
+    row = {key: value or 0 for key, value in row.items() if key != "period"}
+    row["completion_rate"] = row["completed"] / row["sessions"] if row["sessions"] else 0
+    return row
+
+
+def by_period(conn, period: str = "day", limit: int = 30) -> list:
+    """Totals per day, week or month, newest first."""
+    if period not in ("day", "week", "month"):
+        raise ValueError(f"unknown period {period!r}")
+    sql = _TOTALS.format(key=period) + f" GROUP BY {period} ORDER BY {period} DESC LIMIT ?"
+    return _rows(conn, sql, (limit,))
+
+
+def by_preset(conn, since_day: Optional[str] = None) -> list:
+    """Totals per preset library id (0 = no preset) since a day."""
+    sql = _TOTALS.format(key="preset") + " WHERE day >= ? GROUP BY preset ORDER BY preset"
+    return _rows(conn, sql, (since_day or "",))
+
+
+def streaks(conn, today: Optional[datetime.date] = None) -> tuple:
+    """(current, longest) runs of consecutive days with at least one session.
+
+    The current streak still counts if today has no session yet but yesterday did.
+    """
+    today = today or datetime.date.today()
+    days = [datetime.date.fromisoformat(day) for (day,) in conn.execute(
+        "SELECT DISTINCT day FROM daily_totals WHERE sessions > 0 ORDER BY day")]
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return current, longest
+
+
+def today_and_week(conn, now: Optional[float] = None) -> tuple:
+    """(today, this ISO week) totals; both are indexed range reads of a few rows."""
+    date = datetime.date.fromtimestamp(now if now is not None else time.time())
+    monday = date - datetime.timedelta(days=date.weekday())
+    return (totals(conn, date.isoformat(), date.isoformat()),
+            totals(conn, monday.isoformat(), date.isoformat()))
+
+
+def format_duration(ns: int) -> str:
+    minutes, seconds = divmod(int(ns // NS_PER_SEC), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+
+def format_summary(label: str, row: dict) -> str:
+    """One-line summary, e.g. 'Today: 2 sessions, 12:00 work, 16 rounds'."""
+    sessions = row["sessions"]
+    return (f"{label}: {sessions} session{'s' if sessions != 1 else ''}, "
+            f"{format_duration(row['work_ns'])} work, {row['rounds']} rounds")
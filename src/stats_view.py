@@ -0,0 +1,92 @@
+# type: ignore
+import datetime
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTabWidget, QTableWidget, QTableWidgetItem,
+    QHeaderView, QDialogButtonBox,
+)
+from PyQt5.QtCore import Qt
+
+from . import stats
+
+# (heading, row -> cell text) for every table in the dialog
+_COLUMNS = (
+    ("Sessions", lambda row: str(row["sessions"])),
+    ("Completed", lambda row: f"{row['completed'] / row['sessions']:.0%}" if row["sessions"] else "-"),
+    ("Work", lambda row: stats.format_duration(row["work_ns"])),
+    ("Rest", lambda row: stats.format_duration(row["rest_ns"])),
+    ("Paused", lambda row: stats.format_duration(row["paused_ns"])),
+    ("Rounds", lambda row: str(row["rounds"])),
+)
+
+
+class StatisticsDialog(QDialog):
+    """Training statistics read from the daily rollups in history.db.
+
+    Every table is a handful of rows from `daily_totals`, so opening the
+    dialog costs the same whether the history holds a week or years.
+    """
+
+    def __init__(self, db, parent=None, preset_name=None):
+        """`preset_name(id)` labels the per-preset rows (default "Preset <id>")."""
+        super().__init__(parent)
+        self.db = db
+        self.preset_name = preset_name or (lambda preset_id: f"Preset {preset_id}")
+        self.setWindowTitle("Statistics")
+        self.resize(560, 420)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel(self)
+        self.summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary_label)
+
+        self.tabs = QTabWidget(self)
+        layout.addWidget(self.tabs)
+        self.tables = {}
+        for key, title in (("day", "Days"), ("week", "Weeks"), ("month", "Months"), ("preset", "Presets")):
+            table = QTableWidget(0, len(_COLUMNS), self)
+            table.setHorizontalHeaderLabels([heading for heading, _ in _COLUMNS])
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            table.setSelectionBehavior(QTableWidget.SelectRows)
+            self.tables[key] = table
+            self.tabs.addTab(table, title)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, self)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the summary and all tables (each one a small indexed query)."""
+        today, week = self.db.today_and_week()
+        current, longest = self.db.streaks()
+        overall = self.db.totals()
+        self.summary_label.setText("\n".join((
+            stats.format_summary("Today", today),
+            stats.format_summary("This week", week),
+            f"Streak: {current} day{'s' if current != 1 else ''} (longest {longest})"
+            f"  |  Completion rate: {overall['completion_rate']:.0%}"
+            f" of {overall['sessions']} sessions",
+        )))
+        for period, limit in (("day", 30), ("week", 26), ("month", 24)):
+            self._fill(self.tables[period], self.db.by_period(period, limit), self._period_label)
+        self._fill(self.tables["preset"], self.db.by_preset(),
+                   lambda preset: self.preset_name(preset) if preset else "No preset")
+
+    @staticmethod
+    def _period_label(period: str) -> str:
+        if len(period) == 10:
+            # Days read better with their weekday
+            return datetime.date.fromisoformat(period).strftime("%a %Y-%m-%d")
+        return period
+
+    @staticmethod
+    def _fill(table, rows, label):
+        table.setRowCount(len(rows))
+        table.setVerticalHeaderLabels([label(row["period"]) for row in rows])
+        for r, row in enumerate(rows):
+            for c, (_heading, cell) in enumerate(_COLUMNS):
+                item = QTableWidgetItem(cell(row))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(r, c, item)
@@ -0,0 +1,148 @@
+# type: ignore
+import time
+import logging
+from dataclasses import dataclass
+
+from PyQt5.QtGui import QColor
+
+# Dynamic property that selects the phase rule of a compiled theme stylesheet
+PHASE_PROPERTY = "phase"
+
+
+@dataclass(frozen=True)
+class Theme:
+    name: str
+    label: str
+    leadup: str
+    workout: str
+    rest: str
+    idle: str
+
+    def color(self, phase: str) -> str:
+        return getattr(self, phase)
+
+    def compile(self) -> str:
+        """Stylesheet with one rule per phase, selected via the `phase` property."""
+        return "\n".join(
+            f'QProgressBar[{PHASE_PROPERTY}="{phase}"]::chunk {{ background-color: {self.color(phase)}; }}'
+            for phase in ("leadup", "workout", "rest", "idle")
+        )
+
+
+THEMES = {
+    "default": Theme("default", "Default",
+                     leadup="#E29A14", workout="#16A33E", rest="#1273B5", idle="#5A5177"),
+    "high_contrast": Theme("high_contrast", "High Contrast",
+                           leadup="#FFB000", workout="#00E05A", rest="#2E9BFF", idle="#808080"),
+}
+DEFAULT_THEME = "default"
+
+
+class ThemeManager:
+    """Applies phase colours without rebuilding stylesheets on every tick.
+
+    Each theme is compiled once into a stylesheet holding a rule for every
+    phase and set on the phase-coloured widgets only. Switching phase just
+    flips the widget's `phase` property and re-polishes that one widget;
+    switching theme re-sets the cached stylesheet on those widgets, leaving
+    the rest of the widget tree alone.
+    """
+
+    def __init__(self, name: str = DEFAULT_THEME):
+        self._compiled = {}       # theme name -> stylesheet
+        self._qcolors = {}        # (theme name, phase) -> QColor
+        self._widgets = []
+        self.theme = THEMES.get(name, THEMES[DEFAULT_THEME])
+        # polish timing: number of polishes, total and worst time in seconds
+        self.polish_count = 0
+        self.polish_total = 0.0
+        self.polish_max = 0.0
+
+    def stylesheet(self, theme: Theme) -> str:
+        if theme.name not in self._compiled:
+            self._compiled[theme.name] = theme.compile()
+        return self._compiled[theme.name]
+
+    def qcolor(self, phase: str) -> QColor:
+        """Cached QColor of `phase` in the current theme."""
+        key = (self.theme.name, phase)
+        if key not in self._qcolors:
+            self._qcolors[key] = QColor(self.theme.color(phase))
+        return self._qcolors[key]
+
+    def register(self, widget, phase: str = "idle"):
+        """Style `widget` with the current theme and start tracking it."""
+        widget.setProperty(PHASE_PROPERTY, phase)
+        widget.setStyleSheet(self.stylesheet(self.theme))
+        self._widgets.append(widget)
+
+    def set_phase(self, widget, phase: str):
+        """Switch `widget` to another phase rule, re-polishing only that widget."""
+        if widget.property(PHASE_PROPERTY) == phase:
+            return
+        start = time.perf_counter()
+        widget.setProperty(PHASE_PROPERTY, phase)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+        self._record_polish(time.perf_counter() - start)
+
+    def set_theme(self, name: str) -> bool:
+        """Hot-swap the theme on all registered widgets; returns False if unknown."""
+        theme = THEMES.get(name)
+        if theme is None:
+            return False
+        logging.debug(f"Theme {self.theme.name} -> {name}: {self.polish_report()}")
+        self.theme = theme
+        stylesheet = self.stylesheet(theme)
+        for widget in self._widgets:
+            widget.setStyleSheet(stylesheet)
+        return True
+
+    def _record_polish(self, seconds: float):
+        self.polish_count += 1
+        self.polish_total += seconds
+        self.polish_max = max(self.polish_max, seconds)
+
+    def polish_report(self) -> str:
+        if not self.polish_count:
+            return "no phase re-polishes"
+        mean_us = self.polish_total / self.polish_count * 1e6
+        return (f"{self.polish_count} phase re-polishes, "
+                f"mean {mean_us:.0f} us, max {self.polish_max * 1e6:.0f} us")
+
+
+def benchmark_polish(repeat: int = 500):
+    """Compare per-change setStyleSheet (old) against property + polish (new)."""
+    import sys
+    from PyQt5.QtWidgets import QApplication, QProgressBar
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    phases = ("leadup", "workout", "rest", "idle")
+
+    old_bar = QProgressBar()
+    start = time.perf_counter()
+    for i in range(repeat):
+        color = THEMES[DEFAULT_THEME].color(phases[i % 4])
+        old_bar.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; }}")
+        app.processEvents()
+    old = (time.perf_counter() - start) / repeat
+
+    manager = ThemeManager()
+    new_bar = QProgressBar()
+    manager.register(new_bar)
+    start = time.perf_counter()
+    for i in range(repeat):
+        manager.set_phase(new_bar, phases[i % 4])
+        app.processEvents()
+    new = (time.perf_counter() - start) / repeat
+
+    logging.info(f"Phase restyle: setStyleSheet {old * 1e6:.0f} us, property+polish {new * 1e6:.0f} us")
+    return old, new
+
+
+if __name__ == "__main__":
+    old, new = benchmark_polish()
+    print(f"setStyleSheet per change: {old * 1e6:8.1f} us")
+    print(f"property + polish:        {new * 1e6:8.1f} us")
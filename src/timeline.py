@@ -0,0 +1,163 @@
+from array import array
+from bisect import bisect_right
+
+from .timer_state import TimerState
+
+NS_PER_SEC = 1_000_000_000
+
+# Running states a segment can have, stored as their enum values in a byte array
+SEGMENT_STATES = (TimerState.LeadUp, TimerState.Workout, TimerState.Rest)
+_STATE_BY_VALUE = {state.value: state for state in SEGMENT_STATES}
+
+
+class Timeline:
+    """A whole interval program compiled into flat arrays.
+
+    Segment i runs from `start_ns(i)` to `end_ns(i)`, measured from the start
+    of the session. Ends are cumulative, so mapping elapsed time to a segment
+    is a bisect over `_ends` whatever the program length, and jumping to any
+    segment is just reading its start offset. Durations are whole seconds;
+    zero-length segments are dropped when compiling.
+    """
+
+    __slots__ = ("name", "rounds", "_ends", "_durations", "_states", "_rounds")
+
+    def __init__(self, segments, name="custom"):
+        """`segments` is an iterable of (state, round_index, duration_seconds).
+
+        Round indices must never decrease; a round may hold any number of segments.
+        """
+        self.name = name
+        self._ends = array("q")
+        self._durations = array("q")
+        self._states = array("b")
+        self._rounds = array("l")
+        end = 0
+        for state, round_index, seconds in segments:
+            if state not in SEGMENT_STATES:
+                raise ValueError(f"segment state must be one of {SEGMENT_STATES}, not {state}")
+            if self._rounds and round_index < self._rounds[-1]:
+                raise ValueError("segment round indices must not decrease")
+            if seconds <= 0:
+                continue
+            end += seconds * NS_PER_SEC
+            self._ends.append(end)
+            self._durations.append(seconds)
+            self._states.append(state.value)
+            self._rounds.append(round_index)
+        self.rounds = self._rounds[-1] + 1 if self._rounds else 0
+
+    def __len__(self):
+        return len(self._ends)
+
+    @property
+    def total_ns(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def locate(self, elapsed_ns: int) -> int:
+        """Index of the segment running at `elapsed_ns`; len(self) once the program is over."""
+        return bisect_right(self._ends, elapsed_ns)
+
+    def start_ns(self, index: int) -> int:
+        return self._ends[index - 1] if index > 0 else 0
+
+    def end_ns(self, index: int) -> int:
+        return self._ends[index]
+
+    def duration(self, index: int) -> int:
+        """Segment length in whole seconds."""
+        return self._durations[index]
+
+    def state(self, index: int) -> TimerState:
+        return _STATE_BY_VALUE[self._states[index]]
+
+    def round_index(self, index: int) -> int:
+        return self._rounds[index]
+
+    def find(self, round_index: int, state: TimerState = TimerState.Workout):
+        """First segment of `round_index` with `state`, or None."""
+        for index in range(bisect_right(self._rounds, round_index - 1), len(self)):
+            if self._rounds[index] != round_index:
+                break
+            if self._states[index] == state.value:
+                return index
+        return None
+
+
+####################################
+# Program builders
+####################################
+def standard(workout, rest, lead_up, rounds):
+    """The classic program: lead-up, then `rounds` x (workout, rest)."""
+    def segments():
+        yield TimerState.LeadUp, 0, lead_up
+        for round_index in range(rounds):
+            yield TimerState.Workout, round_index, workout
+            yield TimerState.Rest, round_index, rest
+    return Timeline(segments(), "standard")
+
+
+def pyramid(steps, rest, lead_up=0):
+    """Workouts climb through `steps` seconds and back down, with `rest` between each."""
+    steps = list(steps)
+    durations = steps + steps[-2::-1]
+    def segments():
+        yield TimerState.LeadUp, 0, lead_up
+        for round_index, workout in enumerate(durations):
+            yield TimerState.Workout, round_index, workout
+            yield TimerState.Rest, round_index, rest
+    return Timeline(segments(), "pyramid")
+
+
+def tabata(blocks=1, rounds=8, workout=20, rest=10, block_rest=60, lead_up=0):
+    """`blocks` Tabata blocks of `rounds` x (workout, rest), with a longer rest between blocks."""
+    def segments():
+        yield TimerState.LeadUp, 0, lead_up
+        round_index = 0
+        for block in range(blocks):
+            for i in range(rounds):
+                last_in_block = i == rounds - 1 and block < blocks - 1
+                yield TimerState.Workout, round_index, workout
+                yield TimerState.Rest, round_index, block_rest if last_in_block else rest
+                round_index += 1
+    return Timeline(segments(), "tabata")
+
+
+def emom(minutes, start=10, step=5, interval=60, lead_up=0):
+    """Every-minute-on-the-minute ladder: work `start + i*step` s, rest out the minute.
+
+    Work time is capped at the interval, so late rungs become all work.
+    """
+    def segments():
+        yield TimerState.LeadUp, 0, lead_up
+        for round_index in range(minutes):
+            workout = min(interval, start + round_index * step)
+            yield TimerState.Workout, round_index, workout
+            yield TimerState.Rest, round_index, interval - workout
+    return Timeline(segments(), "emom")
+
+
+def build_program(name, workout, rest, lead_up, rounds):
+    """Compile program `name` from the main window's settings (unknown names -> standard).
+
+    The settings are reinterpreted per program: `workout` is the peak of a
+    pyramid and `rounds` its number of steps up, `rounds` is the number of
+    eight-round Tabata blocks, and the number of EMOM minutes.
+    """
+    if name == "pyramid":
+        step = max(1, workout // max(1, rounds))
+        return pyramid(range(step, workout + 1, step)[-rounds:] or [workout], rest, lead_up)
+    if name == "tabata":
+        return tabata(blocks=rounds, lead_up=lead_up)
+    if name == "emom":
+        return emom(rounds, lead_up=lead_up)
+    return standard(workout, rest, lead_up, rounds)
+
+
+# Program name -> menu label (used for Config.program)
+PROGRAMS = {
+    "standard": "Standard (sliders)",
+    "pyramid": "Pyramid (up to Workout, Rounds steps)",
+    "tabata": "Tabata (Rounds blocks of 8 x 20/10)",
+    "emom": "EMOM ladder (Rounds minutes)",
+}
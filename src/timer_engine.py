@@ -0,0 +1,349 @@
+from enum import Enum
+
+from .timer_state import TimerState
+from .timeline import NS_PER_SEC, build_program
+from .clock import now_ns
+
+# Running phase -> paused counterpart (and back again)
+PAUSED_STATES = {
+    TimerState.LeadUp: TimerState.PausedLeadUp,
+    TimerState.Workout: TimerState.PausedWorkout,
+    TimerState.Rest: TimerState.PausedRest,
+}
+RESUMED_STATES = {paused: running for running, paused in PAUSED_STATES.items()}
+
+# A tick this late after a deadline counts as a stall in CatchUpStats
+STALL_NS = NS_PER_SEC
+# Stalls shorter than this replay every skipped boundary's cue; longer ones
+# (suspend, a hung event loop) announce only the most recent boundary
+COALESCE_AFTER_NS = 5 * NS_PER_SEC
+
+
+class TimerEvent(Enum):
+    Phase = 0     # state changed by a control (start, pause, resume, stop, seek, reconfigure)
+    Boundary = 1  # a phase ran out and the next one started
+    Tick = 2      # remaining_time changed within the current phase
+    Complete = 3  # all rounds finished
+
+
+class CatchUpStats:
+    """How far behind the deadlines ticks arrived and what was skipped to catch up."""
+    __slots__ = ("stalls", "total_ns", "worst_ns", "boundaries_crossed", "cues_coalesced")
+
+    def __init__(self):
+        self.stalls = 0              # ticks at least STALL_NS late
+        self.total_ns = 0            # summed lateness of those ticks
+        self.worst_ns = 0
+        self.boundaries_crossed = 0  # boundaries resolved by a late tick after the first
+        self.cues_coalesced = 0      # boundaries passed without their own event
+
+    def add(self, late_ns, boundaries, coalesced):
+        self.stalls += 1
+        self.total_ns += late_ns
+        self.worst_ns = max(self.worst_ns, late_ns)
+        self.boundaries_crossed += boundaries - 1
+        self.cues_coalesced += coalesced
+
+    def __str__(self):
+        return (f"stalls={self.stalls} caught_up={self.total_ns / NS_PER_SEC:.2f}s "
+                f"worst={self.worst_ns / NS_PER_SEC:.2f}s extra_boundaries={self.boundaries_crossed} "
+                f"coalesced_cues={self.cues_coalesced}")
+
+
+class TimerEngine:
+    """Qt-free interval timer that plays a compiled Timeline (by default: lead-up,
+    then `rounds` x (workout, rest)) and returns to Idle at the end.
+
+    The engine never schedules itself; the owner calls `tick()` (ideally at
+    `next_wakeup()`) and listens for events via `subscribe(callback)`, where
+    callback(event, engine) is invoked synchronously from whichever method
+    caused the change. Durations are whole seconds; all clock arithmetic is
+    done in integer nanoseconds so long sessions never accumulate float error.
+
+    Position is always derived from the session start: elapsed time maps to a
+    segment with one bisect, pausing is a single offset adjustment and
+    `seek()` can jump to any segment instantly. Each segment starts exactly
+    at the previous deadline, so a late tick (event-loop stall, suspend with
+    the default suspend-aware clock) never shifts the rest of the session;
+    the skipped boundaries are replayed or coalesced (see `tick`) and the
+    lateness is recorded in `catch_up`.
+    """
+
+    __slots__ = (
+        "workout_duration", "rest_duration", "lead_up_duration", "rounds", "program",
+        "timeline", "state", "previous_state", "current_round", "remaining_time",
+        "last_boundary", "_index", "_session_start", "_paused_elapsed", "_deadline",
+        "_clock", "_subscribers", "catch_up",
+    )
+
+    def __init__(self, workout_duration=60, rest_duration=45, lead_up_duration=5,
+                 rounds=10, clock=now_ns, program="standard"):
+        self.workout_duration = workout_duration
+        self.rest_duration = rest_duration
+        self.lead_up_duration = lead_up_duration
+        self.rounds = rounds
+        self.program = program
+        self.timeline = self._compile()
+        self.state = TimerState.Idle
+        self.previous_state = TimerState.Idle
+        self.current_round = 0
+        self.remaining_time = 0
+        self.last_boundary = None    # deadline (ns) of the most recent phase boundary
+        self._index = None           # current timeline segment; None when Idle
+        self._session_start = None   # clock value (ns) at timeline offset 0; None unless running
+        self._paused_elapsed = 0     # timeline offset (ns) captured on pause
+        self._deadline = None        # clock value (ns) at which the current segment ends
+        self._clock = clock
+        self._subscribers = []
+        self.catch_up = CatchUpStats()
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self, callback):
+        """Register callback(event, engine); returns the callback for convenience."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _emit(self, event):
+        for callback in tuple(self._subscribers):
+            callback(event, self)
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def configure(self, workout_duration, rest_duration, lead_up_duration, rounds, program=None):
+        """Update durations (and program) and recompile the timeline.
+
+        A running or paused session stays in the same segment, the same
+        distance into it; only that segment's deadline moves. Subscribers
+        get a Phase event so they can pick up the new timeline.
+        """
+        self.workout_duration = workout_duration
+        self.rest_duration = rest_duration
+        self.lead_up_duration = lead_up_duration
+        self.rounds = rounds
+        if program is not None:
+            self.program = program
+        self.set_timeline(self._compile())
+
+    def set_timeline(self, timeline):
+        """Play `timeline` from now on (e.g. a hand-built program); see configure()."""
+        old, self.timeline = self.timeline, timeline
+        if self._index is None:
+            return
+        offset = self.elapsed_ns() - old.start_ns(self._index)
+        index = min(self._index, len(timeline) - 1)
+        if index < 0:
+            self.stop()
+            return
+        self._move_to(index, timeline.start_ns(index) + offset)
+        self._emit(TimerEvent.Phase)
+
+    def _compile(self):
+        return build_program(self.program, self.workout_duration, self.rest_duration,
+                             self.lead_up_duration, self.rounds)
+
+    @property
+    def total_rounds(self):
+        return self.timeline.rounds
+
+    @property
+    def phase_duration(self):
+        """Planned length in seconds of the current (or paused) phase; 0 when Idle."""
+        if self._index is None:
+            return 0
+        return self.timeline.duration(self._index)
+
+    @property
+    def segment_index(self):
+        return self._index
+
+    @property
+    def is_running(self):
+        return self.state in PAUSED_STATES
+
+    @property
+    def is_paused(self):
+        return self.state in RESUMED_STATES
+
+    def elapsed_ns(self):
+        """Timeline offset (ns) of the session right now (frozen while paused)."""
+        if self._session_start is None:
+            return self._paused_elapsed
+        return self._clock() - self._session_start
+
+    def progress(self):
+        """Fraction of the current phase that has elapsed (0..1), read from the clock.
+
+        Unlike `remaining_time` this is not rounded to whole seconds, so it
+        can drive a smooth animation between ticks.
+        """
+        if self._index is None:
+            return 0
+        duration = self.phase_duration * NS_PER_SEC
+        if not duration:
+            return 1
+        within = self.elapsed_ns() - self.timeline.start_ns(self._index)
+        return min(1, max(0, within / duration))
+
+    # ------------------------------------------------------------------
+    # Controls
+    # ------------------------------------------------------------------
+    def start(self):
+        """Start a new session from the beginning of the timeline."""
+        if not len(self.timeline):
+            return
+        self._session_start = self._clock()
+        self._paused_elapsed = 0
+        self._enter(0)
+        self._emit(TimerEvent.Phase)
+
+    def pause(self):
+        """Freeze the session, remembering how far into the timeline it was."""
+        if self._session_start is None:
+            return
+        # Bring remaining_time up to date first (ticks may be sparse while hidden)
+        self.tick()
+        if self._session_start is None:
+            return  # that tick finished the session
+        self._paused_elapsed = self._clock() - self._session_start
+        self._set_state(PAUSED_STATES.get(self.state, self.state))
+        self._session_start = None
+        self._deadline = None
+        self._emit(TimerEvent.Phase)
+
+    def resume(self):
+        """Continue a paused session from where it stopped."""
+        if not self.is_paused:
+            return
+        self._set_state(RESUMED_STATES[self.state])
+        self._session_start = self._clock() - self._paused_elapsed
+        self._deadline = self._session_start + self.timeline.end_ns(self._index)
+        self._paused_elapsed = 0
+        self._emit(TimerEvent.Phase)
+
+    def stop(self):
+        """Abort the session and return to Idle."""
+        self._finish()
+        self._emit(TimerEvent.Phase)
+
+    def seek(self, index):
+        """Jump to the start of segment `index` (running or paused); past the end finishes."""
+        if self._index is None:
+            return
+        if index >= len(self.timeline):
+            self._finish()
+            self._emit(TimerEvent.Complete)
+            return
+        index = max(0, index)
+        self._move_to(index, self.timeline.start_ns(index))
+        self._emit(TimerEvent.Phase)
+
+    def skip(self):
+        """Jump to the next segment."""
+        if self._index is not None:
+            self.seek(self._index + 1)
+
+    # ------------------------------------------------------------------
+    # Main step
+    # ------------------------------------------------------------------
+    def tick(self):
+        """Advance the timer to the current clock value and emit any events."""
+        if self._session_start is None:
+            return
+        now = self._clock()
+        if now < self._deadline:
+            segment_start = self._deadline - self.phase_duration * NS_PER_SEC
+            remaining = self.phase_duration - (now - segment_start) // NS_PER_SEC
+            if remaining != self.remaining_time:
+                self.remaining_time = remaining
+                self._emit(TimerEvent.Tick)
+            return
+
+        # One or more boundaries passed: resolve the true position in one step
+        index = self.timeline.locate(now - self._session_start)
+        first = self._index  # the first boundary crossed ends this segment
+        complete = index >= len(self.timeline)
+        late = now - self._deadline
+        replay = late < COALESCE_AFTER_NS
+        # Boundaries that lead into another segment end segments first..last_cue
+        last_cue = min(index, len(self.timeline) - 1) - 1
+        announced = range(first, last_cue + 1) if replay else range(last_cue, last_cue + 1)
+        if complete and not replay:
+            announced = range(0)  # after a long stall only the completion is announced
+        if late >= STALL_NS or index - first > 1:
+            self.catch_up.add(late, index - first, max(0, last_cue + 1 - first) - len(announced))
+        for ended in announced:
+            self._cross(ended, now)
+        if complete:
+            self.last_boundary = self._session_start + self.timeline.total_ns
+            self._finish()
+            self._emit(TimerEvent.Complete)
+
+    def next_wakeup(self, boundaries_only=False):
+        """Clock value (ns) of the next visible change, or None when nothing is pending.
+
+        That is the next whole-second flip of `remaining_time` or the phase
+        deadline, whichever comes first; Idle and paused timers need no wakeups.
+        With `boundaries_only` (nothing on screen) only the deadline counts.
+        """
+        if self._session_start is None:
+            return None
+        if boundaries_only:
+            return self._deadline
+        segment_start = self._deadline - self.phase_duration * NS_PER_SEC
+        elapsed = self._clock() - segment_start
+        next_second = segment_start + (elapsed // NS_PER_SEC + 1) * NS_PER_SEC
+        return min(next_second, self._deadline)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _set_state(self, state):
+        self.previous_state = self.state
+        self.state = state
+
+    def _enter(self, index):
+        """Make segment `index` current (the session must be running)."""
+        self._index = index
+        self._set_state(self.timeline.state(index))
+        self.current_round = self.timeline.round_index(index)
+        self.remaining_time = self.timeline.duration(index)
+        self._deadline = self._session_start + self.timeline.end_ns(index)
+
+    def _cross(self, ended, now):
+        """Enter the segment after `ended` and emit its Boundary event."""
+        self._enter(ended + 1)
+        self.last_boundary = self._session_start + self.timeline.end_ns(ended)
+        # A late tick lands part-way into the segment; count from its real start
+        self.remaining_time = max(0, self.remaining_time - (now - self.last_boundary) // NS_PER_SEC)
+        # The cue belongs to the boundary just crossed: it ends segment `ended`
+        self.previous_state = self.timeline.state(ended)
+        self._emit(TimerEvent.Boundary)
+
+    def _move_to(self, index, offset):
+        """Place the session `offset` ns into the timeline, inside segment `index`."""
+        paused = self._session_start is None
+        self._session_start = self._clock() - offset
+        self._enter(index)
+        within = offset - self.timeline.start_ns(index)
+        self.remaining_time = max(0, self.phase_duration - within // NS_PER_SEC)
+        if paused:
+            self._paused_elapsed = offset
+            self._session_start = None
+            self._deadline = None
+            self.state = PAUSED_STATES[self.state]
+
+    def _finish(self):
+        self._set_state(TimerState.Idle)
+        self._index = None
+        self._session_start = None
+        self._deadline = None
+        self._paused_elapsed = 0
+        self.remaining_time = 0
+        self.current_round = 0
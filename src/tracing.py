@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import threading
+from typing import List
+
+# Set to 1 (or pass --trace) to record startup spans
+TRACE_ENV = "WORKOUT_TIMER_TRACE"
+TRACE_FILE = "startup_trace.json"
+
+
+class _NullSpan:
+    """Shared no-op context manager returned while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def end(self):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "depth")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        local = self.tracer._local
+        self.depth = getattr(local, "depth", 0)
+        local.depth = self.depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._local.depth = self.depth
+        self.tracer._record(self.name, self.start, end - self.start, self.depth, self.args)
+        return False
+
+    def end(self):
+        """Close a span opened with Tracer.begin()."""
+        self.__exit__(None, None, None)
+
+
+class Tracer:
+    """Nested timing spans exportable as Chrome trace-event JSON and a summary table.
+
+    While disabled, `span()` returns a shared no-op context manager, so
+    instrumented code pays one attribute check and a call per span.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.origin = time.perf_counter_ns()
+        self.events: List[tuple] = []  # (name, start ns, duration ns, depth, thread id, thread name, args)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def begin(self, name: str, **args):
+        """Open a span that is closed later with `.end()` (for spans that don't fit a with-block)."""
+        span = self.span(name, **args)
+        span.__enter__()
+        return span
+
+    def mark(self, name: str, **args):
+        """Record an instant event (zero-length span)."""
+        if self.enabled:
+            self._record(name, time.perf_counter_ns(), 0, getattr(self._local, "depth", 0), args)
+
+    def _record(self, name, start, duration, depth, args):
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append((name, start, duration, depth, thread.ident, thread.name, args))
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def chrome_trace(self) -> dict:
+        """Trace-event JSON as understood by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        trace_events, threads = [], {}
+        for name, start, duration, _depth, tid, thread_name, args in self.events:
+            threads[tid] = thread_name
+            event = {"name": name, "pid": pid, "tid": tid,
+                     "ts": (start - self.origin) / 1000, "args": args}
+            if duration:
+                event.update(ph="X", dur=duration / 1000)
+            else:
+                event.update(ph="i", s="t")
+            trace_events.append(event)
+        for tid, thread_name in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                                 "args": {"name": thread_name}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str = TRACE_FILE):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary_table(self) -> str:
+        """Spans in start order, indented by nesting, with start offset and duration."""
+        lines = [f"{'start ms':>10} {'dur ms':>9}  span"]
+        for name, start, duration, depth, _tid, thread_name, _args in sorted(
+                self.events, key=lambda e: e[1]):
+            where = "" if thread_name == "MainThread" else f"  [{thread_name}]"
+            lines.append(f"{(start - self.origin) / 1e6:10.1f} {duration / 1e6:9.1f}  "
+                         f"{'  ' * depth}{name}{where}")
+        return "\n".join(lines)
+
+
+tracer = Tracer(enabled=os.environ.get(TRACE_ENV, "") not in ("", "0"))
@@ -0,0 +1,412 @@
+"""Streaming export and import of workout history and presets.
+
+    python -m src.transfer export backup.jsonl.gz [--since 2025-01-01]
+    python -m src.transfer import backup.jsonl.gz
+    python -m src.transfer rebuild-stats
+
+JSON Lines files hold one record per line, tagged with its "kind"
+(session, phase or preset). CSV exports are one file per kind next to
+the given path (backup.csv -> backup.sessions.csv, backup.phases.csv,
+backup.presets.csv). A ".gz" suffix compresses either format and "-"
+means stdout/stdin for JSON Lines.
+
+Records flow through generators from a database cursor to the file and
+from the file to executemany() batches, so memory stays flat however
+long the history is. Session ids are their start time in nanoseconds,
+so re-importing a backup skips the sessions (and phases) already present.
+"""
+import os
+import csv
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .history import HISTORY_FILE, connect
+from . import stats
+
+# Rows per fetchmany() on export and per transaction on import
+BATCH_ROWS = 5000
+
+# kind -> ((column, type), ...) in file order; missing or empty values are NULL
+COLUMNS = {
+    "session": (
+        ("id", int), ("started_at", float), ("ended_at", float), ("day", str),
+        ("program", str), ("preset", int), ("planned_ns", int), ("active_ns", int),
+        ("paused_ns", int), ("rounds_planned", int), ("rounds_done", int), ("outcome", str),
+    ),
+    "phase": (
+        ("session_id", int), ("seq", int), ("state", str), ("round", int),
+        ("started_at", float), ("planned_ns", int), ("actual_ns", int),
+        ("paused_ns", int), ("completed", int),
+    ),
+    "preset": (
+        ("id", int), ("name", str), ("tags", str), ("workout_duration", int),
+        ("rest_duration", int), ("lead_up_duration", int), ("rounds", int),
+    ),
+}
+KINDS = tuple(COLUMNS)
+_NAMES = {kind: tuple(name for name, _type in columns) for kind, columns in COLUMNS.items()}
+
+
+@dataclass
+class TransferStats:
+    """Counters for one export or import, reported as it goes and at the end."""
+    rows: dict = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    skipped: int = 0  # import: records already present (or orphaned phases)
+    bytes: int = 0    # size of the files written or read
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        counts = ", ".join(f"{count} {kind}{'s' if count != 1 else ''}"
+                           for kind, count in self.rows.items() if count)
+        text = f"{self.total} records ({counts or 'none'}) in {self.seconds:.2f} s"
+        text += f", {self.rows_per_second:,.0f} records/s"
+        if self.bytes:
+            text += f", {self.bytes / 1e6:.1f} MB"
+        if self.skipped:
+            text += f", {self.skipped} already present"
+        return text
+
+
+####################################
+# Files
+####################################
+def _open(path: str, mode: str):
+    """Text stream for `path`; ".gz" is (de)compressed and "-" is stdin/stdout."""
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _is_csv(path: str) -> bool:
+    return path.removesuffix(".gz").endswith(".csv")
+
+
+def csv_paths(path: str) -> dict:
+    """kind -> file for a CSV export named `path` (any of its per-kind files works too)."""
+    gz = ".gz" if path.endswith(".gz") else ""
+    base = path.removesuffix(".gz").removesuffix(".csv")
+    for kind in KINDS:
+        base = base.removesuffix(f".{kind}s")
+    return {kind: f"{base}.{kind}s.csv{gz}" for kind in KINDS}
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+####################################
+# Export
+####################################
+def _iter_query(conn, sql, params=()):
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(BATCH_ROWS)
+        if not rows:
+            return
+        yield from rows
+
+
+def iter_records(conn, presets=(), since_day: Optional[str] = None):
+    """Yield (kind, row) for every session, then every phase, then every preset.
+
+    Sessions come before their phases, which is the order imports need.
+    `presets` are preset_library.Preset rows (tags are space-separated).
+    """
+    since = (since_day or "",)
+    columns = ", ".join(_NAMES["session"])
+    for row in _iter_query(conn, f"SELECT {columns} FROM sessions WHERE day >= ? ORDER BY id", since):
+        yield "session", row
+    columns = ", ".join(f"p.{name}" for name in _NAMES["phase"])
+    for row in _iter_query(conn, f"""
+            SELECT {columns} FROM phases AS p JOIN sessions AS s ON s.id = p.session_id
+            WHERE s.day >= ? ORDER BY p.session_id, p.seq""", since):
+        yield "phase", row
+    for preset in presets or ():
+        yield "preset", (preset.id, preset.name, " ".join(preset.tags), *preset.values.values())
+
+
+def _counted(records, result: TransferStats, started: float, progress):
+    """Pass records through, counting them and reporting every BATCH_ROWS."""
+    for kind, row in records:
+        result.rows[kind] += 1
+        if progress is not None and result.total % BATCH_ROWS == 0:
+            result.seconds = time.perf_counter() - started
+            progress(result)
+        yield kind, row
+
+
+def write_jsonl(records, stream) -> None:
+    for kind, row in records:
+        stream.write(json.dumps({"kind": kind, **dict(zip(_NAMES[kind], row))},
+                                separators=(",", ":")))
+        stream.write("\n")
+
+
+def write_csv(records, paths: dict) -> None:
+    """Write each kind to its own file; a file is only created once it has a row."""
+    files: dict = {}    # kind -> open file
+    writers: dict = {}  # kind -> csv writer
+    try:
+        for kind, row in records:
+            writer = writers.get(kind)
+            if writer is None:
+                files[kind] = _open(paths[kind], "w")
+                writer = writers[kind] = csv.writer(files[kind])
+                writer.writerow(_NAMES[kind])
+            writer.writerow(row)
+    finally:
+        for stream in files.values():
+            stream.close()
+
+
+def export(path: str, db: str = HISTORY_FILE, presets=(), since_day: Optional[str] = None,
+           progress=None) -> TransferStats:
+    """Stream the history (and `presets`) to `path`, JSON Lines or CSV by extension."""
+    result = TransferStats()
+    started = time.perf_counter()
+    conn = connect(db)
+    try:
+        records = _counted(iter_records(conn, presets, since_day), result, started, progress)
+        if _is_csv(path):
+            paths = csv_paths(path)
+            write_csv(records, paths)
+            result.bytes = sum(_size(paths[kind]) for kind in KINDS if result.rows[kind])
+        else:
+            stream = _open(path, "w")
+            try:
+                write_jsonl(records, stream)
+            finally:
+                if stream is not sys.stdout:
+                    stream.close()
+            result.bytes = _size(path)
+    finally:
+        conn.close()
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+####################################
+# Import
+####################################
+def _coerce(kind: str, values: dict, where: str) -> tuple:
+    row = []
+    for name, cast in COLUMNS[kind]:
+        value = values.get(name)
+        try:
+            row.append(None if value is None or value == "" else cast(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: bad {kind} {name} {value!r}") from None
+    return tuple(row)
+
+
+def read_jsonl(stream, name: str = "<stdin>"):
+    """Yield (kind, row) from a JSON Lines stream, one line at a time."""
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        where = f"{name}:{line_no}"
+        try:
+            values = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{where}: {e}") from None
+        kind = values.get("kind") if isinstance(values, dict) else None
+        if kind not in COLUMNS:
+            raise ValueError(f"{where}: unknown record kind {kind!r}")
+        yield kind, _coerce(kind, values, where)
+
+
+def read_csv(paths: dict):
+    """Yield (kind, row) from each per-kind CSV file that exists, sessions first."""
+    for kind in KINDS:
+        path = paths[kind]
+        if not os.path.exists(path):
+            continue
+        with _open(path, "r") as stream:
+            for line_no, values in enumerate(csv.DictReader(stream), 2):
+                yield kind, _coerce(kind, values, f"{path}:{line_no}")
+
+
+# Sessions are marked in temp.imported only if new, so phases of sessions
+# that were already in the database are skipped along with them.
+_MARK_SQL = "INSERT INTO temp.imported (id) SELECT ?1 WHERE NOT EXISTS (SELECT 1 FROM sessions WHERE id = ?1)"
+_SESSION_SQL = "INSERT OR IGNORE INTO sessions ({}) VALUES ({})".format(
+    ", ".join(_NAMES["session"]), ", ".join("?" * len(_NAMES["session"])))
+_PHASE_SQL = "INSERT INTO phases ({}) SELECT {} WHERE EXISTS (SELECT 1 FROM temp.imported WHERE id = ?1)".format(
+    ", ".join(_NAMES["phase"]), ", ".join(f"?{i}" for i in range(1, len(_NAMES["phase"]) + 1)))
+
+
+def _write_batch(conn, batch, result: TransferStats):
+    """Insert one batch in a single transaction, consecutive rows of a kind per executemany."""
+    with conn:
+        for kind, group in itertools.groupby(batch, key=lambda record: record[0]):
+            rows = [row for _kind, row in group]
+            before = conn.total_changes
+            if kind == "session":
+                conn.executemany(_MARK_SQL, ((row[0],) for row in rows))
+                before = conn.total_changes
+                conn.executemany(_SESSION_SQL, rows)
+            else:
+                conn.executemany(_PHASE_SQL, rows)
+            result.skipped += len(rows) - (conn.total_changes - before)
+
+
+# Points the new sessions at the ids their presets got in this library
+_REMAP_SQL = """
+    UPDATE sessions SET preset = (SELECT new FROM temp.preset_ids WHERE old = sessions.preset)
+    WHERE id IN (SELECT id FROM temp.imported) AND preset IN (SELECT old FROM temp.preset_ids)
+"""
+
+
+def _remap_presets(conn, ids: dict):
+    """Rewrite `sessions.preset` of the imported sessions from exported to local preset ids."""
+    moved = [(old, new) for old, new in ids.items() if old != new]
+    if not moved:
+        return
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS preset_ids (old INTEGER PRIMARY KEY, new INTEGER)")
+        conn.execute("DELETE FROM temp.preset_ids")
+        conn.executemany("INSERT INTO temp.preset_ids (old, new) VALUES (?, ?)", moved)
+        # One statement, so chains like 2 -> 3, 3 -> 4 are not applied twice
+        conn.execute(_REMAP_SQL)
+
+
+def import_records(records, conn, progress=None, result: Optional[TransferStats] = None,
+                   merge_presets=None):
+    """Insert (kind, row) records into the history on `conn`; returns the stats.
+
+    Rows are committed BATCH_ROWS at a time. `merge_presets(preset dicts)`
+    (PresetLibrary.merge) saves the file's presets and returns {exported id:
+    local id}; the new sessions are re-pointed at the local ids before the
+    daily rollups are updated for them. Without it presets are not imported
+    and sessions keep the exporter's preset ids.
+    """
+    result = result or TransferStats()
+    started = time.perf_counter()
+    presets = []
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS imported (id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.imported")
+    try:
+        batch = []
+        for kind, row in _counted(records, result, started, progress):
+            if kind == "preset":
+                presets.append(dict(zip(_NAMES["preset"], row)))
+            else:
+                batch.append((kind, row))
+                if len(batch) >= BATCH_ROWS:
+                    _write_batch(conn, batch, result)
+                    batch = []
+        _write_batch(conn, batch, result)
+        # Presets come last in an export, so sessions are fixed up afterwards
+        if presets and merge_presets is not None:
+            _remap_presets(conn, merge_presets(presets))
+    finally:
+        # Roll up whatever was committed, even if the file turned out to be bad
+        with conn:
+            conn.execute(stats.rollup_sql("SELECT id FROM temp.imported"))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def import_file(path: str, db: str = HISTORY_FILE, progress=None, merge_presets=None):
+    """Import a JSON Lines or CSV export into `db`; returns the stats (see import_records)."""
+    result = TransferStats()
+    conn = connect(db)
+    try:
+        if _is_csv(path):
+            paths = csv_paths(path)
+            result.bytes = sum(_size(p) for p in paths.values())
+            return import_records(read_csv(paths), conn, progress, result, merge_presets)
+        stream = _open(path, "r")
+        result.bytes = _size(path)
+        try:
+            return import_records(read_jsonl(stream, path), conn, progress, result, merge_presets)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    finally:
+        conn.close()
+
+
+def rebuild_stats(db: str = HISTORY_FILE) -> None:
+    """Recompute the daily rollups from scratch (e.g. after an interrupted import)."""
+    conn = connect(db)
+    try:
+        with conn:
+            stats.rebuild(conn)
+    finally:
+        conn.close()
+
+
+####################################
+# Command line
+####################################
+def main(argv=None) -> int:
+    from .config import SETTINGS_FILE
+    from .preset_library import PRESETS_FILE
+
+    parser = argparse.ArgumentParser(prog="python -m src.transfer", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=HISTORY_FILE, help="history database (default: %(default)s)")
+    parser.add_argument("--presets-db", default=PRESETS_FILE, help="preset library (default: %(default)s)")
+    parser.add_argument("--settings", default=SETTINGS_FILE,
+                        help="settings file whose legacy preset slots are moved into the library first")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="write history and presets to a file")
+    export_parser.add_argument("path", help="*.jsonl or *.csv, optionally .gz; - for stdout")
+    export_parser.add_argument("--since", metavar="YYYY-MM-DD", help="only sessions from this day on")
+    export_parser.add_argument("--no-presets", action="store_true")
+    import_parser = commands.add_parser("import", help="merge an export into the history")
+    import_parser.add_argument("path", help="*.jsonl or *.csv, optionally .gz; - for stdin")
+    import_parser.add_argument("--no-presets", action="store_true")
+    commands.add_parser("rebuild-stats", help="recompute the statistics rollups")
+    args = parser.parse_args(argv)
+
+    def report(result):
+        print(f"  ... {result}", file=sys.stderr)
+
+    if args.command == "rebuild-stats":
+        rebuild_stats(args.db)
+        return 0
+
+    from .settings_store import SettingsStore
+    from .persistence import flush_pending_writes
+    from .preset_library import PresetLibrary, migrate_settings
+    try:
+        library = PresetLibrary(args.presets_db)
+        if not args.no_presets and os.path.exists(args.settings):
+            migrate_settings(library, SettingsStore(args.settings))
+            flush_pending_writes()
+        if args.command == "export":
+            presets = () if args.no_presets else library.all()
+            result = export(args.path, args.db, presets, args.since, progress=report)
+        else:
+            result = import_file(args.path, args.db, progress=report,
+                                 merge_presets=None if args.no_presets else library.merge)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.command}: {result}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
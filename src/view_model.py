@@ -0,0 +1,76 @@
+from dataclasses import dataclass, fields
+
+from .timer_state import TimerState
+
+# Theme phase key per state (paused phases keep the colour of their running phase)
+PHASES = {
+    TimerState.LeadUp: "leadup",
+    TimerState.PausedLeadUp: "leadup",
+    TimerState.Workout: "workout",
+    TimerState.PausedWorkout: "workout",
+    TimerState.Rest: "rest",
+    TimerState.PausedRest: "rest",
+    TimerState.Idle: "idle",
+}
+
+# Resolution of TimerView.progress_steps (and of the main window's progress bar)
+PROGRESS_STEPS = 1000
+
+
+def format_round(current_round, total_rounds):
+    """'n/total' with n 1-based, never past the total (an empty program shows 0/0)."""
+    return f"{min(current_round + 1, total_rounds)}/{total_rounds}"
+
+
+def format_clock(seconds):
+    mins, secs = divmod(max(0, seconds), 60)
+    return f"{mins:02}:{secs:02}"
+
+
+@dataclass(frozen=True)
+class TimerView:
+    """Everything the main window and minimalist widget display for one tick."""
+    state: TimerState
+    current_round: int
+    total_rounds: int
+    remaining_time: int
+    progress: float
+    phase: str
+    round_text: str
+    state_text: str
+    time_text: str
+    progress_steps: int
+    show_start: bool
+    show_pause: bool
+    show_resume: bool
+    show_stop: bool
+
+    def changed_fields(self, previous):
+        """Names of the fields that differ from `previous` (all of them if None)."""
+        if previous is None:
+            return frozenset(f.name for f in fields(self))
+        return frozenset(
+            f.name for f in fields(self)
+            if getattr(self, f.name) != getattr(previous, f.name)
+        )
+
+
+def build_view(engine):
+    """Compute the view-model once from the current engine state."""
+    progress = engine.progress()
+    return TimerView(
+        state=engine.state,
+        current_round=engine.current_round,
+        total_rounds=engine.total_rounds,
+        remaining_time=engine.remaining_time,
+        progress=progress,
+        phase=PHASES[engine.state],
+        round_text=f"Round: {format_round(engine.current_round, engine.total_rounds)}",
+        state_text=f"State: {engine.state.name}",
+        time_text=f"Time remaining: {format_clock(engine.remaining_time)}",
+        progress_steps=int(progress * PROGRESS_STEPS),
+        show_start=engine.state == TimerState.Idle,
+        show_pause=engine.is_running,
+        show_resume=engine.is_paused,
+        show_stop=engine.state != TimerState.Idle,
+    )
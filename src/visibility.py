@@ -0,0 +1,86 @@
+# type: ignore
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QEvent, pyqtSignal
+
+
+class VisibilityTracker(QObject):
+    """Reports whether any of a set of top-level widgets can actually be seen.
+
+    A surface counts as visible when it is shown, not minimized and its
+    native window is exposed (an occluded or off-screen window is not, on
+    platforms that report it). `shown(widget)` fires when one surface comes
+    back on screen, so the owner can catch up the rendering it skipped, and
+    `changed(bool)` whenever "anything visible at all" flips, so timers can
+    slow down while nothing is on screen.
+
+    Destroyed surfaces are forgotten and never reported as shown: their
+    owner is usually being torn down with them (e.g. on quit), and its
+    slots must not run on a deleted wrapper. The remaining surfaces are
+    still re-checked, so `changed(False)` fires once the last one is gone.
+    """
+
+    shown = pyqtSignal(object)
+    changed = pyqtSignal(bool)
+
+    _EVENTS = (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._widgets = {}  # widget -> visible at the last refresh
+        self._handles = set()  # native windows already filtered
+        self._visible = False
+
+    @property
+    def any_visible(self) -> bool:
+        return self._visible
+
+    def track(self, widget):
+        """Start following `widget` (a top-level window); safe to call repeatedly."""
+        if widget in self._widgets:
+            return
+        self._widgets[widget] = False
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda _obj=None, widget=widget: self._forget(widget))
+        self._watch_handle(widget)
+        self.refresh()
+
+    def _forget(self, widget):
+        self._widgets.pop(widget, None)
+
+    @staticmethod
+    def is_visible(widget) -> bool:
+        if widget is None or sip.isdeleted(widget) or not widget.isVisible() or widget.isMinimized():
+            return False
+        handle = widget.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def refresh(self):
+        """Recompute visibility and emit `shown` / `changed` for whatever flipped."""
+        for widget in [widget for widget in self._widgets if sip.isdeleted(widget)]:
+            self._forget(widget)  # no `shown` for these; they only stop counting as visible
+        for widget, was_visible in list(self._widgets.items()):
+            now_visible = self.is_visible(widget)
+            self._widgets[widget] = now_visible
+            if now_visible and not was_visible:
+                self.shown.emit(widget)
+        visible = any(self._widgets.values())
+        if visible != self._visible:
+            self._visible = visible
+            self.changed.emit(visible)
+
+    def _watch_handle(self, widget):
+        # The native window only exists once the widget has been shown
+        handle = widget.windowHandle()
+        if handle is not None and handle not in self._handles:
+            self._handles.add(handle)
+            handle.installEventFilter(self)
+            handle.destroyed.connect(lambda _obj=None, handle=handle: self._handles.discard(handle))
+
+    def eventFilter(self, obj, event):
+        if sip.isdeleted(self) or sip.isdeleted(obj):
+            return False  # torn down (e.g. on quit); nothing left to report to
+        if event.type() in self._EVENTS:
+            if event.type() == QEvent.Show and obj in self._widgets:
+                self._watch_handle(obj)
+            self.refresh()
+        return False
@@ -1,18 +1,29 @@
 # type: ignore
-from PyQt5.QtWidgets import QWidget, QMenu, QLabel, QVBoxLayout, QToolTip
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QPainter, QBrush, QColor, QLinearGradient, QCursor
+from PyQt5.QtWidgets import QWidget, QMenu, QLabel, QVBoxLayout
+from PyQt5.QtCore import Qt, QPoint, QRect
+from PyQt5.QtGui import QPainter, QBrush, QColor, QLinearGradient, QPixmap
 from PyQt5.QtWidgets import QApplication
 
 from .timer_state import TimerState
+from .view_model import format_round, format_clock
 from .config import Config
+from .glyph_cache import GlyphCache, StaticTextCache
+from .preset_view import PresetMenu
+from .tracing import tracer
 
 # Minimalist widget for the minimalist mode
 class MinimalistWidget(QWidget):
+    # TimerView fields that affect what this widget paints
+    _VIEW_FIELDS = frozenset({
+        "progress", "phase", "state", "remaining_time", "current_round", "total_rounds",
+    })
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_window = parent  # QMainWindow reference
-        self.settings = Config.load_from_file()
+        # Shared settings (read once by the main window's SettingsStore)
+        self.store = parent.store
+        self.settings = self.store.config
 
         # Set up a layout for the widget
         self.layout = QVBoxLayout(self)
@@ -33,7 +44,7 @@ class MinimalistWidget(QWidget):
 
         # compute size
         screen_geometry = QApplication.primaryScreen().availableGeometry()
-        self.base_size = min(self.parent_window.settings.minimalist_mode_size,
+        self.base_size = min(self.settings.minimalist_mode_size,
                              screen_geometry.width(), screen_geometry.height())
         self.setMinimumSize(20, 20)
         self.setMaximumSize(500, 500)
@@ -46,10 +57,7 @@ class MinimalistWidget(QWidget):
         self.is_circle = not self.settings.minimalist_progressbar_active
 
         # Apply saved shape
-        if self.is_circle:
-            self.setFixedSize(self.base_size, self.base_size)
-        else:
-            self.setFixedSize(self.base_size * 2, self.base_size // 2)
+        self._apply_shape_size()
 
         # default circle color without fill
         grey = "#3D3D3D"
@@ -65,184 +73,257 @@ class MinimalistWidget(QWidget):
         self.remaining_time = 0
         self.current_round = 0
         self.total_rounds = 0
+        self._last_view = None  # TimerView last applied
+        # Static background (gradient circle / pill) rendered once per size & shape
+        self._background_cache = None
+        self._background_key = None
+        self._paint_key = None  # arc/fill extent, colour and texts last requested
+        # Text is laid out once per (font size, string) and reused across paints
+        self._fonts = {}  # point size -> QFont
+        self._static_texts = StaticTextCache()
+
+        # Context menu (~25 actions) is built on the first right-click
+        self.context_menu = None
+
+        # Follow setting changes made anywhere (main window, context menu, file edits)
+        for name in ("always_on_top", "minimize_after_complete"):
+            self.store.subscribe(name, self._on_menu_setting)
+        for name in ("minimalist_rounds_active", "minimalist_time_active",
+                     "minimalist_progressbar_active", "minimalist_mode_size"):
+            self.store.subscribe(name, self._on_display_setting)
 
-        # build context menu
-        self.context_menu = QMenu(self)
-        self.start_timer_button      = self.context_menu.addAction("Start Timer")
-        self.pause_timer_button      = self.context_menu.addAction("Pause Timer")
-        self.resume_timer_button     = self.context_menu.addAction("Resume Timer")
-        self.stop_timer_button       = self.context_menu.addAction("Stop Timer")
-        self.context_menu.addSeparator()
-        # preset submenu
-        self.preset_dropdown = self.context_menu.addMenu("Presets")
-        self.load_preset_1_button = self.preset_dropdown.addAction("Load Preset 1")
-        self.load_preset_2_button = self.preset_dropdown.addAction("Load Preset 2")
-        self.load_preset_3_button = self.preset_dropdown.addAction("Load Preset 3")
-        self.preset_dropdown.addSeparator()
-        self.save_preset_1_button = self.preset_dropdown.addAction("Save Current to Preset 1")
-        self.save_preset_2_button = self.preset_dropdown.addAction("Save Current to Preset 2")
-        self.save_preset_3_button = self.preset_dropdown.addAction("Save Current to Preset 3")
-        self.context_menu.addSeparator()
-        # widget customization submenu
-        self.customize_display_dropdown = self.context_menu.addMenu("Customize Display")
-        self.toggle_round_text_button   = self.customize_display_dropdown.addAction("Toggle Round Display")
-        self.toggle_time_text_button    = self.customize_display_dropdown.addAction("Toggle Time Display")
-        self.shape_toggle_button        = self.customize_display_dropdown.addAction("Toggle Progress Bar Display")
-        # widget size submenu
-        self.size_dropdown           = self.context_menu.addMenu("Adjust Size")
-        self.increase_size_5_button  = self.size_dropdown.addAction("Increase Size by 5px")
-        self.increase_size_10_button = self.size_dropdown.addAction("Increase Size by 10px")
-        self.increase_size_20_button = self.size_dropdown.addAction("Increase Size by 20px")
-        self.increase_size_50_button = self.size_dropdown.addAction("Increase Size by 50px")
-        self.size_dropdown.addSeparator()
-        self.decrease_size_5_button  = self.size_dropdown.addAction("Decrease Size by 5px")
-        self.decrease_size_10_button = self.size_dropdown.addAction("Decrease Size by 10px")
-        self.decrease_size_20_button = self.size_dropdown.addAction("Decrease Size by 20px")
-        self.decrease_size_50_button = self.size_dropdown.addAction("Decrease Size by 50px")
-        self.size_dropdown.addSeparator()
-        self.size_to_default = self.size_dropdown.addAction("Reset to Default Size")
-        self.context_menu.addSeparator()
-        # window behavior toggles
-        self.always_on_top_checkbox          = self.context_menu.addAction("Always on Top")
-        self.always_on_top_checkbox.setCheckable(True)
-        self.minimize_after_complete_checkbox = self.context_menu.addAction("Minimize After Complete")
-        self.minimize_after_complete_checkbox.setCheckable(True)
-        self.context_menu.addSeparator()
-        # after submenus
-        self.minimize_to_taskbar_button = self.context_menu.addAction("Minimize to Tray")
-        self.exit_minimalist_button     = self.context_menu.addAction("Exit Minimalist Mode")
-        self.exit_app_button            = self.context_menu.addAction("Exit Application")
-
-        # wire up context actions
-        self.start_timer_button.triggered.connect(self.parent().start_timer)
-        self.pause_timer_button.triggered.connect(self.parent().pause_timer)
-        self.resume_timer_button.triggered.connect(self.parent().resume_timer)
-        self.stop_timer_button.triggered.connect(self.parent().stop_timer)
-        self.toggle_round_text_button.triggered.connect(self.toggle_round_display)
-        self.toggle_time_text_button.triggered.connect(self.toggle_time_display)
-        self.shape_toggle_button.triggered.connect(self.toggle_shape)
-        self.minimize_to_taskbar_button.triggered.connect(self.minimize_minimalist_mode)
-        self.exit_minimalist_button.triggered.connect(self.parent().toggle_minimalist_mode)
-        self.exit_app_button.triggered.connect(QApplication.quit)
-
-        self.size_to_default.triggered.connect(self.reset_to_default_size)
-        # size adjustments
-        for action, delta in (
-            (self.increase_size_5_button, +5),
-            (self.increase_size_10_button, +10),
-            (self.increase_size_20_button, +20),
-            (self.increase_size_50_button, +50),
-            (self.decrease_size_5_button, -5),
-            (self.decrease_size_10_button, -10),
-            (self.decrease_size_20_button, -20),
-            (self.decrease_size_50_button, -50),
-        ):
-            action.triggered.connect(lambda _, d=delta: self.adjust_size(d))
-
-        # connect preset load/save actions to main window methods
-        for action, idx in (
-            (self.load_preset_1_button, 0),
-            (self.load_preset_2_button, 1),
-            (self.load_preset_3_button, 2),
-        ):
-            action.triggered.connect(lambda _, i=idx: self.parent_window.load_preset(i))
-
-        for action, idx in (
-            (self.save_preset_1_button, 0),
-            (self.save_preset_2_button, 1),
-            (self.save_preset_3_button, 2),
-        ):
-            def _save_and_refresh(_, i=idx):
-                self.parent_window.save_preset(i)
-                self.update_min_preset_tooltips()
-            action.triggered.connect(_save_and_refresh)
-
-        # wire window-behavior toggles
-        self.always_on_top_checkbox.triggered.connect(self.parent_window.toggle_always_on_top)
-        self.minimize_after_complete_checkbox.triggered.connect(self.parent_window.toggle_minimize_after_complete)
-
-        # Apply the same style to sub-menus so their separators are also visible
-        self.customize_display_dropdown.setStyleSheet(self.context_menu.styleSheet())
-        self.size_dropdown.setStyleSheet(self.context_menu.styleSheet())
+    ##################################
+    # Context menu construction
+    ##################################
+    def _build_context_menu(self):
+        """Create the context menu and its actions (done once, on first use)."""
+        with tracer.span("minimalist context menu"):
+            self.context_menu = QMenu(self)
+            self.start_timer_button      = self.context_menu.addAction("Start Timer")
+            self.pause_timer_button      = self.context_menu.addAction("Pause Timer")
+            self.resume_timer_button     = self.context_menu.addAction("Resume Timer")
+            self.stop_timer_button       = self.context_menu.addAction("Stop Timer")
+            self.context_menu.addSeparator()
+            # Today / this week from the history rollups (see update_context_menu)
+            self.summary_actions = [self.context_menu.addAction("") for _ in range(2)]
+            for action in self.summary_actions:
+                action.setEnabled(False)
+            self.statistics_button = self.context_menu.addAction("Statistics...")
+            self.summary_separator = self.context_menu.addSeparator()
+            # preset submenu
+            # Shares the library and paging with the main window's preset menu
+            self.preset_dropdown = PresetMenu(self.parent_window, "Presets", searchable=False,
+                                              parent=self.context_menu)
+            self.context_menu.addMenu(self.preset_dropdown)
+            self.context_menu.addSeparator()
+            # widget customization submenu
+            self.customize_display_dropdown = self.context_menu.addMenu("Customize Display")
+            self.toggle_round_text_button   = self.customize_display_dropdown.addAction("Toggle Round Display")
+            self.toggle_time_text_button    = self.customize_display_dropdown.addAction("Toggle Time Display")
+            self.shape_toggle_button        = self.customize_display_dropdown.addAction("Toggle Progress Bar Display")
+            # widget size submenu
+            self.size_dropdown           = self.context_menu.addMenu("Adjust Size")
+            self.increase_size_5_button  = self.size_dropdown.addAction("Increase Size by 5px")
+            self.increase_size_10_button = self.size_dropdown.addAction("Increase Size by 10px")
+            self.increase_size_20_button = self.size_dropdown.addAction("Increase Size by 20px")
+            self.increase_size_50_button = self.size_dropdown.addAction("Increase Size by 50px")
+            self.size_dropdown.addSeparator()
+            self.decrease_size_5_button  = self.size_dropdown.addAction("Decrease Size by 5px")
+            self.decrease_size_10_button = self.size_dropdown.addAction("Decrease Size by 10px")
+            self.decrease_size_20_button = self.size_dropdown.addAction("Decrease Size by 20px")
+            self.decrease_size_50_button = self.size_dropdown.addAction("Decrease Size by 50px")
+            self.size_dropdown.addSeparator()
+            self.size_to_default = self.size_dropdown.addAction("Reset to Default Size")
+            self.context_menu.addSeparator()
+            # window behavior toggles
+            self.always_on_top_checkbox          = self.context_menu.addAction("Always on Top")
+            self.always_on_top_checkbox.setCheckable(True)
+            self.minimize_after_complete_checkbox = self.context_menu.addAction("Minimize After Complete")
+            self.minimize_after_complete_checkbox.setCheckable(True)
+            self.context_menu.addSeparator()
+            # after submenus
+            self.minimize_to_taskbar_button = self.context_menu.addAction("Minimize to Tray")
+            self.exit_minimalist_button     = self.context_menu.addAction("Exit Minimalist Mode")
+            self.exit_app_button            = self.context_menu.addAction("Exit Application")
+
+            # wire up context actions
+            self.start_timer_button.triggered.connect(self.parent().start_timer)
+            self.pause_timer_button.triggered.connect(self.parent().pause_timer)
+            self.resume_timer_button.triggered.connect(self.parent().resume_timer)
+            self.stop_timer_button.triggered.connect(self.parent().stop_timer)
+            self.statistics_button.triggered.connect(self.parent().show_statistics)
+            self.toggle_round_text_button.triggered.connect(self.toggle_round_display)
+            self.toggle_time_text_button.triggered.connect(self.toggle_time_display)
+            self.shape_toggle_button.triggered.connect(self.toggle_shape)
+            self.minimize_to_taskbar_button.triggered.connect(self.minimize_minimalist_mode)
+            self.exit_minimalist_button.triggered.connect(self.parent().toggle_minimalist_mode)
+            self.exit_app_button.triggered.connect(QApplication.quit)
+
+            self.size_to_default.triggered.connect(self.reset_to_default_size)
+            # size adjustments
+            for action, delta in (
+                (self.increase_size_5_button, +5),
+                (self.increase_size_10_button, +10),
+                (self.increase_size_20_button, +20),
+                (self.increase_size_50_button, +50),
+                (self.decrease_size_5_button, -5),
+                (self.decrease_size_10_button, -10),
+                (self.decrease_size_20_button, -20),
+                (self.decrease_size_50_button, -50),
+            ):
+                action.triggered.connect(lambda _, d=delta: self.adjust_size(d))
+
+            # wire window-behavior toggles
+            self.always_on_top_checkbox.triggered.connect(self.parent_window.toggle_always_on_top)
+            self.minimize_after_complete_checkbox.triggered.connect(self.parent_window.toggle_minimize_after_complete)
+            self.always_on_top_checkbox.setChecked(self.settings.always_on_top)
+            self.minimize_after_complete_checkbox.setChecked(self.settings.minimize_after_complete)
+
+            # Apply the same style to sub-menus so their separators are also visible
+            self.customize_display_dropdown.setStyleSheet(self.context_menu.styleSheet())
+            self.size_dropdown.setStyleSheet(self.context_menu.styleSheet())
+            self.preset_dropdown.setStyleSheet(self.context_menu.styleSheet())
+
+    def _on_menu_setting(self, name, value):
+        """Keep context-menu checkboxes in sync once the menu exists."""
+        if self.context_menu is None:
+            return
+        if name == "always_on_top":
+            self.always_on_top_checkbox.setChecked(value)
+        elif name == "minimize_after_complete":
+            self.minimize_after_complete_checkbox.setChecked(value)
+
+    def apply_view(self, view):
+        """Copy the displayed fields from a TimerView and repaint only if the output changes."""
+        changed = view.changed_fields(self._last_view)
+        self._last_view = view
+        if not changed & self._VIEW_FIELDS:
+            return
+        self.progress = view.progress
+        if "phase" in changed:
+            self.active_color = self.parent_window.themes.qcolor(view.phase)
+        self.current_state = view.state
+        self.remaining_time = view.remaining_time
+        self.current_round = view.current_round
+        self.total_rounds = view.total_rounds
+        self.request_repaint()
+
+    def set_progress(self, progress):
+        """Animation frame: move the arc/fill, repainting only when a pixel changes."""
+        self.progress = progress
+        self.request_repaint()
+
+    def request_repaint(self):
+        """Schedule a repaint only if the arc/fill extent, colour or text would change."""
+        key = self._compute_paint_key()
+        if key != self._paint_key:
+            self._paint_key = key
+            self.update()
+
+    def _compute_paint_key(self):
+        if self.progress <= 0:
+            extent = 0
+        elif self.is_circle:
+            extent = int(-self.progress * 360 * 16)
+        else:
+            extent = int(self.width() * self.progress)
+        return (
+            extent,
+            self.active_color.rgba(),
+            self._round_text() if self.show_round_text else None,
+            self._time_text() if self.show_time_text else None,
+        )
+
+    def _round_text(self):
+        return format_round(self.current_round, self.total_rounds)
+
+    def _time_text(self):
+        return format_clock(self.remaining_time)
+
+    def _background(self):
+        """Return the cached background pixmap, re-rendering it only when size/shape changed."""
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), self.is_circle, ratio)
+        if key != self._background_key:
+            pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            gradient = QLinearGradient(0, 0, 0, self.height())
+            gradient.setColorAt(0, QColor(85, 60, 115))  # Top color
+            gradient.setColorAt(1, QColor(40, 40, 85))  # Bottom color
+            painter.setBrush(QBrush(gradient))
+            painter.setPen(Qt.NoPen)
+            if self.is_circle:
+                painter.drawEllipse(0, 0, self.width(), self.height())
+            else:
+                radius = int(self.height() / 1.8)  # Dynamic roundedness
+                painter.drawRoundedRect(0, 0, self.width(), self.height(), radius, radius)
+            painter.end()
 
-        # --- Tooltip handling for preset actions ---
-        # collect load/save tuples for easy processing (similar to main window)
-        self.min_preset_actions = [
-            (self.load_preset_1_button, self.save_preset_1_button),
-            (self.load_preset_2_button, self.save_preset_2_button),
-            (self.load_preset_3_button, self.save_preset_3_button),
-        ]
+            self._background_cache = pixmap
+            self._background_key = key
+        return self._background_cache
 
-        # update tooltips initially and whenever presets change
-        self.update_min_preset_tooltips()
+    def _invalidate_background(self):
+        self._background_key = None
+        self._paint_key = None
 
-        # show tooltip when hovering over menu entries
-        self.preset_dropdown.hovered.connect(self._show_min_preset_action_tooltip)
+    def resizeEvent(self, event):
+        self._invalidate_background()
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Create gradient
-        gradient = QLinearGradient(0, 0, 0, self.height())
-        gradient.setColorAt(0, QColor(85, 60, 115))  # Top color
-        gradient.setColorAt(1, QColor(40, 40, 85))  # Bottom color
-        
+        painter.drawPixmap(0, 0, self._background())
+        painter.setPen(Qt.NoPen)
+
         if self.is_circle:
-            # Draw background circle with gradient
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(0, 0, self.width(), self.height())
-            
             # Draw progress arc if there is progress
             if self.progress > 0:
                 painter.setBrush(QBrush(self.active_color))
                 span_angle = int(-self.progress * 360 * 16)  # QPainter uses 16th of a degree
                 painter.drawPie(0, 0, self.width(), self.height(), 90 * 16, span_angle)
         else:
-            # Draw progress bar background with gradient
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            radius = int(self.height() / 1.8)  # Dynamic roundedness
-            painter.drawRoundedRect(0, 0, self.width(), self.height(), radius, radius)
-            
             # Draw progress fill
             if self.progress > 0:
+                radius = int(self.height() / 1.8)
                 progress_width = int(self.width() * self.progress)
                 painter.setBrush(QBrush(self.active_color))
                 painter.drawRoundedRect(0, 0, progress_width, self.height(), radius, radius)
-        
+
         # Draw text if enabled
-        if self.show_round_text or self.show_time_text:           
-            # Configure text appearance
+        if self.show_round_text or self.show_time_text:
             painter.setPen(Qt.white)
-            font = painter.font()
-            painter.setFont(font)
-            rect = self.rect()
-            
-            self.display_round_and_time(painter, rect)
+            self.display_round_and_time(painter, self.rect())
+        painter.end()
+        self.parent_window.notify_first_paint()
 
     def display_round_and_time(self, painter, rect):
         # Adjust font size based on widget dimensions and mode
-        font = painter.font()
         if self.is_circle:
             font_size = min(self.width() // 6, 30)
         else:
             # For progress bar
             font_size = min((self.width() // 3) // 4, 30)
-        font.setPointSize(font_size)
-        painter.setFont(font)
+        if font_size not in self._fonts:
+            font = self.font()
+            font.setPointSize(font_size)
+            self._fonts[font_size] = font
+        painter.setFont(self._fonts[font_size])
+        draw = self._static_texts.draw_centered
 
         if self.show_round_text and self.show_time_text:
-            mins, secs = divmod(self.remaining_time, 60)
-                
             if self.is_circle:
                 # For circle mode - stack vertically
                 bottom_rect = rect.adjusted(0, rect.height()//4, 0, 0)
                 top_rect = rect.adjusted(0, 0, 0, -rect.height()//4)
                 
-                painter.drawText(top_rect, Qt.AlignCenter, f"{self.current_round + 1}/{self.total_rounds}")
-                painter.drawText(bottom_rect, Qt.AlignCenter, f"{mins:02}:{secs:02}")
+                draw(painter, top_rect, self._round_text())
+                draw(painter, bottom_rect, self._time_text())
                 
             else:
                 # For progress bar mode - position side by side with padding
@@ -250,16 +331,15 @@ class MinimalistWidget(QWidget):
                 left_rect = rect.adjusted(padding, 0, -rect.width()//2, 0)
                 right_rect = rect.adjusted(rect.width()//2, 0, -padding, 0)
                 
-                painter.drawText(left_rect, Qt.AlignCenter, f"{self.current_round + 1}/{self.total_rounds}")
-                painter.drawText(right_rect, Qt.AlignCenter, f"{mins:02}:{secs:02}")
+                draw(painter, left_rect, self._round_text())
+                draw(painter, right_rect, self._time_text())
         else:
             # Only one enabled - center it
             if self.show_round_text:
-                text = f"{self.current_round + 1}/{self.total_rounds}"
+                text = self._round_text()
             else:
-                mins, secs = divmod(self.remaining_time, 60)
-                text = f"{mins:02}:{secs:02}"
-            painter.drawText(rect, Qt.AlignCenter, text)
+                text = self._time_text()
+            draw(painter, rect, text)
 
     ###############################
     # Mouse event handlers
@@ -272,6 +352,8 @@ class MinimalistWidget(QWidget):
     def mouseReleaseEvent(self, event):
         # Handle right-click on release for context menu
         if event.button() == Qt.MouseButton.RightButton:
+            if self.context_menu is None:
+                self._build_context_menu()
             self.update_context_menu()
             self.context_menu.exec_(self.mapToGlobal(event.pos()))
         else:
@@ -300,24 +382,15 @@ class MinimalistWidget(QWidget):
         self.pause_timer_button.setVisible(st in (TimerState.LeadUp, TimerState.Workout, TimerState.Rest))
         self.resume_timer_button.setVisible(st in (TimerState.PausedLeadUp, TimerState.PausedWorkout, TimerState.PausedRest))
         self.stop_timer_button.setVisible(st not in (TimerState.Idle, TimerState.PausedLeadUp, TimerState.PausedWorkout, TimerState.PausedRest))
-
-        # sync checkbox states with settings
-        self.always_on_top_checkbox.setChecked(self.parent_window.settings.always_on_top)
-        self.minimize_after_complete_checkbox.setChecked(self.parent_window.settings.minimize_after_complete)
+        summary = self.parent().history_summary()
+        for action, line in zip(self.summary_actions, summary):
+            action.setText(line)
+        for action in (*self.summary_actions, self.statistics_button, self.summary_separator):
+            action.setVisible(bool(summary))
 
     def adjust_size(self, delta: int):
         # Always adjust base_size, and use it for both shapes
-        if self.is_circle:
-            new_base = min(500, max(20, self.base_size + delta))
-            self.base_size = new_base
-            self.setFixedSize(self.base_size, self.base_size)
-        else:
-            new_base = min(500, max(20, self.base_size + delta))
-            self.base_size = new_base
-            self.setFixedSize(self.base_size * 2, self.base_size // 2)
-        self.update()
-        self.parent_window.settings.minimalist_mode_size = self.base_size
-        self.parent_window.settings.save_to_file()
+        self.store.set(minimalist_mode_size=min(500, max(20, self.base_size + delta)))
 
     def minimize_minimalist_mode(self):
         # Hide the minimalist widget itself, then show the parent window's tray icon if not already visible
@@ -328,69 +401,171 @@ class MinimalistWidget(QWidget):
             parent._show_tray_icon()
 
     def toggle_round_display(self):
-        self.show_round_text = not self.show_round_text
-        self.parent_window.settings.minimalist_rounds_active = self.show_round_text
-        self.parent_window.settings.save_to_file()
-        self.update()
+        self.store.set(minimalist_rounds_active=not self.show_round_text)
 
     def toggle_time_display(self):
-        self.show_time_text = not self.show_time_text
-        self.parent_window.settings.minimalist_time_active = self.show_time_text
-        self.parent_window.settings.save_to_file()
-        self.update()
+        self.store.set(minimalist_time_active=not self.show_time_text)
 
     def toggle_shape(self):
-        self.is_circle = not self.is_circle
-        # Save progress bar state (True if progress bar is shown, i.e., not circle)
-        self.parent_window.settings.minimalist_progressbar_active = not self.is_circle
-        self.parent_window.settings.save_to_file()
+        # Saved as progress bar state (True if progress bar is shown, i.e., not circle)
+        self.store.set(minimalist_progressbar_active=self.is_circle)
+
+    def reset_to_default_size(self):
+        self.store.set(minimalist_mode_size=Config.minimalist_mode_size)
+
+    def _on_display_setting(self, name, value):
+        """Apply a changed minimalist display setting to this widget."""
+        if name == "minimalist_rounds_active":
+            self.show_round_text = value
+        elif name == "minimalist_time_active":
+            self.show_time_text = value
+        elif name == "minimalist_progressbar_active":
+            self.is_circle = not value
+            self._invalidate_background()
+        elif name == "minimalist_mode_size":
+            self.base_size = value
+        self._apply_shape_size()
+        self.update()
+
+    def _apply_shape_size(self):
         if self.is_circle:
             # Always use base_size for circle
             self.setFixedSize(self.base_size, self.base_size)
         else:
             # Always use base_size for progress bar
             self.setFixedSize(self.base_size * 2, self.base_size // 2)
-        self.update()
 
-    def reset_to_default_size(self):
-        self.base_size = Config.minimalist_mode_size
-        if self.is_circle:
-            self.setFixedSize(self.base_size, self.base_size)
+
+# Full-screen display for gym wall screens
+class KioskWidget(QWidget):
+    """Large-screen view: state, huge MM:SS, round and a phase-coloured bar.
+
+    Digits are blitted from a GlyphCache and only character cells whose
+    value changed are invalidated, so a 4K screen repaints a couple of
+    digit cells per second instead of re-laying-out the whole text.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(None)
+        self.parent_window = parent
+        self.setWindowTitle("Workout Timer")
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setCursor(Qt.BlankCursor)
+        self.glyphs = GlyphCache()
+        self._last_view = None
+        self._progress = 0  # may run ahead of the view between ticks (smooth progress)
+        self._background = QColor(26, 27, 27)
+        self._text_color = QColor("#ecf0f1")
+        self._bar_color = QColor("#5A5177")
+        self._layout_metrics()
+
+    # ---------------- Layout ----------------
+    def _layout_metrics(self):
+        """Derive pixel sizes and regions from the current widget size."""
+        height = max(self.height(), 1)
+        self.time_px = max(12, int(height * 0.38))
+        self.round_px = max(8, int(height * 0.12))
+        self.state_px = max(8, int(height * 0.06))
+        _w, time_h = self.glyphs.cell_size(self.time_px)
+        _w, round_h = self.glyphs.cell_size(self.round_px)
+        self.state_top = int(height * 0.04)
+        self.time_top = int(height * 0.16)
+        self.round_top = self.time_top + time_h
+        bar_height = max(4, int(height * 0.05))
+        self.bar_rect = QRect(int(self.width() * 0.05), height - bar_height * 2,
+                              int(self.width() * 0.9), bar_height)
+
+    def resizeEvent(self, event):
+        self._layout_metrics()
+        super().resizeEvent(event)
+
+    # ---------------- View updates ----------------
+    def apply_view(self, view):
+        """Invalidate only the regions (digit cells, bar, state line) that changed."""
+        previous = self._last_view
+        self._last_view = view
+        self.set_progress(view.progress)
+        if previous is None:
+            self._bar_color = self.parent_window.themes.qcolor(view.phase)
+            self.update()
+            return
+        changed = view.changed_fields(previous)
+        if "phase" in changed:
+            self._bar_color = self.parent_window.themes.qcolor(view.phase)
+            self.update(self.bar_rect)
+        if "state" in changed:
+            self.update(0, self.state_top, self.width(), self.time_top - self.state_top)
+        center = self.width() // 2
+        for old, new, px, top in (
+            (self._time_text(previous), self._time_text(view), self.time_px, self.time_top),
+            (self._round_text(previous), self._round_text(view), self.round_px, self.round_top),
+        ):
+            if len(old) != len(new):
+                # Width changed (e.g. 9/10 -> 10/10): repaint the whole line
+                _w, cell_h = self.glyphs.cell_size(px)
+                self.update(0, top, self.width(), cell_h)
+                continue
+            for i, rect in enumerate(self.glyphs.cell_rects(new, px, center, top)):
+                if old[i] != new[i]:
+                    self.update(rect)
+
+    def refresh_theme(self):
+        """Re-read the bar colour after a theme switch."""
+        if self._last_view is not None:
+            self._bar_color = self.parent_window.themes.qcolor(self._last_view.phase)
+            self.update(self.bar_rect)
+
+    def set_progress(self, progress):
+        """Repaint the bar only when its filled width changes by a pixel."""
+        if int(self.bar_rect.width() * progress) != int(self.bar_rect.width() * self._progress):
+            self.update(self.bar_rect)
+        self._progress = progress
+
+    @staticmethod
+    def _time_text(view):
+        return format_clock(view.remaining_time)
+
+    @staticmethod
+    def _round_text(view):
+        return format_round(view.current_round, view.total_rounds)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self._background)
+        view = self._last_view
+        if view is None:
+            return
+        center = self.width() // 2
+        clip = event.rect()
+
+        state_rect = QRect(0, self.state_top, self.width(), self.time_top - self.state_top)
+        if clip.intersects(state_rect):
+            painter.setFont(self.glyphs.font(self.state_px))
+            painter.setPen(self._text_color)
+            painter.drawText(state_rect, Qt.AlignHCenter | Qt.AlignTop, view.state.name)
+
+        self.glyphs.draw(painter, self._time_text(view), self.time_px, self._text_color,
+                         center, self.time_top)
+        self.glyphs.draw(painter, self._round_text(view), self.round_px, self._text_color,
+                         center, self.round_top)
+
+        if clip.intersects(self.bar_rect):
+            painter.fillRect(self.bar_rect, QColor(61, 61, 61))
+            filled = QRect(self.bar_rect)
+            filled.setWidth(int(self.bar_rect.width() * self._progress))
+            painter.fillRect(filled, self._bar_color)
+
+    # ---------------- Exit ----------------
+    def hideEvent(self, event):
+        # Start from a full repaint next time the display is shown
+        self._last_view = None
+        super().hideEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Escape, Qt.Key_F11):
+            self.parent_window.set_kiosk_mode(False)
         else:
-            self.setFixedSize(self.base_size * 2, self.base_size // 2)
-        self.update()
-        self.parent_window.settings.minimalist_mode_size = self.base_size
-        self.parent_window.settings.save_to_file()
-
-    #############################################
-    # Preset tooltip helpers (minimalist widget) #
-    #############################################
-
-    def update_min_preset_tooltips(self):
-        """Mirror the main-window tooltip/enable behavior for load preset actions."""
-        presets = self.parent_window.settings.presets
-        for idx, (load_action, _save_action) in enumerate(self.min_preset_actions):
-            preset = presets[idx]
-            normal_text = f"Load Preset {idx+1}"
-            if preset:
-                load_action.setEnabled(True)
-                load_action.setText(normal_text)
-                font = load_action.font(); font.setItalic(False); load_action.setFont(font)
-                tt = (
-                    f"Workout: {preset['workout_duration']}s\n"
-                    f"Rest: {preset['rest_duration']}s\n"
-                    f"Lead-up: {preset['lead_up_duration']}s\n"
-                    f"Rounds: {preset['rounds']}"
-                )
-                load_action.setToolTip(tt)
-            else:
-                load_action.setEnabled(True)  # keep enabled; just indicate empty
-                load_action.setText(f"{normal_text} (empty)")
-                font = load_action.font(); font.setItalic(True); load_action.setFont(font)
-                load_action.setToolTip("(empty)")
-
-    def _show_min_preset_action_tooltip(self, action):
-        """Display tooltip for hovered preset menu action."""
-        tooltip = action.toolTip()
-        if tooltip:
-            QToolTip.showText(QCursor.pos(), tooltip, self.preset_dropdown)
\ No newline at end of file
+            super().keyPressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.parent_window.set_kiosk_mode(False)
@@ -4,12 +4,17 @@ import os
 
 block_cipher = None
 
+# Pack resources/ into one archive so the app reads a single file at startup
+sys.path.insert(0, SPECPATH)
+from src.assets import build_bundle
+bundle = build_bundle()
+
 a = Analysis(
     ['src/main.py'],  # Main Python script
     pathex=[],  # Additional paths to search for imports
     binaries=[],  # Additional binary files
     datas=[  # Data files to include
-        ('resources', 'resources'),
+        (bundle, 'resources'),  # resources/assets.zip, read via src.assets
     ],
     hiddenimports=['pygame'],  # Hidden imports not detected automatically
     hookspath=[],  # Custom hooks for PyInstaller